@@ -2,6 +2,13 @@
 
 from typing import Any
 
+from .author_index import AuthorIndex, get_author_index
+from .batch_validation import (
+    SpecResult,
+    find_spec_files,
+    validate_spec_file,
+    validate_spec_files,
+)
 from .constants import (
     AXES,
     AXES_REGEX,
@@ -13,7 +20,127 @@ from .constants import (
     PYTORCH_STATE_DICT,
     WEIGHT_FORMATS,
 )
-from .io_utils import build_model_zip, get_predefined_tags, get_spdx_licenses
+from .covers import (
+    THUMBNAIL_SIZE,
+    Thumbnail,
+    ThumbnailCache,
+    generate_cover,
+    make_thumbnail,
+    normalize_percentile,
+    project_to_image,
+)
+from .doi_resolver import (
+    DoiResolver,
+    format_citation,
+    get_doi_resolver,
+    normalize_doi,
+    resolve_dois,
+)
+from .fetcher import (
+    RemoteFetcher,
+    fetch_urls,
+    get_fetcher,
+    get_remote_references,
+    is_remote_uri,
+    prefetch_remote_references,
+)
+from .file_cache import FileCache, file_sha256, get_file_cache, image_size
+from .io_utils import (
+    build_model_zip,
+    get_predefined_tags,
+    get_spdx_licenses,
+    read_changed_files,
+    read_npy_header,
+    stream_memory_tensors,
+    write_memory_tensors,
+    write_npy,
+)
+from .memory_tensors import (
+    MEMORY_URI_SCHEME,
+    get_array,
+    is_memory_uri,
+    register_array,
+    release_array,
+)
+from .model_tester import (
+    ModelTestResult,
+    TensorError,
+    get_weight_formats,
+    run_model_test,
+    run_model_tests,
+)
+from .output_regeneration import (
+    get_prediction_pool,
+    predict_test_outputs,
+    regenerate_test_outputs,
+    run_in_prediction_pool,
+)
+from .package_analyzer import (
+    MemberSize,
+    PackageAnalysis,
+    ShrinkSuggestion,
+    analyze_package,
+    get_crop_shape,
+)
+from .package_utils import (
+    extract_package_member,
+    get_file_references,
+    is_metadata_only_change,
+    load_package_specs,
+    open_package_member,
+    package_member_uri,
+    read_package_rdf,
+    split_package_uri,
+    update_package_metadata,
+)
+from .package_verifier import (
+    MemberCheck,
+    VerificationReport,
+    verify_package,
+    verify_packages,
+)
+from .reference_import import (
+    AUTHORS_FILE_FILTER,
+    CITES_FILE_FILTER,
+    ImportResult,
+    import_authors,
+    import_cites,
+    iter_bibtex_entries,
+    iter_csv_entries,
+    read_cff,
+)
+from .spec_builder import (
+    AuthorSpec,
+    CiteSpec,
+    ModelSpecBuilder,
+    TensorSpec,
+    WeightsSpec,
+    clear_validation_cache,
+    deep_validate_model_data,
+    get_spec_hash,
+    validate_model_data,
+)
+from .tensor_readers import (
+    KEY_SEPARATOR,
+    TENSOR_FILE_FILTER,
+    convert_to_npy,
+    get_tensor_format,
+    list_tensor_keys,
+    open_tensor,
+    read_tensor_header,
+)
+from .tensor_utils import (
+    TensorComparison,
+    TensorStats,
+    compare_tensors,
+    convert_test_tensor,
+    crop_test_tensor,
+    crop_test_tensors,
+    get_crop_window,
+    load_npy,
+    narrowest_dtype,
+    scan_tensor,
+)
 
 
 def safe_cast(value: str, to_type: Any, default: Any = None) -> Any:
@@ -34,9 +161,108 @@ __all__ = [
     "WEIGHT_FORMATS",
     "PYTORCH_STATE_DICT",
     "OUTPUT_TYPES",
+    "AuthorIndex",
+    "get_author_index",
+    "SpecResult",
+    "find_spec_files",
+    "validate_spec_file",
+    "validate_spec_files",
+    "THUMBNAIL_SIZE",
+    "Thumbnail",
+    "ThumbnailCache",
+    "generate_cover",
+    "make_thumbnail",
+    "normalize_percentile",
+    "project_to_image",
+    "DoiResolver",
+    "format_citation",
+    "get_doi_resolver",
+    "normalize_doi",
+    "resolve_dois",
+    "RemoteFetcher",
+    "fetch_urls",
+    "get_fetcher",
+    "get_remote_references",
+    "is_remote_uri",
+    "prefetch_remote_references",
+    "FileCache",
+    "file_sha256",
+    "get_file_cache",
+    "image_size",
     "build_model_zip",
     "get_predefined_tags",
     "get_spdx_licenses",
+    "read_changed_files",
+    "read_npy_header",
+    "stream_memory_tensors",
+    "write_memory_tensors",
+    "write_npy",
+    "MEMORY_URI_SCHEME",
+    "get_array",
+    "is_memory_uri",
+    "register_array",
+    "release_array",
+    "ModelTestResult",
+    "TensorError",
+    "get_weight_formats",
+    "run_model_test",
+    "run_model_tests",
+    "get_prediction_pool",
+    "predict_test_outputs",
+    "regenerate_test_outputs",
+    "run_in_prediction_pool",
+    "MemberSize",
+    "PackageAnalysis",
+    "ShrinkSuggestion",
+    "analyze_package",
+    "get_crop_shape",
+    "extract_package_member",
+    "get_file_references",
+    "is_metadata_only_change",
+    "load_package_specs",
+    "open_package_member",
+    "package_member_uri",
+    "read_package_rdf",
+    "split_package_uri",
+    "update_package_metadata",
+    "MemberCheck",
+    "VerificationReport",
+    "verify_package",
+    "verify_packages",
+    "TensorComparison",
+    "TensorStats",
+    "compare_tensors",
+    "convert_test_tensor",
+    "crop_test_tensor",
+    "crop_test_tensors",
+    "get_crop_window",
+    "load_npy",
+    "narrowest_dtype",
+    "scan_tensor",
+    "KEY_SEPARATOR",
+    "TENSOR_FILE_FILTER",
+    "convert_to_npy",
+    "get_tensor_format",
+    "list_tensor_keys",
+    "open_tensor",
+    "read_tensor_header",
+    "AUTHORS_FILE_FILTER",
+    "CITES_FILE_FILTER",
+    "ImportResult",
+    "import_authors",
+    "import_cites",
+    "iter_bibtex_entries",
+    "iter_csv_entries",
+    "read_cff",
+    "AuthorSpec",
+    "CiteSpec",
+    "ModelSpecBuilder",
+    "TensorSpec",
+    "WeightsSpec",
+    "clear_validation_cache",
+    "deep_validate_model_data",
+    "get_spec_hash",
+    "validate_model_data",
     "nodes",
     "schemas",
 ]
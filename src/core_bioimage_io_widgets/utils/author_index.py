@@ -0,0 +1,292 @@
+"""A persistent index of the authors of saved specs, for completions."""
+
+import bisect
+import os
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple, Union
+
+import yaml
+
+from core_bioimage_io_widgets.utils.file_cache import get_cache_dir
+from core_bioimage_io_widgets.utils.reference_import import AUTHOR_FIELDS
+
+INDEX_FILE_NAME = "author_index.sqlite"
+
+
+def _normalize(text: str) -> str:
+    return " ".join(text.lower().split())
+
+
+def _trigrams(text: str) -> Set[str]:
+    return {text[i : i + 3] for i in range(len(text) - 2)}
+
+
+class _FieldIndex:
+    # the distinct values of a field: sorted for prefix searches, and by
+    # trigrams for substring searches
+    def __init__(self) -> None:
+        self.keys: List[str] = []
+        self.values: Dict[str, str] = {}
+        self.weights: Dict[str, int] = {}
+        self.trigrams: Dict[str, Set[str]] = {}
+
+    def add(self, value: str, weight: int) -> None:
+        key = _normalize(value)
+        if key not in self.values:
+            bisect.insort(self.keys, key)
+            for trigram in _trigrams(key):
+                self.trigrams.setdefault(trigram, set()).add(key)
+        # the first spelling is kept
+        self.values.setdefault(key, value)
+        self.weights[key] = self.weights.get(key, 0) + weight
+
+    def search(self, text: str, limit: int) -> List[str]:
+        text = _normalize(text)
+        start = bisect.bisect_left(self.keys, text)
+        end = bisect.bisect_left(self.keys, text + "\uffff", start)
+        matches = self.keys[start:end]
+        if len(text) >= 3:
+            trigrams = sorted(
+                _trigrams(text), key=lambda t: len(self.trigrams.get(t, ()))
+            )
+            candidates = set(self.trigrams.get(trigrams[0], ()))
+            for trigram in trigrams[1:]:
+                candidates &= self.trigrams.get(trigram, set())
+            prefixed = set(matches)
+            matches += sorted(
+                key for key in candidates if key not in prefixed and text in key
+            )
+        # prefix matches first, each group by use count
+        ranked = sorted(
+            enumerate(matches),
+            key=lambda item: (item[0] >= end - start, -self.weights[item[1]]),
+        )
+
+        return [self.values[key] for _, key in ranked[:limit]]
+
+
+class AuthorIndex:
+    """The authors (name, email, affiliation, github user, orcid) of saved specs.
+
+    Authors are merged by name, and kept in a SQLite database; the values of
+    each field are indexed in memory, so completions are searched by prefix
+    or (from three characters) by substring without a query. Spec files are
+    indexed again only if they changed, replacing their previous authors:
+    an author is counted once per spec file listing it.
+    """
+
+    def __init__(self, db_path: Optional[Union[str, Path]] = None) -> None:
+        if db_path is None:
+            db_path = get_cache_dir() / INDEX_FILE_NAME
+        self.db_path = Path(db_path)
+        self._lock = threading.Lock()
+        self._authors: Dict[str, dict] = {}
+        self._counts: Dict[str, int] = {}
+        self._fields = {field: _FieldIndex() for field in AUTHOR_FIELDS}
+        # the (size, mtime) of the indexed spec files, and their authors' keys
+        self._sources: Dict[str, Tuple[int, int]] = {}
+        self._contributions: Dict[str, Set[str]] = {}
+        self._conn: Optional[sqlite3.Connection] = None
+        try:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(
+                str(self.db_path), timeout=5, check_same_thread=False
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS authors (key TEXT PRIMARY KEY,"
+                f" {', '.join(f'{field} TEXT' for field in AUTHOR_FIELDS)},"
+                " count INTEGER)"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS sources ("
+                " path TEXT PRIMARY KEY, size INTEGER, mtime_ns INTEGER)"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS contributions ("
+                " path TEXT, key TEXT, PRIMARY KEY (path, key))"
+            )
+            self._conn.commit()
+            rows = self._conn.execute(
+                f"SELECT key, {', '.join(AUTHOR_FIELDS)}, count FROM authors"
+            ).fetchall()
+            for path, size, mtime_ns in self._conn.execute("SELECT * FROM sources"):
+                self._sources[path] = (size, mtime_ns)
+            for path, key in self._conn.execute("SELECT * FROM contributions"):
+                self._contributions.setdefault(path, set()).add(key)
+        except (OSError, sqlite3.Error):
+            # without a database the index only lasts for the session
+            self._conn = None
+            rows = []
+        for key, *values, count in rows:
+            author = {
+                field: value
+                for field, value in zip(AUTHOR_FIELDS, values)
+                if value is not None
+            }
+            self._index(key, author, count)
+
+    def _index(self, key: str, author: dict, count: int) -> None:
+        self._authors[key] = author
+        self._counts[key] = self._counts.get(key, 0) + count
+        for field, value in author.items():
+            self._fields[field].add(value, count)
+
+    def __len__(self) -> int:
+        """The number of known authors."""
+        return len(self._authors)
+
+    @staticmethod
+    def _key(author: dict) -> Optional[str]:
+        # authors are merged by name
+        name = str(author.get("name", "")).strip()
+        return _normalize(name) if name else None
+
+    @staticmethod
+    def _merge(author: dict, known: dict) -> dict:
+        # the author's fields merged into the known ones
+        merged = {**known}
+        merged.update(
+            (field, str(author[field]).strip())
+            for field in AUTHOR_FIELDS
+            if str(author.get(field) or "").strip()
+        )
+        merged["name"] = known.get("name", str(author["name"]).strip())
+
+        return merged
+
+    def _save_authors(self, keys: Iterable[str]) -> None:
+        # the caller holds the lock, and commits
+        if self._conn is None:
+            return
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO authors VALUES"
+            f" ({', '.join('?' * (len(AUTHOR_FIELDS) + 2))})",
+            [
+                (
+                    key,
+                    *(self._authors[key].get(field) for field in AUTHOR_FIELDS),
+                    self._counts[key],
+                )
+                for key in keys
+            ],
+        )
+
+    def add_authors(self, authors: Iterable[dict]) -> None:
+        """Add the authors to the index, merging them with the known ones.
+
+        Each call counts as one use of the authors.
+        """
+        updated = set()
+        with self._lock:
+            for author in authors:
+                key = self._key(author)
+                if key is None:
+                    continue
+                self._index(key, self._merge(author, self._authors.get(key, {})), 1)
+                updated.add(key)
+            if self._conn is not None and updated:
+                self._save_authors(updated)
+                self._conn.commit()
+
+    def _replace_contribution(
+        self, path: str, fingerprint: Tuple[int, int], authors: Iterable[dict]
+    ) -> None:
+        # replace the authors counted for the spec file by its current ones
+        with self._lock:
+            new: Dict[str, dict] = {}
+            for author in authors:
+                key = self._key(author)
+                if key is not None:
+                    known = new.get(key, self._authors.get(key, {}))
+                    new[key] = self._merge(author, known)
+            old = self._contributions.get(path, set())
+            for key, fields in new.items():
+                self._index(key, fields, 0 if key in old else 1)
+            for key in old - new.keys():
+                self._index(key, self._authors[key], -1)
+            self._contributions[path] = set(new)
+            self._sources[path] = fingerprint
+            if self._conn is not None:
+                self._save_authors(old | new.keys())
+                self._conn.execute("DELETE FROM contributions WHERE path = ?", (path,))
+                self._conn.executemany(
+                    "INSERT INTO contributions VALUES (?, ?)",
+                    [(path, key) for key in new],
+                )
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO sources VALUES (?, ?, ?)",
+                    (path, *fingerprint),
+                )
+                self._conn.commit()
+
+    def add_spec_files(self, paths: Iterable[Union[str, Path]]) -> int:
+        """Add the authors of the spec files that changed since they were indexed.
+
+        Returns the number of (re)indexed files.
+        """
+        indexed = 0
+        for path in paths:
+            path = os.path.abspath(path)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            fingerprint = (stat.st_size, stat.st_mtime_ns)
+            with self._lock:
+                if self._sources.get(path) == fingerprint:
+                    continue
+            try:
+                with open(path) as f:
+                    model_data = yaml.safe_load(f)
+            except (OSError, yaml.YAMLError):
+                continue
+            authors = model_data.get("authors") if isinstance(model_data, dict) else []
+            self._replace_contribution(
+                path,
+                fingerprint,
+                [author for author in authors or [] if isinstance(author, dict)],
+            )
+            indexed += 1
+
+        return indexed
+
+    def complete(self, field: str, text: str, limit: int = 10) -> List[str]:
+        """Returns the known values of the field that start with, or contain, text.
+
+        Values starting with the text come first; each group is ordered by the
+        number of times the values were used.
+        """
+        if not text.strip():
+            return []
+        with self._lock:
+            return self._fields[field].search(text, limit)
+
+    def get_author(self, name: str) -> Optional[dict]:
+        """Returns the known fields of the author, or None."""
+        with self._lock:
+            author = self._authors.get(_normalize(name))
+
+        return dict(author) if author is not None else None
+
+    def close(self) -> None:
+        """Close the database."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+_index: Optional[AuthorIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_author_index() -> AuthorIndex:
+    """Returns the shared author index."""
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = AuthorIndex()
+
+    return _index
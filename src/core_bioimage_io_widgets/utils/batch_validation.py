@@ -0,0 +1,160 @@
+"""Validate many model specification files at once, in a process pool."""
+
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Union
+
+import yaml
+from bioimageio.spec import __version__ as spec_version
+
+from core_bioimage_io_widgets.utils.file_cache import file_sha256, get_file_cache
+from core_bioimage_io_widgets.utils.spec_builder import validate_model_data
+
+SPEC_PATTERNS = ("*.yaml", "*.yml")
+# results are cached per version of the validating schema
+VALIDATION = f"model_validation:{spec_version}"
+
+
+class SpecResult(NamedTuple):
+    """The validation result of a model specification file."""
+
+    path: str
+    sha256: str
+    errors: Dict[str, Any]
+    cached: bool = False
+
+    @property
+    def ok(self) -> bool:
+        """True if the specification has no errors."""
+        return not self.errors
+
+    @property
+    def error_count(self) -> int:
+        """The number of error messages."""
+        return _count_messages(self.errors)
+
+
+def _count_messages(errors: Any) -> int:
+    if isinstance(errors, dict):
+        return sum(_count_messages(value) for value in errors.values())
+    if isinstance(errors, list):
+        return sum(_count_messages(value) for value in errors)
+
+    return 1
+
+
+def find_spec_files(paths: Sequence[Union[str, Path]]) -> List[Path]:
+    """Returns the spec files found in the given folders (recursively) or files."""
+    spec_files = set()
+    for path in map(Path, paths):
+        if path.is_dir():
+            for pattern in SPEC_PATTERNS:
+                spec_files.update(path.rglob(pattern))
+        else:
+            spec_files.add(path)
+
+    return sorted(spec_files)
+
+
+def validate_spec_file(path: Union[str, Path]) -> Dict[str, Any]:
+    """Load a spec file and returns its validation errors against the model schema."""
+    try:
+        with open(path) as f:
+            model_data = yaml.safe_load(f)
+    except (OSError, yaml.YAMLError) as err:
+        return {"file": [str(err)]}
+    if not isinstance(model_data, dict):
+        return {"file": ["Not a model specification."]}
+    try:
+        errors = validate_model_data(model_data)
+    except Exception as err:
+        errors = {"validation": [str(err)]}
+    # plain json types, to be pickled and cached (e.g. list indices become str)
+    result: Dict[str, Any] = json.loads(json.dumps(errors, default=str))
+    return result
+
+
+def validate_spec_files(
+    paths: Sequence[Union[str, Path]],
+    max_workers: Optional[int] = None,
+    use_cache: bool = True,
+) -> List[SpecResult]:
+    """Validate the spec files, in a process pool, and returns their results.
+
+    Results are cached by the files' content hash; only new or changed
+    contents are validated. Validation is cpu bound, so each worker process
+    validates a share of the files.
+    """
+    cache = get_file_cache()
+    digests: Dict[str, str] = {}
+    results: Dict[str, SpecResult] = {}
+    for path in map(str, paths):
+        try:
+            digests[path] = file_sha256(path)
+        except OSError as err:
+            results[path] = SpecResult(path, "", {"file": [str(err)]})
+            continue
+        errors = cache.get_value(digests[path], VALIDATION) if use_cache else None
+        if errors is not None:
+            results[path] = SpecResult(path, digests[path], errors, cached=True)
+
+    pending = [path for path in digests if path not in results]
+    max_workers = min(max_workers or os.cpu_count() or 1, len(pending) or 1)
+    if max_workers <= 1:
+        validated = [validate_spec_file(path) for path in pending]
+    else:
+        # spawned workers don't inherit the gui's threads and locks
+        with ProcessPoolExecutor(
+            max_workers, mp_context=multiprocessing.get_context("spawn")
+        ) as executor:
+            chunksize = max(1, len(pending) // (max_workers * 4))
+            validated = list(
+                executor.map(validate_spec_file, pending, chunksize=chunksize)
+            )
+    new_values = {}
+    for path, errors in zip(pending, validated):
+        results[path] = SpecResult(path, digests[path], errors)
+        new_values[digests[path]] = errors
+    if use_cache:
+        cache.set_values(VALIDATION, new_values)
+
+    return [results[str(path)] for path in paths]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Validate model spec files from the command line."""
+    parser = argparse.ArgumentParser(
+        description="Validate BioImage.io model specification files"
+    )
+    parser.add_argument("paths", nargs="+", help="spec files, or folders to scan")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument(
+        "--no-cache", action="store_true", help="validate even unchanged files"
+    )
+    parser.add_argument(
+        "-v", "--verbose", action="store_true", help="print the validation errors"
+    )
+    args = parser.parse_args(argv)
+
+    results = validate_spec_files(
+        find_spec_files(args.paths), args.workers, use_cache=not args.no_cache
+    )
+    for result in results:
+        print(
+            f"{'PASS' if result.ok else 'FAIL'}  {result.error_count:4}  {result.path}"
+        )
+        if args.verbose and not result.ok:
+            print(f"  {json.dumps(result.errors)}")
+    failed = sum(not result.ok for result in results)
+    print(f"{len(results) - failed} passed, {failed} failed")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,298 @@
+"""A local HTTP service for validating and packaging models."""
+
+import argparse
+import json
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional
+
+import yaml
+
+from core_bioimage_io_widgets.utils.io_utils import build_model_zip
+from core_bioimage_io_widgets.utils.spec_builder import validate_model_data
+
+QUEUED = "queued"
+VALIDATING = "validating"
+BUILDING = "building"
+DONE = "done"
+FAILED = "failed"
+# hosts the service answers to: other names could be a dns rebinding attack
+ALLOWED_HOSTS = ("localhost", "127.0.0.1", "[::1]")
+
+
+class QueueFullError(Exception):
+    """Raised when the build queue has no room for a new job."""
+
+
+class BuildJob:
+    """A model packaging job and its status."""
+
+    def __init__(
+        self, model_data: dict, output_path: str, root: Optional[str] = None
+    ) -> None:
+        self.id = uuid.uuid4().hex
+        self.model_data = model_data
+        self.output_path = output_path
+        self.root = root
+        self.status = QUEUED
+        self.progress = 0.0
+        self.errors: Dict[str, Any] = {}
+        self.created = time.time()
+        self.finished: Optional[float] = None
+
+    def update(self, status: str, progress: float) -> None:
+        """Set the job's status and progress."""
+        self.status = status
+        self.progress = progress
+        if status in (DONE, FAILED):
+            self.finished = time.time()
+
+    def to_dict(self) -> dict:
+        """Returns the job status as a json serializable dictionary."""
+        return {
+            "id": self.id,
+            "status": self.status,
+            "progress": self.progress,
+            "output": self.output_path,
+            "errors": self.errors,
+            "created": self.created,
+            "finished": self.finished,
+        }
+
+
+class BuildService:
+    """Runs packaging jobs in a bounded pool of workers."""
+
+    def __init__(
+        self,
+        max_workers: int = 2,
+        max_queue: int = 16,
+        build_fn: Callable[..., Any] = build_model_zip,
+        max_history: int = 100,
+    ) -> None:
+        self.max_queue = max_queue
+        self.max_history = max_history
+        self.build_fn = build_fn
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="model-build"
+        )
+        self._jobs: Dict[str, BuildJob] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def pending(self) -> int:
+        """Number of jobs waiting or running."""
+        with self._lock:
+            return self._count_pending()
+
+    def submit(
+        self, model_data: dict, output_path: str, root: Optional[str] = None
+    ) -> BuildJob:
+        """Queue a new packaging job."""
+        job = BuildJob(model_data, output_path, root)
+        with self._lock:
+            if self._count_pending() >= self.max_queue:
+                raise QueueFullError(f"The build queue is full ({self.max_queue}).")
+            self._jobs[job.id] = job
+        self._executor.submit(self._run, job)
+
+        return job
+
+    def get(self, job_id: str) -> Optional[BuildJob]:
+        """Returns the job with the given id."""
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def jobs(self) -> List[BuildJob]:
+        """Returns all the jobs."""
+        with self._lock:
+            return list(self._jobs.values())
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop the workers."""
+        self._executor.shutdown(wait=wait)
+
+    def _count_pending(self) -> int:
+        return sum(job.status not in (DONE, FAILED) for job in self._jobs.values())
+
+    def _evict_finished(self) -> None:
+        # keep only the max_history most recently finished jobs
+        finished = sorted(
+            (job for job in self._jobs.values() if job.finished is not None),
+            key=lambda job: job.finished,
+        )
+        for job in finished[: max(0, len(finished) - self.max_history)]:
+            del self._jobs[job.id]
+
+    def _run(self, job: BuildJob) -> None:
+        try:
+            self._build(job)
+        finally:
+            with self._lock:
+                self._evict_finished()
+
+    def _build(self, job: BuildJob) -> None:
+        job.update(VALIDATING, 0.1)
+        try:
+            errors = validate_model_data(job.model_data)
+            if errors:
+                job.errors = errors
+                job.update(FAILED, 1.0)
+                return
+            job.update(BUILDING, 0.3)
+            self.build_fn(job.model_data, job.output_path, root=job.root)
+        except Exception as err:
+            job.errors = {"build": [str(err)]}
+            job.update(FAILED, 1.0)
+            return
+        job.update(DONE, 1.0)
+
+
+class BuildRequestHandler(BaseHTTPRequestHandler):
+    """Handles the build service http requests.
+
+    GET  /health     service status
+    GET  /jobs       all jobs
+    GET  /jobs/<id>  a job's status and progress
+    POST /jobs       queue a new job: {"spec": {...} | "spec_file": yaml path,
+                     "output": path, "root": optional directory of relative paths}
+
+    Only requests to a localhost Host are served, and job requests must be
+    sent as application/json, so web pages can't post them without a CORS
+    preflight.
+    """
+
+    server: "BuildServer"
+
+    def check_host(self) -> bool:
+        """Returns True if the request is for localhost, else sends an error."""
+        host = self.headers.get("Host", "")
+        # strip the port
+        if host.startswith("["):
+            host = host[: host.find("]") + 1]
+        else:
+            host = host.partition(":")[0]
+        if host.lower() in ALLOWED_HOSTS:
+            return True
+        self.send_json(HTTPStatus.FORBIDDEN, {"error": "Forbidden host."})
+        return False
+
+    def do_GET(self) -> None:
+        """Returns the service or jobs status."""
+        if not self.check_host():
+            return
+        service = self.server.service
+        if self.path == "/health":
+            self.send_json(
+                HTTPStatus.OK,
+                {
+                    "status": "ok",
+                    "pending": service.pending,
+                    "max_queue": service.max_queue,
+                },
+            )
+        elif self.path == "/jobs":
+            self.send_json(HTTPStatus.OK, [job.to_dict() for job in service.jobs()])
+        elif self.path.startswith("/jobs/"):
+            job = service.get(self.path[len("/jobs/") :])
+            if job is None:
+                self.send_json(HTTPStatus.NOT_FOUND, {"error": "Job not found."})
+            else:
+                self.send_json(HTTPStatus.OK, job.to_dict())
+        else:
+            self.send_json(HTTPStatus.NOT_FOUND, {"error": "Not found."})
+
+    def do_POST(self) -> None:
+        """Queue a new packaging job."""
+        if not self.check_host():
+            return
+        if self.path != "/jobs":
+            self.send_json(HTTPStatus.NOT_FOUND, {"error": "Not found."})
+            return
+        content_type = self.headers.get("Content-Type", "").split(";")[0]
+        if content_type.strip().lower() != "application/json":
+            self.send_json(
+                HTTPStatus.UNSUPPORTED_MEDIA_TYPE,
+                {"error": "The request must be application/json."},
+            )
+            return
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            request = json.loads(self.rfile.read(length))
+            model_data = request.get("spec")
+            if model_data is None:
+                with open(request["spec_file"]) as f:
+                    model_data = yaml.safe_load(f)
+            output_path = request["output"]
+        except (ValueError, KeyError, OSError, yaml.YAMLError) as err:
+            self.send_json(HTTPStatus.BAD_REQUEST, {"error": f"Bad request: {err}"})
+            return
+        try:
+            job = self.server.service.submit(
+                model_data, output_path, request.get("root")
+            )
+        except QueueFullError as err:
+            self.send_json(HTTPStatus.SERVICE_UNAVAILABLE, {"error": str(err)})
+            return
+        self.send_json(HTTPStatus.ACCEPTED, job.to_dict())
+
+    def send_json(self, status: HTTPStatus, data: Any) -> None:
+        """Send the data as a json response."""
+        body = json.dumps(data).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        """Silence the default stderr logging."""
+
+
+class BuildServer(ThreadingHTTPServer):
+    """An http server holding a build service."""
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 8765,
+        service: Optional[BuildService] = None,
+    ) -> None:
+        super().__init__((host, port), BuildRequestHandler)
+        self.service = service or BuildService()
+
+    def server_close(self) -> None:
+        """Close the server and stop the build workers."""
+        super().server_close()
+        self.service.shutdown()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Run the build service."""
+    parser = argparse.ArgumentParser(description="BioImage.io model build service")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--max-queue", type=int, default=16)
+    args = parser.parse_args(argv)
+
+    server = BuildServer(
+        args.host, args.port, BuildService(args.workers, args.max_queue)
+    )
+    print(f"Serving on http://{args.host}:{server.server_port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
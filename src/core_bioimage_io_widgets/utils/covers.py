@@ -0,0 +1,198 @@
+"""Cover images: thumbnails, and covers generated from the test tensors."""
+
+import math
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, NamedTuple, Optional, Union
+
+import imageio.v3 as iio
+import numpy as np
+
+from core_bioimage_io_widgets.utils.tensor_utils import load_npy
+
+THUMBNAIL_SIZE = 64
+# axes reduced by a max projection in the generated covers
+PROJECTED_AXES = "zt"
+# pixels between the input and output images of a generated cover
+COVER_GAP = 8
+
+
+class Thumbnail(NamedTuple):
+    """A downsampled image, and the size of the original one."""
+
+    # (height, width, channels) uint8 rgb(a) pixels
+    image: np.ndarray
+    width: int
+    height: int
+
+
+def _to_rgb(image: np.ndarray) -> np.ndarray:
+    if image.ndim == 2:
+        image = np.stack([image] * 3, axis=-1)
+    if image.dtype != np.uint8:
+        image = (normalize_percentile(image) * 255).astype(np.uint8)
+
+    return image
+
+
+def make_thumbnail(path: Union[str, Path], size: int = THUMBNAIL_SIZE) -> Thumbnail:
+    """Decode an image (its first frame), and downsample it to fit in size pixels."""
+    image = np.asarray(iio.imread(path, index=0))
+    height, width = image.shape[:2]
+    step = max(1, math.ceil(max(height, width) / size))
+
+    return Thumbnail(
+        np.ascontiguousarray(_to_rgb(image[::step, ::step])), width, height
+    )
+
+
+class ThumbnailCache:
+    """Makes thumbnails in a thread pool, and keeps the recent ones.
+
+    Thumbnails are keyed by the file's path, size and mtime, so a changed
+    file gets a new thumbnail; the least recently used ones are dropped.
+    """
+
+    def __init__(
+        self,
+        max_items: int = 256,
+        size: int = THUMBNAIL_SIZE,
+        max_workers: Optional[int] = None,
+    ) -> None:
+        self.max_items = max_items
+        self.size = size
+        self._items: OrderedDict[tuple, Thumbnail] = OrderedDict()
+        self._lock = threading.Lock()
+        self.executor = ThreadPoolExecutor(
+            max_workers or min(4, os.cpu_count() or 1),
+            thread_name_prefix="thumbnail",
+        )
+
+    def _key(self, path: Union[str, Path]) -> tuple:
+        stat = os.stat(path)
+        return (os.path.abspath(path), stat.st_size, stat.st_mtime_ns)
+
+    def get(self, path: Union[str, Path]) -> Optional[Thumbnail]:
+        """Returns the cached thumbnail of the file, or None."""
+        try:
+            key = self._key(path)
+        except OSError:
+            return None
+        with self._lock:
+            thumbnail = self._items.get(key)
+            if thumbnail is not None:
+                self._items.move_to_end(key)
+
+        return thumbnail
+
+    def _make(self, path: Union[str, Path]) -> Thumbnail:
+        key = self._key(path)
+        thumbnail = make_thumbnail(path, self.size)
+        with self._lock:
+            self._items[key] = thumbnail
+            while len(self._items) > self.max_items:
+                self._items.popitem(last=False)
+
+        return thumbnail
+
+    def request(
+        self,
+        path: Union[str, Path],
+        callback: Optional[Callable[["Future[Thumbnail]"], None]] = None,
+    ) -> "Future[Thumbnail]":
+        """Returns a future of the file's thumbnail, made in the thread pool.
+
+        The callback receives the done future; it's called in a worker thread,
+        or right away if the thumbnail is cached.
+        """
+        thumbnail = self.get(path)
+        if thumbnail is not None:
+            future: Future[Thumbnail] = Future()
+            future.set_result(thumbnail)
+        else:
+            future = self.executor.submit(self._make, path)
+        if callback is not None:
+            future.add_done_callback(callback)
+
+        return future
+
+
+def normalize_percentile(
+    arr: np.ndarray, low: float = 1.0, high: float = 99.8
+) -> np.ndarray:
+    """Scale the values between the low and high percentiles to [0, 1] (float32)."""
+    arr = np.asarray(arr, dtype="float32")
+    finite = arr[np.isfinite(arr)]
+    if finite.size == 0:
+        return np.zeros_like(arr)
+    vmin, vmax = np.percentile(finite, [low, high])
+    scaled = (arr - vmin) / max(float(vmax - vmin), 1e-12)
+
+    return np.clip(np.nan_to_num(scaled), 0.0, 1.0)
+
+
+def project_to_image(arr: np.ndarray, axes: str) -> np.ndarray:
+    """Reduce a tensor to a (y, x) or (y, x, 3) image.
+
+    The first batch entry is taken, z and t are max projected, and the channels
+    are kept as rgb if there are three of them, else the first one is taken.
+    """
+    arr = np.asarray(arr)
+    axes = axes.lower()
+    for axis in ("b", "i"):
+        if axis in axes:
+            arr = np.take(arr, 0, axis=axes.index(axis))
+            axes = axes.replace(axis, "")
+    for axis in PROJECTED_AXES:
+        if axis in axes:
+            arr = arr.max(axis=axes.index(axis))
+            axes = axes.replace(axis, "")
+    if "c" in axes:
+        arr = np.moveaxis(arr, axes.index("c"), -1)
+        axes = axes.replace("c", "") + "c"
+        if arr.shape[-1] != 3:
+            arr = arr[..., 0]
+            axes = axes[:-1]
+    if axes not in ("yx", "yxc"):
+        raise ValueError(f"A cover can't be made of a tensor with axes '{axes}'.")
+
+    return arr
+
+
+def _resize_height(image: np.ndarray, height: int) -> np.ndarray:
+    # nearest neighbour, keeping the aspect ratio
+    scale = height / image.shape[0]
+    width = max(1, round(image.shape[1] * scale))
+    rows = np.minimum((np.arange(height) / scale).astype(int), image.shape[0] - 1)
+    cols = np.minimum((np.arange(width) / scale).astype(int), image.shape[1] - 1)
+
+    return image[rows[:, None], cols[None, :]]
+
+
+def generate_cover(
+    test_input: Union[str, Path],
+    input_axes: str,
+    test_output: Union[str, Path],
+    output_axes: str,
+    dest: Union[str, Path],
+    height: int = 256,
+) -> Path:
+    """Save a cover image of the test input and output side by side.
+
+    Both are projected to images (see project_to_image), percentile normalized
+    and scaled to the same height.
+    """
+    images = []
+    for tensor, axes in ((test_input, input_axes), (test_output, output_axes)):
+        image = project_to_image(load_npy(tensor), axes)
+        rgb = _to_rgb((normalize_percentile(image) * 255).astype(np.uint8))
+        images.append(_resize_height(rgb, height))
+    gap = np.full((height, COVER_GAP, 3), 255, dtype=np.uint8)
+    cover = np.concatenate([images[0], gap, images[1]], axis=1)
+    dest = Path(dest)
+    iio.imwrite(dest, cover)
+
+    return dest
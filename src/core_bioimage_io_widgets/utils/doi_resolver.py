@@ -0,0 +1,177 @@
+"""Resolve citation metadata from DOIs, with a persistent cache."""
+
+import asyncio
+import json
+import os
+import re
+import threading
+from typing import Dict, List, Optional, Sequence, Union
+from urllib.parse import quote
+
+from core_bioimage_io_widgets.utils.fetcher import RemoteFetcher, get_fetcher
+from core_bioimage_io_widgets.utils.file_cache import get_file_cache
+
+# the DOI resolver can be set by this environment variable (e.g. for tests)
+DOI_RESOLVER_ENV = "CORE_BIOIMAGE_IO_DOI_RESOLVER"
+DOI_RESOLVER_URL = "https://doi.org"
+DOI_REGEX = re.compile(r"^10\.\d{4,9}/\S+$")
+# kind of the cached citations
+DOI_CITATION = "doi_citation"
+# citation metadata by content negotiation
+_CSL_JSON = "application/vnd.citationstyles.csl+json"
+_DOI_PREFIXES = ("https://doi.org/", "http://doi.org/", "https://dx.doi.org/", "doi:")
+_MAX_CITED_AUTHORS = 3
+
+
+def normalize_doi(text: str) -> Optional[str]:
+    """Returns the bare, lowercase DOI of a DOI or DOI url, or None if invalid."""
+    doi = text.strip()
+    for prefix in _DOI_PREFIXES:
+        if doi.lower().startswith(prefix):
+            doi = doi[len(prefix) :]
+            break
+    doi = doi.lower()
+
+    return doi if DOI_REGEX.match(doi) else None
+
+
+def _author_name(author: dict) -> str:
+    if "family" not in author:
+        return author.get("literal", "")
+    initials = "".join(part[0] for part in author.get("given", "").split() if part)
+    return f"{author['family']} {initials}".strip()
+
+
+def format_citation(csl: dict) -> str:
+    """Returns the citation text of a CSL-JSON record.
+
+    e.g. 'Weigert M, Schmidt U, Boothe T, et al. Content-aware image
+    restoration. Nature Methods (2018).'
+    """
+    authors = [_author_name(author) for author in csl.get("author", [])]
+    names = ", ".join(authors[:_MAX_CITED_AUTHORS])
+    if len(authors) > _MAX_CITED_AUTHORS:
+        names += ", et al"
+    parts = []
+    for value in (names, csl.get("title"), csl.get("container-title")):
+        if isinstance(value, list):
+            value = value[0] if value else ""
+        if value:
+            parts.append(str(value).rstrip("."))
+    text = ". ".join(parts)
+    date_parts = csl.get("issued", {}).get("date-parts") or [[None]]
+    if date_parts[0] and date_parts[0][0]:
+        text += f" ({date_parts[0][0]})"
+
+    return f"{text}."
+
+
+class DoiResolver:
+    """Resolves DOIs to citation entries (text, doi, url).
+
+    Metadata are requested from the resolver (by CSL-JSON content negotiation)
+    through the shared fetcher's connections, and resolved citations are kept
+    in the persistent cache.
+    """
+
+    def __init__(
+        self,
+        base_url: Optional[str] = None,
+        fetcher: Optional[RemoteFetcher] = None,
+        use_cache: bool = True,
+    ) -> None:
+        self.base_url = (
+            base_url or os.environ.get(DOI_RESOLVER_ENV) or DOI_RESOLVER_URL
+        ).rstrip("/")
+        self.fetcher = fetcher or get_fetcher()
+        self.use_cache = use_cache
+
+    def cached(self, doi: str) -> Optional[dict]:
+        """Returns the cached citation of the DOI, or None."""
+        doi = normalize_doi(doi)
+        if doi is None or not self.use_cache:
+            return None
+        return get_file_cache().get_value(doi, DOI_CITATION)
+
+    async def _resolve(self, doi: str) -> dict:
+        body = await self.fetcher.fetch_body(
+            f"{self.base_url}/{quote(doi, safe='/')}", {"Accept": _CSL_JSON}
+        )
+        try:
+            csl = json.loads(body)
+        except ValueError:
+            raise OSError(f"No citation metadata for DOI '{doi}'.") from None
+
+        return {
+            "text": format_citation(csl),
+            "doi": doi,
+            "url": csl.get("URL") or f"{DOI_RESOLVER_URL}/{doi}",
+        }
+
+    def resolve(self, doi: str) -> dict:
+        """Returns the citation of the DOI (blocking).
+
+        Raises a ValueError for an invalid DOI, and an OSError if the DOI
+        can't be resolved.
+        """
+        result = resolve_dois([doi], self)[normalize_doi(doi) or doi]
+        if isinstance(result, Exception):
+            raise result
+
+        return result
+
+    async def resolve_all(
+        self, dois: Sequence[str]
+    ) -> Dict[str, Union[dict, Exception]]:
+        """Resolve the DOIs concurrently; errors are returned in place of citations.
+
+        Results are keyed by the normalized DOIs (or the given text, if
+        invalid). Cached citations are not requested again, and the new ones
+        are cached at once.
+        """
+        results: Dict[str, Union[dict, Exception]] = {}
+        pending: List[str] = []
+        for text in dois:
+            doi = normalize_doi(text)
+            if doi is None:
+                results[text] = ValueError(f"'{text}' is not a valid DOI.")
+            elif doi not in results and doi not in pending:
+                citation = self.cached(doi)
+                if citation is not None:
+                    results[doi] = citation
+                else:
+                    pending.append(doi)
+
+        resolved = await asyncio.gather(
+            *(self._resolve(doi) for doi in pending), return_exceptions=True
+        )
+        new_citations = {}
+        for doi, result in zip(pending, resolved):
+            results[doi] = result
+            if isinstance(result, dict):
+                new_citations[doi] = result
+        if self.use_cache and new_citations:
+            get_file_cache().set_values(DOI_CITATION, new_citations)
+
+        return results
+
+
+_resolver: Optional[DoiResolver] = None
+_resolver_lock = threading.Lock()
+
+
+def get_doi_resolver() -> DoiResolver:
+    """Returns the shared DOI resolver."""
+    global _resolver
+    with _resolver_lock:
+        if _resolver is None:
+            _resolver = DoiResolver()
+
+    return _resolver
+
+
+def resolve_dois(
+    dois: Sequence[str], resolver: Optional[DoiResolver] = None
+) -> Dict[str, Union[dict, Exception]]:
+    """Resolve the DOIs concurrently (blocking), see DoiResolver.resolve_all."""
+    return asyncio.run((resolver or get_doi_resolver()).resolve_all(dois))
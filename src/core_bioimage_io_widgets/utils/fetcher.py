@@ -0,0 +1,274 @@
+"""Fetch remote resources concurrently, with an on-disk cache."""
+
+import asyncio
+import hashlib
+import http.client
+import json
+import os
+import ssl
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+from urllib.parse import urljoin, urlsplit
+
+from core_bioimage_io_widgets.utils.file_cache import get_cache_dir
+from core_bioimage_io_widgets.utils.package_utils import get_file_references
+
+REMOTE_SCHEMES = ("http://", "https://")
+MAX_REDIRECTS = 5
+USER_AGENT = "core-bioimage-io-widgets"
+_BUFFER_SIZE = 1024 * 1024
+
+_ConnectionKey = Tuple[str, str]
+
+
+def is_remote_uri(uri: str) -> bool:
+    """Returns True if the uri is a http(s) url."""
+    return isinstance(uri, str) and uri.lower().startswith(REMOTE_SCHEMES)
+
+
+class RemoteFetcher:
+    """Downloads urls into a cache directory, reusing the http connections.
+
+    Cached files are revalidated by their ETag (or Last-Modified date), and
+    interrupted downloads are resumed by range requests. Downloads run in a
+    pool of max_connections threads driven by asyncio, and idle connections
+    are kept open per host to be reused.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Optional[Union[str, Path]] = None,
+        max_connections: int = 8,
+        timeout: float = 60,
+    ) -> None:
+        self.cache_dir = Path(cache_dir or get_cache_dir() / "remote")
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self._idle: Dict[_ConnectionKey, List[http.client.HTTPConnection]] = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_connections, thread_name_prefix="fetch")
+
+    def cache_path(self, url: str) -> Path:
+        """Returns the path of the url's cached file."""
+        name = Path(urlsplit(url).path).name
+        digest = hashlib.sha256(url.encode()).hexdigest()[:16]
+        return self.cache_dir / f"{digest}_{name or 'index'}"
+
+    def _acquire(self, key: _ConnectionKey) -> http.client.HTTPConnection:
+        with self._lock:
+            idle = self._idle.get(key)
+            if idle:
+                return idle.pop()
+        scheme, netloc = key
+        if scheme == "https":
+            return http.client.HTTPSConnection(
+                netloc, timeout=self.timeout, context=ssl.create_default_context()
+            )
+
+        return http.client.HTTPConnection(netloc, timeout=self.timeout)
+
+    def _release(
+        self,
+        key: _ConnectionKey,
+        conn: http.client.HTTPConnection,
+        response: http.client.HTTPResponse,
+    ) -> None:
+        if response.will_close:
+            conn.close()
+            return
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if len(idle) < self.max_connections:
+                idle.append(conn)
+                return
+        conn.close()
+
+    def _request(
+        self, url: str, headers: Dict[str, str]
+    ) -> Tuple[http.client.HTTPResponse, _ConnectionKey, http.client.HTTPConnection]:
+        parts = urlsplit(url)
+        key = (parts.scheme.lower(), parts.netloc)
+        target = parts.path or "/"
+        if parts.query:
+            target += f"?{parts.query}"
+        conn = self._acquire(key)
+        try:
+            conn.request("GET", target, headers=headers)
+            return conn.getresponse(), key, conn
+        except (OSError, http.client.HTTPException):
+            # an idle connection may have been closed by the server: retry once
+            conn.close()
+            conn = self._new_connection(key)
+            conn.request("GET", target, headers=headers)
+            return conn.getresponse(), key, conn
+
+    def _new_connection(self, key: _ConnectionKey) -> http.client.HTTPConnection:
+        with self._lock:
+            # drop the other idle connections of the host, they may be stale too
+            for conn in self._idle.pop(key, []):
+                conn.close()
+
+        return self._acquire(key)
+
+    def _follow_redirects(
+        self, url: str, headers: Dict[str, str]
+    ) -> Tuple[http.client.HTTPResponse, _ConnectionKey, http.client.HTTPConnection]:
+        location = url
+        for _ in range(MAX_REDIRECTS + 1):
+            response, key, conn = self._request(location, headers)
+            if response.status not in (301, 302, 303, 307, 308):
+                return response, key, conn
+            response.read()
+            self._release(key, conn, response)
+            location = urljoin(location, response.getheader("Location", ""))
+
+        raise OSError(f"Too many redirects fetching {url}")
+
+    def get(self, url: str, headers: Optional[Dict[str, str]] = None) -> bytes:
+        """Returns the body of the url (blocking), without caching it."""
+        headers = {"User-Agent": USER_AGENT, **(headers or {})}
+        response, key, conn = self._follow_redirects(url, headers)
+        try:
+            body = response.read()
+        except BaseException:
+            conn.close()
+            raise
+        self._release(key, conn, response)
+        if response.status != 200:
+            raise OSError(f"HTTP error {response.status} fetching {url}")
+
+        return body
+
+    @staticmethod
+    def _validation_headers(path: Path, part_path: Path, meta: dict) -> Dict[str, str]:
+        # revalidate the cached file, or resume its interrupted download
+        headers = {}
+        if path.is_file():
+            if meta.get("etag"):
+                headers["If-None-Match"] = meta["etag"]
+            elif meta.get("last_modified"):
+                headers["If-Modified-Since"] = meta["last_modified"]
+        elif part_path.is_file() and (meta.get("etag") or meta.get("last_modified")):
+            # resume, unless the resource changed meanwhile
+            headers["Range"] = f"bytes={part_path.stat().st_size}-"
+            headers["If-Range"] = meta.get("etag") or meta["last_modified"]
+
+        return headers
+
+    @staticmethod
+    def _save_body(response: http.client.HTTPResponse, part_path: Path) -> None:
+        # a partial content is appended to the interrupted download
+        mode = "ab" if response.status == 206 else "wb"
+        with open(part_path, mode) as f:
+            for chunk in iter(lambda: response.read(_BUFFER_SIZE), b""):
+                f.write(chunk)
+
+    def download(self, url: str) -> Path:
+        """Download the url into the cache (blocking), and returns the file."""
+        path = self.cache_path(url)
+        part_path = path.with_name(path.name + ".part")
+        meta_path = path.with_name(path.name + ".json")
+        path.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            meta = json.loads(meta_path.read_text())
+        except (OSError, ValueError):
+            meta = {}
+
+        headers = {
+            "User-Agent": USER_AGENT,
+            "Accept-Encoding": "identity",
+            **self._validation_headers(path, part_path, meta),
+        }
+        response, key, conn = self._follow_redirects(url, headers)
+        try:
+            if response.status == 304:
+                # the cached file is up to date
+                response.read()
+                self._release(key, conn, response)
+                return path
+            if response.status not in (200, 206):
+                response.read()
+                raise OSError(f"HTTP error {response.status} fetching {url}")
+            meta = {
+                "url": url,
+                "etag": response.getheader("ETag"),
+                "last_modified": response.getheader("Last-Modified"),
+            }
+            # save the validators first, so an interrupted download can resume
+            meta_path.write_text(json.dumps(meta))
+            self._save_body(response, part_path)
+            os.replace(part_path, path)
+        except BaseException:
+            conn.close()
+            raise
+        self._release(key, conn, response)
+
+        return path
+
+    async def fetch(self, url: str) -> Path:
+        """Download the url into the cache, and returns the file."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self.download, url)
+
+    async def fetch_body(
+        self, url: str, headers: Optional[Dict[str, str]] = None
+    ) -> bytes:
+        """Returns the body of the url, see get."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self.get, url, headers)
+
+    async def fetch_all(self, urls: Sequence[str]) -> Dict[str, Union[Path, Exception]]:
+        """Download the urls concurrently; errors are returned in place of paths.
+
+        At most max_connections downloads run at once.
+        """
+        unique_urls = list(dict.fromkeys(urls))
+        results = await asyncio.gather(
+            *(self.fetch(url) for url in unique_urls), return_exceptions=True
+        )
+
+        return dict(zip(unique_urls, results))
+
+    def close(self) -> None:
+        """Close the idle connections, and stop the download threads."""
+        self._executor.shutdown(wait=True)
+        with self._lock:
+            for idle in self._idle.values():
+                for conn in idle:
+                    conn.close()
+            self._idle.clear()
+
+
+_fetcher: Optional[RemoteFetcher] = None
+_fetcher_lock = threading.Lock()
+
+
+def get_fetcher() -> RemoteFetcher:
+    """Returns the shared fetcher."""
+    global _fetcher
+    with _fetcher_lock:
+        if _fetcher is None:
+            _fetcher = RemoteFetcher()
+
+    return _fetcher
+
+
+def fetch_urls(
+    urls: Sequence[str], fetcher: Optional[RemoteFetcher] = None
+) -> Dict[str, Union[Path, Exception]]:
+    """Download the urls concurrently (blocking), see RemoteFetcher.fetch_all."""
+    return asyncio.run((fetcher or get_fetcher()).fetch_all(urls))
+
+
+def get_remote_references(model_data: dict) -> List[str]:
+    """Returns the urls referenced by the model data."""
+    return [uri for uri in get_file_references(model_data) if is_remote_uri(uri)]
+
+
+def prefetch_remote_references(
+    model_data: dict, fetcher: Optional[RemoteFetcher] = None
+) -> Dict[str, Union[Path, Exception]]:
+    """Download all the urls referenced by the model data, concurrently."""
+    return fetch_urls(get_remote_references(model_data), fetcher)
@@ -0,0 +1,187 @@
+"""A persistent cache of the metadata read from the referenced files."""
+
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+import imageio.v3 as iio
+
+# the cache directory can be set by this environment variable
+CACHE_DIR_ENV = "CORE_BIOIMAGE_IO_CACHE_DIR"
+CACHE_FILE_NAME = "file_metadata.sqlite"
+# kinds of the cached metadata
+NPY_HEADER = "npy_header"
+SHA256 = "sha256"
+IMAGE_SIZE = "image_size"
+_HASH_BUFFER_SIZE = 1024 * 1024
+
+_cache: Optional["FileCache"] = None
+_cache_lock = threading.Lock()
+
+
+def get_cache_dir() -> Path:
+    """Returns the user cache directory of the widgets."""
+    cache_dir = os.environ.get(CACHE_DIR_ENV)
+    if cache_dir:
+        return Path(cache_dir)
+    if sys.platform == "win32":
+        base = Path(os.environ.get("LOCALAPPDATA", Path.home() / "AppData/Local"))
+    elif sys.platform == "darwin":
+        base = Path.home() / "Library" / "Caches"
+    else:
+        base = Path(os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache"))
+
+    return base / "core-bioimage-io-widgets"
+
+
+class FileCache:
+    """Caches values computed from files, until the files change.
+
+    Entries are keyed by the file's absolute path and the kind of value;
+    a changed size, mtime or inode invalidates them.
+    """
+
+    def __init__(self, db_path: Optional[Union[str, Path]] = None) -> None:
+        if db_path is None:
+            db_path = get_cache_dir() / CACHE_FILE_NAME
+        self.db_path = Path(db_path)
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        try:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(
+                str(self.db_path), timeout=5, check_same_thread=False
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS files ("
+                " path TEXT, kind TEXT, size INTEGER, mtime_ns INTEGER,"
+                " inode INTEGER, value TEXT, PRIMARY KEY (path, kind))"
+            )
+            # values keyed by content (e.g. a hash), not tied to a file
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS contents ("
+                " key TEXT, kind TEXT, value TEXT, PRIMARY KEY (key, kind))"
+            )
+            self._conn.commit()
+        except (OSError, sqlite3.Error):
+            # without a usable cache the values are just computed
+            self._conn = None
+
+    def get(
+        self, path: Union[str, Path], kind: str, compute_fn: Callable[[Path], Any]
+    ) -> Any:
+        """Returns the cached value of the file, or computes and caches it.
+
+        The value must be json serializable.
+        """
+        path = Path(path).absolute()
+        stat = path.stat()
+        key = (str(path), kind)
+        fingerprint = (stat.st_size, stat.st_mtime_ns, stat.st_ino)
+        if self._conn is not None:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT size, mtime_ns, inode, value FROM files"
+                    " WHERE path = ? AND kind = ?",
+                    key,
+                ).fetchone()
+            if row is not None and tuple(row[:3]) == fingerprint:
+                return json.loads(row[3])
+
+        value = compute_fn(path)
+        if self._conn is not None:
+            with self._lock:
+                try:
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?, ?)",
+                        (*key, *fingerprint, json.dumps(value)),
+                    )
+                    self._conn.commit()
+                except sqlite3.Error:
+                    pass
+
+        return value
+
+    def get_value(self, key: str, kind: str) -> Any:
+        """Returns the value cached for the content key, or None."""
+        if self._conn is None:
+            return None
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM contents WHERE key = ? AND kind = ?", (key, kind)
+            ).fetchone()
+
+        return json.loads(row[0]) if row is not None else None
+
+    def set_values(self, kind: str, values: Dict[str, Any]) -> None:
+        """Cache the json serializable values by their content keys, at once."""
+        if self._conn is None or not values:
+            return
+        with self._lock:
+            try:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO contents VALUES (?, ?, ?)",
+                    [(key, kind, json.dumps(value)) for key, value in values.items()],
+                )
+                self._conn.commit()
+            except sqlite3.Error:
+                pass
+
+    def invalidate(self, path: Union[str, Path]) -> None:
+        """Remove all the cached values of the file."""
+        if self._conn is None:
+            return
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM files WHERE path = ?", (str(Path(path).absolute()),)
+            )
+            self._conn.commit()
+
+    def close(self) -> None:
+        """Close the cache database."""
+        if self._conn is not None:
+            with self._lock:
+                self._conn.close()
+                self._conn = None
+
+
+def get_file_cache() -> FileCache:
+    """Returns the shared file cache."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = FileCache()
+
+    return _cache
+
+
+def _sha256(path: Path) -> str:
+    sha = hashlib.sha256()
+    with open(path, mode="rb") as f:
+        for chunk in iter(lambda: f.read(_HASH_BUFFER_SIZE), b""):
+            sha.update(chunk)
+
+    return sha.hexdigest()
+
+
+def file_sha256(path: Union[str, Path]) -> str:
+    """Returns the sha256 of the file, using the cache."""
+    result: str = get_file_cache().get(path, SHA256, _sha256)
+    return result
+
+
+def _image_size(path: Path) -> List[int]:
+    shape = iio.improps(path).shape
+    # height and width
+    return [int(shape[0]), int(shape[1])]
+
+
+def image_size(path: Union[str, Path]) -> Tuple[int, int]:
+    """Returns the (width, height) of an image, using the cache."""
+    height, width = get_file_cache().get(path, IMAGE_SIZE, _image_size)
+    return width, height
@@ -1,11 +1,34 @@
+import copy
 import json
+import tempfile
+import zipfile
 from pathlib import Path
-from typing import Dict, List
+from typing import Any, BinaryIO, Dict, List, Optional, Tuple, Union
 
+import numpy as np
 from bioimageio.core.build_spec import build_model
+from bioimageio.spec import load_raw_resource_description
 
 from core_bioimage_io_widgets.resources import SITE_CONFIG, SPDX_LICENSES
 from core_bioimage_io_widgets.utils.constants import PYTORCH_STATE_DICT
+from core_bioimage_io_widgets.utils.file_cache import (
+    NPY_HEADER,
+    file_sha256,
+    get_file_cache,
+)
+from core_bioimage_io_widgets.utils.memory_tensors import (
+    MEMORY_URI_SCHEME,
+    get_array,
+    is_memory_uri,
+)
+from core_bioimage_io_widgets.utils.package_utils import (
+    extract_package_references,
+    get_source_package,
+    open_package_member,
+    read_package_rdf,
+    split_package_uri,
+    update_package_metadata,
+)
 from core_bioimage_io_widgets.utils.schemas import model
 
 
@@ -32,15 +55,209 @@ def get_predefined_tags() -> List[str]:
     return defined_tags
 
 
-def build_model_zip(model_data: dict, zip_file_path: str) -> model.Model:
-    """Build bioimage model zip file from model specification data."""
+def read_npy_header(
+    npy_file: Union[str, Path, BinaryIO],
+) -> Tuple[Tuple[int, ...], np.dtype]:
+    """Read the shape and dtype of a numpy file without loading its data.
+
+    The file can also be a package member uri; then only the member's header
+    is decompressed. Headers of local files are kept in the file cache.
+    For in-memory arrays, the array's own shape and dtype are returned.
+    """
+    if is_memory_uri(npy_file):
+        array = get_array(str(npy_file))
+        return tuple(array.shape), np.dtype(array.dtype)
+    if split_package_uri(npy_file) is not None:
+        with open_package_member(str(npy_file)) as f:
+            return read_npy_header(f)
+    if isinstance(npy_file, (str, Path)):
+        header = get_file_cache().get(npy_file, NPY_HEADER, _read_npy_header_entry)
+        descr = header["descr"]
+        if not isinstance(descr, str):
+            # json turned the structured dtype's fields into lists
+            descr = [tuple(field) for field in descr]
+        return tuple(header["shape"]), np.lib.format.descr_to_dtype(descr)
+    version = np.lib.format.read_magic(npy_file)
+    if version == (1, 0):
+        shape, _fortran_order, dtype = np.lib.format.read_array_header_1_0(npy_file)
+    else:
+        shape, _fortran_order, dtype = np.lib.format.read_array_header_2_0(npy_file)
+
+    return shape, dtype
+
+
+def _read_npy_header_entry(npy_file: Path) -> dict:
+    with open(npy_file, mode="rb") as f:
+        shape, dtype = read_npy_header(f)
+
+    return {"shape": list(shape), "descr": np.lib.format.dtype_to_descr(dtype)}
+
+
+def write_npy(
+    array: Any,
+    npy_file: Union[str, Path, BinaryIO],
+    chunk_size: int = 64 * 1024 * 1024,
+) -> None:
+    """Write an array or array-like in the .npy format, chunk by chunk.
+
+    The chunks are slabs along the first axis of at most chunk_size bytes,
+    so array-likes (e.g. dask or zarr arrays) are never loaded as a whole,
+    and contiguous numpy arrays are written without any copy.
+    """
+    if isinstance(npy_file, (str, Path)):
+        with open(npy_file, mode="wb") as f:
+            write_npy(array, f, chunk_size)
+        return
+    dtype = np.dtype(array.dtype)
+    shape = tuple(array.shape)
+    header = {
+        "descr": np.lib.format.dtype_to_descr(dtype),
+        "fortran_order": False,
+        "shape": shape,
+    }
+    try:
+        np.lib.format.write_array_header_1_0(npy_file, header)
+    except ValueError:
+        # the header is too large for the version 1.0
+        np.lib.format.write_array_header_2_0(npy_file, header)
+    if len(shape) == 0:
+        npy_file.write(np.asarray(array).tobytes())
+        return
+    if 0 in shape:
+        return
+    row_size = max(1, dtype.itemsize * int(np.prod(shape[1:])))
+    rows = max(1, chunk_size // row_size)
+    for start in range(0, shape[0], rows):
+        chunk = np.ascontiguousarray(array[start : start + rows])
+        npy_file.write(memoryview(chunk).cast("B"))
+
+
+def write_memory_tensors(
+    model_data: dict, dest_dir: Union[str, Path], placeholders: bool = False
+) -> dict:
+    """Returns a copy of the model data with its in-memory tensors saved as files.
+
+    Placeholders only have the shape and type of the arrays: they are sparse
+    files of zeros, which are not written to the disk.
+    """
+    model_data = copy.deepcopy(model_data)
+    for key in ("test_inputs", "test_outputs"):
+        for i, uri in enumerate(model_data[key]):
+            if is_memory_uri(uri):
+                npy_file = Path(dest_dir) / uri[len(MEMORY_URI_SCHEME) :]
+                npy_file.parent.mkdir(parents=True, exist_ok=True)
+                array = get_array(uri)
+                if placeholders:
+                    np.lib.format.open_memmap(
+                        npy_file, mode="w+", dtype=array.dtype, shape=array.shape
+                    )
+                else:
+                    write_npy(array, npy_file)
+                model_data[key][i] = str(npy_file)
+
+    return model_data
+
+
+def stream_memory_tensors(
+    zip_path: Union[str, Path], tensors: Dict[Tuple[str, int], str]
+) -> None:
+    """Write in-memory tensors into the package, in place of its test tensors.
+
+    The tensors are keyed by ('test_inputs' or 'test_outputs', index), and
+    streamed chunk by chunk into the members; the replaced members' bytes
+    are left unreferenced.
+    """
+    rdf = read_package_rdf(zip_path)
+    with zipfile.ZipFile(
+        zip_path, mode="a", compression=zipfile.ZIP_DEFLATED
+    ) as zip_file:
+        for (key, index), uri in tensors.items():
+            member = rdf[key][index]
+            info = zip_file.NameToInfo.pop(member, None)
+            if info is not None:
+                zip_file.filelist.remove(info)
+            with zip_file.open(member, mode="w", force_zip64=True) as f:
+                write_npy(get_array(uri), f)
+
+
+def read_changed_files(changed: Dict[str, List[tuple]]) -> Dict[tuple, Any]:
+    """Re-read the changed files for the spec entries referencing them.
+
+    The keys of each file are (kind, index) tuples, e.g. ('inputs', 0).
+    Test tensors get their npy header and weights their sha256; other files
+    are only checked to exist. Errors are returned in place of the values.
+    """
+    results: Dict[tuple, Any] = {}
+    for path, keys in changed.items():
+        for key in keys:
+            try:
+                if key[0] in ("inputs", "outputs"):
+                    results[key] = read_npy_header(path)
+                elif key[0] == "weights":
+                    results[key] = file_sha256(path)
+                elif not Path(path).is_file():
+                    raise FileNotFoundError(f"No such file: '{path}'")
+                else:
+                    results[key] = path
+            except (OSError, ValueError) as err:
+                results[key] = err
+
+    return results
+
+
+def build_model_zip(
+    model_data: dict,
+    zip_file_path: str,
+    root: Optional[str] = None,
+    incremental: bool = False,
+) -> model.Model:
+    """Build bioimage model zip file from model specification data.
+
+    Relative file paths in the model data are resolved against the root directory,
+    which defaults to the zip file's directory.
+    In the incremental mode, if the zip file exists and only the model's metadata
+    has changed, just its rdf.yaml is rewritten and other members are kept as-is.
+    Files referenced from a package (zip://member::package.zip) are taken from
+    that package; they are extracted only if the model has to be rebuilt.
+    In-memory test tensors (memory://) are streamed into the package members;
+    the model builder only gets placeholder files of their shapes. Without
+    covers, they are saved as .npy files, as the covers are generated from
+    the test tensors.
+    """
+    if incremental:
+        # update the zip file itself, or copy the package the files come from
+        base_package = (
+            zip_file_path
+            if Path(zip_file_path).is_file()
+            else get_source_package(model_data)
+        )
+        if base_package is not None and update_package_metadata(
+            model_data, base_package, dest_path=zip_file_path, root=root
+        ):
+            return load_raw_resource_description(Path(zip_file_path))
+
+    memory_tensors = {
+        (key, i): uri
+        for key in ("test_inputs", "test_outputs")
+        for i, uri in enumerate(model_data[key])
+        if is_memory_uri(uri)
+    }
+    if memory_tensors or get_source_package(model_data) is not None:
+        placeholders = bool(model_data.get("covers"))
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            model_data = extract_package_references(model_data, tmp_dir)
+            model_data = write_memory_tensors(model_data, tmp_dir, placeholders)
+            raw_model = build_model_zip(model_data, zip_file_path, root=root)
+        if placeholders and memory_tensors:
+            stream_memory_tensors(zip_file_path, memory_tensors)
+        return raw_model
+
     weight_type = list(model_data["weights"].keys())[0]
-    weight_uri = model_data["weights"][weight_type]["source"]
+    weight_entry = model_data["weights"][weight_type]
+    weight_uri = weight_entry["source"]
     pytorch_state_dict_args = {}
     if weight_type == PYTORCH_STATE_DICT:
-        pytorch_state_dict_args = {
-            k: v for k, v in model_data["weight"][weight_type].items() if k != "source"
-        }
+        pytorch_state_dict_args = weight_entry
 
     raw_model = build_model(
         output_path=zip_file_path,
@@ -48,7 +265,7 @@ def build_model_zip(model_data: dict, zip_file_path: str) -> model.Model:
         weight_type=weight_type,
         weight_uri=weight_uri,
         architecture=pytorch_state_dict_args.get("architecture"),
-        model_kwargs=pytorch_state_dict_args,
+        model_kwargs=pytorch_state_dict_args.get("kwargs"),
         test_inputs=model_data["test_inputs"],
         test_outputs=model_data["test_outputs"],
         input_names=[_input["name"] for _input in model_data["inputs"]],
@@ -67,8 +284,12 @@ def build_model_zip(model_data: dict, zip_file_path: str) -> model.Model:
         license=model_data["license"],
         # optionals
         covers=model_data.get("covers"),
-        tags=model_data.get("tags"),
-        root=Path(zip_file_path).parent,
+        tags=model_data.get("tags", []),
+        root=root or Path(zip_file_path).parent,
+        # weight format specific versions
+        opset_version=weight_entry.get("opset_version"),
+        tensorflow_version=weight_entry.get("tensorflow_version"),
+        pytorch_version=weight_entry.get("pytorch_version"),
     )
 
     return raw_model
@@ -0,0 +1,49 @@
+"""A registry of in-memory arrays used as test tensors."""
+
+import threading
+import uuid
+from typing import Any, Dict
+
+import numpy as np
+
+# an in-memory test tensor is referenced as 'memory://<id>/<name>.npy'
+MEMORY_URI_SCHEME = "memory://"
+
+_arrays: Dict[str, Any] = {}
+_lock = threading.Lock()
+
+
+def is_memory_uri(uri: Any) -> bool:
+    """Returns True if the uri references a registered in-memory array."""
+    return isinstance(uri, str) and uri.startswith(MEMORY_URI_SCHEME)
+
+
+def register_array(array: Any, name: str = "tensor") -> str:
+    """Register an array to be used as a test tensor, and returns its uri.
+
+    The array is referenced, not copied. Array-likes having shape and dtype
+    (e.g. dask or zarr arrays) are kept as they are, other sequences are
+    converted to numpy arrays.
+    """
+    if not hasattr(array, "shape") or not hasattr(array, "dtype"):
+        array = np.asarray(array)
+    uri = f"{MEMORY_URI_SCHEME}{uuid.uuid4().hex[:12]}/{name}.npy"
+    with _lock:
+        _arrays[uri] = array
+
+    return uri
+
+
+def get_array(uri: str) -> Any:
+    """Returns the registered array of the uri."""
+    with _lock:
+        try:
+            return _arrays[uri]
+        except KeyError:
+            raise KeyError(f"No array is registered as {uri}") from None
+
+
+def release_array(uri: str) -> None:
+    """Remove the array from the registry."""
+    with _lock:
+        _arrays.pop(uri, None)
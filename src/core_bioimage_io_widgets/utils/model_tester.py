@@ -0,0 +1,259 @@
+"""Test built model packages in isolated processes, with resource limits."""
+
+import argparse
+import multiprocessing
+import os
+import queue
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from core_bioimage_io_widgets.utils.package_utils import read_package_rdf
+from core_bioimage_io_widgets.utils.tensor_utils import compare_tensors, load_npy
+
+try:
+    import resource
+except ImportError:
+    # not available on Windows: no memory limit there
+    resource = None
+
+# wall-clock limit of a model test, in seconds
+DEFAULT_TIMEOUT = 600
+# statuses of a model test
+PASSED = "passed"
+FAILED = "failed"
+TIMEOUT = "timeout"
+CRASHED = "crashed"
+
+ProgressFn = Callable[[str, Optional[str], str], Any]
+
+
+class TensorError(NamedTuple):
+    """The difference between a test output and the model's prediction."""
+
+    name: str
+    max_abs_error: float
+    max_rel_error: float = float("nan")
+    mismatches: int = -1
+    first_mismatch: Optional[Tuple[int, ...]] = None
+
+    @property
+    def ok(self) -> bool:
+        """True if all the predicted values are within the tolerance."""
+        return self.mismatches == 0
+
+
+class ModelTestResult(NamedTuple):
+    """The result of a model package's test."""
+
+    package: str
+    weight_format: Optional[str]
+    status: str
+    error: Optional[str]
+    tensors: List[TensorError]
+    duration: float
+
+    @property
+    def ok(self) -> bool:
+        """True if the test passed."""
+        return self.status == PASSED
+
+
+def get_weight_formats(zip_path: Union[str, Path]) -> List[str]:
+    """Returns the weight formats of a model package."""
+    return list(read_package_rdf(zip_path).get("weights", {}))
+
+
+def _set_memory_limit(memory_limit: Optional[int]) -> None:
+    if memory_limit is not None and resource is not None:
+        resource.setrlimit(resource.RLIMIT_AS, (memory_limit, memory_limit))
+
+
+def _model_test_process(
+    events: Any,
+    zip_path: str,
+    weight_format: Optional[str],
+    devices: Optional[List[str]],
+    decimal: int,
+    memory_limit: Optional[int],
+) -> None:
+    """Run the model's prediction on its test inputs, and report the events."""
+    try:
+        _set_memory_limit(memory_limit)
+        events.put(("progress", "loading the model"))
+        from bioimageio.core import load_resource_description
+        from bioimageio.core.prediction import predict
+        from bioimageio.core.prediction_pipeline import create_prediction_pipeline
+
+        model = load_resource_description(Path(zip_path))
+        inputs = [np.load(str(path)) for path in model.test_inputs]
+        # memory-mapped, and compared chunk by chunk
+        expected = [load_npy(str(path)) for path in model.test_outputs]
+        events.put(("progress", "creating the prediction pipeline"))
+        with create_prediction_pipeline(
+            bioimageio_model=model, devices=devices, weight_format=weight_format
+        ) as pipeline:
+            events.put(("progress", "predicting the test inputs"))
+            results = predict(pipeline, inputs)
+        # same tolerance as numpy's assert_array_almost_equal
+        tolerance = 1.5 * 10.0 ** (-decimal)
+        errors = []
+        for output, result, exp in zip(model.outputs, results, expected):
+            try:
+                comparison = compare_tensors(np.asarray(result), exp, atol=tolerance)
+            except ValueError as err:
+                errors.append(f"Output '{output.name}': {err}")
+                events.put(("tensor", output.name, float("nan")))
+                continue
+            events.put(("tensor", output.name, *comparison))
+            if not comparison.ok:
+                errors.append(
+                    f"Output '{output.name}' differs from the test output by up to"
+                    f" {comparison.max_abs_error:.3g} at {comparison.mismatches}"
+                    f" values, first at {comparison.first_mismatch}."
+                )
+        if len(results) != len(expected):
+            errors.append(f"The model has {len(results)} outputs, not {len(expected)}.")
+        events.put(("done", "\n".join(errors) or None))
+    except MemoryError:
+        events.put(("done", "The model test ran out of memory."))
+    except Exception as err:
+        events.put(("done", str(err) or type(err).__name__))
+
+
+def run_model_test(
+    zip_path: Union[str, Path],
+    weight_format: Optional[str] = None,
+    devices: Optional[List[str]] = None,
+    decimal: int = 4,
+    timeout: float = DEFAULT_TIMEOUT,
+    memory_limit: Optional[int] = None,
+    progress_fn: Optional[ProgressFn] = None,
+) -> ModelTestResult:
+    """Test a model package in a subprocess.
+
+    The model's prediction of its test inputs is compared to its test outputs.
+    The subprocess is killed after timeout seconds, and its address space is
+    limited to memory_limit bytes (on posix systems), so a failing model can't
+    take the caller down. progress_fn(package, weight_format, message) receives
+    the progress messages and the per-tensor max absolute errors as they come.
+    """
+    package = str(zip_path)
+    start = time.monotonic()
+    # spawned, so the process doesn't inherit the gui's threads and locks
+    context = multiprocessing.get_context("spawn")
+    events = context.Queue()
+    process = context.Process(
+        target=_model_test_process,
+        args=(events, package, weight_format, devices, decimal, memory_limit),
+        daemon=True,
+    )
+    process.start()
+
+    tensors: List[TensorError] = []
+    status, error = CRASHED, None
+    while True:
+        remaining = timeout - (time.monotonic() - start)
+        if remaining <= 0:
+            status, error = TIMEOUT, f"The model test took more than {timeout} s."
+            break
+        try:
+            event: Tuple = events.get(timeout=min(remaining, 0.5))
+        except queue.Empty:
+            if not process.is_alive():
+                error = f"The model test process exited with code {process.exitcode}."
+                break
+            continue
+        if event[0] == "progress":
+            message = event[1]
+        elif event[0] == "tensor":
+            tensors.append(TensorError(*event[1:]))
+            message = f"{event[1]}: max abs error {event[2]:.3g}"
+        else:
+            status, error = (FAILED, event[1]) if event[1] else (PASSED, None)
+            break
+        if progress_fn is not None:
+            progress_fn(package, weight_format, message)
+
+    if process.is_alive():
+        process.kill()
+    process.join()
+    events.close()
+
+    return ModelTestResult(
+        package, weight_format, status, error, tensors, time.monotonic() - start
+    )
+
+
+def run_model_tests(
+    jobs: Sequence[Tuple[Union[str, Path], Optional[str]]],
+    max_workers: Optional[int] = None,
+    progress_fn: Optional[ProgressFn] = None,
+    **kwargs: Any,
+) -> List[ModelTestResult]:
+    """Test several (package, weight format) pairs, each in its own subprocess.
+
+    At most max_workers tests run at once; kwargs are passed to run_model_test.
+    """
+    max_workers = max_workers or max(1, (os.cpu_count() or 1) // 2)
+    with ThreadPoolExecutor(max_workers, thread_name_prefix="model-test") as executor:
+        futures = [
+            executor.submit(
+                run_model_test,
+                zip_path,
+                weight_format,
+                progress_fn=progress_fn,
+                **kwargs,
+            )
+            for zip_path, weight_format in jobs
+        ]
+        return [future.result() for future in futures]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Test model packages from the command line."""
+    parser = argparse.ArgumentParser(description="Test BioImage.io model packages")
+    parser.add_argument("packages", nargs="+", help="model zip files")
+    parser.add_argument(
+        "--weight-format",
+        action="append",
+        help="weight format to test (default: all the package's formats)",
+    )
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT)
+    parser.add_argument(
+        "--memory-limit", type=int, default=None, help="memory limit in MB"
+    )
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    jobs = [
+        (package, weight_format)
+        for package in args.packages
+        for weight_format in (args.weight_format or get_weight_formats(package))
+    ]
+    results = run_model_tests(
+        jobs,
+        args.workers,
+        progress_fn=lambda package, weight_format, message: print(
+            f"{package} ({weight_format}): {message}"
+        ),
+        timeout=args.timeout,
+        memory_limit=args.memory_limit and args.memory_limit * 1024 * 1024,
+    )
+    for result in results:
+        print(
+            f"{result.package} ({result.weight_format or 'default weights'}):"
+            f" {result.status.upper()} in {result.duration:.1f} s"
+        )
+        if result.error:
+            print(f"  {result.error}")
+
+    return 0 if all(result.ok for result in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,130 @@
+"""Regenerate the test outputs by running the model on its test inputs."""
+
+import copy
+import multiprocessing
+import os
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Any, Callable, List, Optional, Sequence, Union
+
+import numpy as np
+
+from core_bioimage_io_widgets.utils.io_utils import write_memory_tensors, write_npy
+from core_bioimage_io_widgets.utils.package_utils import extract_package_references
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def get_prediction_pool() -> ProcessPoolExecutor:
+    """Returns the shared pool of prediction processes.
+
+    The workers are kept alive, so the deep learning frameworks are imported
+    only once per worker.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # spawned workers don't inherit the gui's threads and locks
+            _pool = ProcessPoolExecutor(
+                max(1, (os.cpu_count() or 1) // 2),
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+
+    return _pool
+
+
+def _discard_prediction_pool(pool: ProcessPoolExecutor) -> None:
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    pool.shutdown(wait=False)
+
+
+def run_in_prediction_pool(fn: Callable, *args: Any) -> Any:
+    """Run fn(*args) in the shared pool of prediction processes.
+
+    A pool broken by a worker's death (e.g. a crashing model) is replaced:
+    if it was broken before, fn runs in a new pool, otherwise the error is
+    raised and the next call gets a new pool.
+    """
+    pool = get_prediction_pool()
+    try:
+        future = pool.submit(fn, *args)
+    except BrokenProcessPool:
+        # broken by an earlier call
+        _discard_prediction_pool(pool)
+        pool = get_prediction_pool()
+        future = pool.submit(fn, *args)
+    try:
+        return future.result()
+    except BrokenProcessPool:
+        _discard_prediction_pool(pool)
+        raise
+
+
+def predict_test_outputs(
+    model_data: dict,
+    dest_paths: Sequence[Union[str, Path]],
+    devices: Optional[List[str]] = None,
+) -> List[List[int]]:
+    """Predict the outputs of the test inputs, and returns their shapes.
+
+    All the test inputs go through the model in a single prediction; each
+    output is saved to its destination with its declared data type.
+    """
+    from bioimageio.core import load_resource_description
+    from bioimageio.core.prediction import predict
+    from bioimageio.core.prediction_pipeline import create_prediction_pipeline
+    from bioimageio.spec import load_raw_resource_description
+
+    model = load_resource_description(load_raw_resource_description(model_data))
+    inputs = [np.load(str(path)) for path in model.test_inputs]
+    with create_prediction_pipeline(
+        bioimageio_model=model, devices=devices or ["cpu"]
+    ) as pipeline:
+        results = predict(pipeline, inputs)
+    shapes = []
+    for output, result, dest in zip(model_data["outputs"], results, dest_paths):
+        result = np.asarray(result).astype(output.get("data_type", "float32"))
+        write_npy(result, dest)
+        shapes.append(list(result.shape))
+
+    return shapes
+
+
+def regenerate_test_outputs(
+    model_data: dict,
+    dest_dir: Union[str, Path],
+    devices: Optional[List[str]] = None,
+) -> dict:
+    """Returns a copy of the model data with newly predicted test outputs.
+
+    The prediction runs in the shared pool of worker processes (see
+    run_in_prediction_pool); outputs are saved in dest_dir as '<output name>.npy'.
+    Explicit output shapes are updated, along with the test outputs, at once.
+    """
+    dest_paths = [
+        str(Path(dest_dir) / f"{output['name']}.npy")
+        for output in model_data["outputs"]
+    ]
+    Path(dest_dir).mkdir(parents=True, exist_ok=True)
+    # the workers need files: package members and in-memory tensors are saved
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        files_data = extract_package_references(model_data, tmp_dir)
+        files_data = write_memory_tensors(files_data, tmp_dir)
+        shapes = run_in_prediction_pool(
+            predict_test_outputs, files_data, dest_paths, devices
+        )
+
+    model_data = copy.deepcopy(model_data)
+    model_data["test_outputs"] = dest_paths
+    for output, shape in zip(model_data["outputs"], shapes):
+        if isinstance(output.get("shape"), list):
+            output["shape"] = shape
+
+    return model_data
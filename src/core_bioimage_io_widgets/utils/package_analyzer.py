@@ -0,0 +1,215 @@
+"""Analyze the size of built model packages and suggest how to shrink them."""
+
+import argparse
+import zipfile
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import yaml
+
+from core_bioimage_io_widgets.utils.io_utils import read_npy_header
+from core_bioimage_io_widgets.utils.package_utils import RDF_NAME
+
+# spatial axes of test inputs larger than this are worth cropping
+MAX_TEST_SIZE = 256
+SPATIAL_AXES = "zyx"
+
+
+class MemberSize(NamedTuple):
+    """Raw and compressed size of a package member."""
+
+    name: str
+    size: int
+    compressed_size: int
+
+    @property
+    def ratio(self) -> float:
+        """Compression ratio (raw size / compressed size)."""
+        return self.size / self.compressed_size if self.compressed_size else 1.0
+
+
+class ShrinkSuggestion(NamedTuple):
+    """A suggested fix to make the package smaller."""
+
+    member: str
+    reason: str
+    # estimated saving of the compressed package size, in bytes
+    savings: int
+    # the new shape of an explicitly shaped input, if its test input is cropped
+    shape: Optional[Tuple[int, ...]] = None
+
+
+class PackageAnalysis(NamedTuple):
+    """Size analysis of a package."""
+
+    package: str
+    members: List[MemberSize]
+    suggestions: List[ShrinkSuggestion]
+
+    @property
+    def size(self) -> int:
+        """Total raw size of the members."""
+        return sum(member.size for member in self.members)
+
+    @property
+    def compressed_size(self) -> int:
+        """Total compressed size of the members."""
+        return sum(member.compressed_size for member in self.members)
+
+    @property
+    def savings(self) -> int:
+        """Estimated savings of all the suggestions."""
+        return sum(suggestion.savings for suggestion in self.suggestions)
+
+    def to_text(self) -> str:
+        """Returns the analysis as a text report."""
+        lines = [
+            self.package,
+            f"  {'member':40} {'size':>12} {'compressed':>12} {'ratio':>7}",
+        ]
+        for member in sorted(self.members, key=lambda m: -m.compressed_size):
+            lines.append(
+                f"  {member.name:40} {member.size:12,} "
+                f"{member.compressed_size:12,} {member.ratio:7.2f}"
+            )
+        lines.append(f"  {'total':40} {self.size:12,} {self.compressed_size:12,}")
+        for suggestion in self.suggestions:
+            lines.append(
+                f"  * {suggestion.member}: {suggestion.reason}"
+                f" (saves ~{suggestion.savings:,} bytes)"
+            )
+        if self.suggestions:
+            lines.append(f"  estimated total savings: ~{self.savings:,} bytes")
+
+        return "\n".join(lines)
+
+
+def get_crop_shape(
+    shape: Sequence[int],
+    axes: str,
+    min_shape: Optional[Sequence[int]] = None,
+    step: Optional[Sequence[int]] = None,
+    max_size: int = MAX_TEST_SIZE,
+) -> Tuple[int, ...]:
+    """Returns the shape to crop a test input to.
+
+    Spatial axes are cropped to max_size; for parametrized input shapes
+    the size is aligned to the valid min + k * step sizes, and axes of a
+    fixed size (step 0) are not cropped. Without min_shape and step, the
+    input shape is taken as unconstrained.
+    """
+    crop_shape = []
+    for i, (size, axis) in enumerate(zip(shape, axes)):
+        if axis not in SPATIAL_AXES or size <= max_size:
+            crop_shape.append(size)
+            continue
+        if min_shape is None or step is None:
+            crop_shape.append(max_size)
+            continue
+        if step[i] == 0:
+            crop_shape.append(size)
+            continue
+        # smallest valid size not below max_size
+        n_steps = max(0, -(-(max_size - min_shape[i]) // step[i]))
+        crop_shape.append(min(size, min_shape[i] + n_steps * step[i]))
+
+    return tuple(crop_shape)
+
+
+def _tensor_suggestions(
+    zip_file: zipfile.ZipFile,
+    member: str,
+    tensor: Dict,
+    is_input: bool,
+    max_size: int,
+) -> List[ShrinkSuggestion]:
+    info = zip_file.getinfo(member)
+    with zip_file.open(member) as f:
+        shape, dtype = read_npy_header(f)
+    reasons = []
+    # fraction of the compressed size that is kept
+    kept = 1.0
+    if dtype == np.float64:
+        reasons.append("float64 test tensor could be saved as float32")
+        kept /= 2
+    spec_shape = tensor.get("shape")
+    # an explicit input shape is set to the cropped one along with the test input
+    new_shape = None
+    if is_input:
+        min_shape = step = None
+        if isinstance(spec_shape, dict):
+            min_shape, step = spec_shape.get("min"), spec_shape.get("step")
+        crop_shape = get_crop_shape(
+            shape, tensor.get("axes", ""), min_shape, step, max_size
+        )
+        if crop_shape != tuple(shape):
+            reason = f"test input {tuple(shape)} could be cropped to {crop_shape}"
+            if isinstance(spec_shape, list):
+                new_shape = crop_shape
+                reason += ", with the input's shape set to it"
+            reasons.append(reason)
+            kept *= float(np.prod(crop_shape)) / float(np.prod(shape))
+    if not reasons:
+        return []
+
+    return [
+        ShrinkSuggestion(
+            member,
+            " and ".join(reasons),
+            int(info.compress_size * (1 - kept)),
+            new_shape,
+        )
+    ]
+
+
+def analyze_package(
+    zip_path: Union[str, Path], max_test_size: int = MAX_TEST_SIZE
+) -> PackageAnalysis:
+    """Analyze the members' sizes and suggest fixes to shrink the package.
+
+    Only the zip central directory, rdf.yaml and the .npy headers are read.
+    """
+    with zipfile.ZipFile(zip_path) as zip_file:
+        members = [
+            MemberSize(info.filename, info.file_size, info.compress_size)
+            for info in zip_file.infolist()
+            if not info.is_dir()
+        ]
+        rdf = yaml.safe_load(zip_file.read(RDF_NAME))
+        names = set(zip_file.namelist())
+        suggestions: List[ShrinkSuggestion] = []
+        for key, tensors_key in (
+            ("test_inputs", "inputs"),
+            ("test_outputs", "outputs"),
+        ):
+            for member, tensor in zip(rdf.get(key, []), rdf.get(tensors_key, [])):
+                if member in names and member.endswith(".npy"):
+                    suggestions.extend(
+                        _tensor_suggestions(
+                            zip_file,
+                            member,
+                            tensor,
+                            tensors_key == "inputs",
+                            max_test_size,
+                        )
+                    )
+
+    return PackageAnalysis(str(zip_path), members, suggestions)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Print the size analysis of model packages."""
+    parser = argparse.ArgumentParser(
+        description="Analyze the size of BioImage.io model packages"
+    )
+    parser.add_argument("packages", nargs="+", help="model zip files")
+    parser.add_argument("--max-test-size", type=int, default=MAX_TEST_SIZE)
+    args = parser.parse_args(argv)
+
+    for zip_path in args.packages:
+        print(analyze_package(zip_path, args.max_test_size).to_text())
+
+
+if __name__ == "__main__":
+    main()
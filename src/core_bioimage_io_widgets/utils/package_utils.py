@@ -0,0 +1,422 @@
+"""Utilities to inspect and update built model packages (zip files)."""
+
+import copy
+import json
+import os
+import struct
+import tempfile
+import zipfile
+import zlib
+from pathlib import Path
+from typing import IO, Any, Callable, Dict, List, Optional, Tuple, Union
+
+import yaml
+
+from core_bioimage_io_widgets.utils.file_cache import file_sha256, get_file_cache
+
+RDF_NAME = "rdf.yaml"
+# a package member is referenced as 'zip://<member>::<zip path>'
+PACKAGE_URI_SCHEME = "zip://"
+# fields that can change without touching any packaged file
+METADATA_KEYS = (
+    "name",
+    "description",
+    "authors",
+    "maintainers",
+    "cite",
+    "tags",
+    "license",
+    "git_repo",
+    "links",
+    "version",
+)
+# tensor fields that the packaged files depend on
+TENSOR_KEYS = ("name", "axes", "shape", "halo", "preprocessing", "postprocessing")
+_ZIP64_EXTRA_ID = 1
+_COPY_BUFFER_SIZE = 1024 * 1024
+# kind of the cached file checksums
+CRC32 = "crc32"
+
+
+def read_package_rdf(zip_path: Union[str, Path]) -> dict:
+    """Read the rdf.yaml of a model package, without touching other members."""
+    with zipfile.ZipFile(zip_path) as zip_file:
+        rdf: dict = yaml.safe_load(zip_file.read(RDF_NAME))
+
+    return rdf
+
+
+def package_member_uri(zip_path: Union[str, Path], member: str) -> str:
+    """Returns the uri of a package member."""
+    return f"{PACKAGE_URI_SCHEME}{member}::{Path(zip_path).absolute()}"
+
+
+def split_package_uri(uri: Any) -> Optional[Tuple[str, str]]:
+    """Returns the zip path and the member name of a package uri.
+
+    None is returned if the given uri is not a package uri.
+    """
+    if not isinstance(uri, str) or not uri.startswith(PACKAGE_URI_SCHEME):
+        return None
+    member, _, zip_path = uri[len(PACKAGE_URI_SCHEME) :].partition("::")
+    if not member or not zip_path:
+        return None
+
+    return zip_path, member
+
+
+def open_package_member(uri: str) -> IO[bytes]:
+    """Open a package member for reading, without extracting it.
+
+    Only the read part of the member is decompressed, e.g. a .npy header.
+    """
+    split = split_package_uri(uri)
+    if split is None:
+        raise ValueError(f"Not a package uri: {uri}")
+    zip_path, member = split
+    zip_file = zipfile.ZipFile(zip_path)
+    try:
+        member_file = zip_file.open(member)
+    except KeyError:
+        zip_file.close()
+        raise
+    # close the zip file along with the member
+    _close = member_file.close
+
+    def close() -> None:
+        _close()
+        zip_file.close()
+
+    member_file.close = close  # type: ignore[method-assign]
+    return member_file
+
+
+def extract_package_member(uri: str, dest_dir: Union[str, Path]) -> Path:
+    """Extract a package member into the destination directory."""
+    split = split_package_uri(uri)
+    if split is None:
+        raise ValueError(f"Not a package uri: {uri}")
+    zip_path, member = split
+    with zipfile.ZipFile(zip_path) as zip_file:
+        return Path(zip_file.extract(member, dest_dir))
+
+
+def _map_file_references(model_data: dict, map_fn: Callable[[str], str]) -> dict:
+    """Returns a copy of the model data with its file references mapped."""
+    model_data = copy.deepcopy(model_data)
+    model_data["documentation"] = map_fn(model_data["documentation"])
+    model_data["test_inputs"] = [map_fn(path) for path in model_data["test_inputs"]]
+    model_data["test_outputs"] = [map_fn(path) for path in model_data["test_outputs"]]
+    if "covers" in model_data:
+        model_data["covers"] = [map_fn(path) for path in model_data["covers"]]
+    for entry in model_data["weights"].values():
+        entry["source"] = map_fn(entry["source"])
+        if "architecture" in entry:
+            source, _, name = entry["architecture"].rpartition(":")
+            entry["architecture"] = f"{map_fn(source)}:{name}"
+
+    return model_data
+
+
+def load_package_specs(zip_path: Union[str, Path]) -> dict:
+    """Read a package's model specifications, referencing its members by uri.
+
+    Only rdf.yaml is read; the other members are accessed when they are needed.
+    """
+    with zipfile.ZipFile(zip_path) as zip_file:
+        rdf = yaml.safe_load(zip_file.read(RDF_NAME))
+        members = set(zip_file.namelist())
+
+    def to_uri(path: str) -> str:
+        if path in members:
+            return package_member_uri(zip_path, path)
+        return path
+
+    return _map_file_references(rdf, to_uri)
+
+
+def extract_package_references(model_data: dict, dest_dir: Union[str, Path]) -> dict:
+    """Returns a copy of the model data with its package members extracted."""
+
+    def to_path(uri: str) -> str:
+        if split_package_uri(uri) is None:
+            return uri
+        return str(extract_package_member(uri, dest_dir))
+
+    return _map_file_references(model_data, to_path)
+
+
+def get_file_references(model_data: dict) -> List[str]:
+    """Returns the files (paths or uris) referenced by the model data.
+
+    Fields missing in an incomplete model data are skipped.
+    """
+    sources: List[str] = []
+
+    def collect(uri: str) -> str:
+        sources.append(uri)
+        return uri
+
+    try:
+        _map_file_references(model_data, collect)
+    except (KeyError, TypeError, AttributeError):
+        pass
+
+    return sources
+
+
+def get_source_package(model_data: dict) -> Optional[str]:
+    """Returns the package that the model data's files are referenced from, if any."""
+    for source in get_file_references(model_data):
+        split = split_package_uri(source)
+        if split is not None:
+            return split[0]
+
+    return None
+
+
+def _resolve(source: str, root: Path) -> Path:
+    path = Path(source)
+    if not path.is_absolute():
+        path = root / path
+
+    return path
+
+
+def _crc32(path: Path) -> int:
+    crc = 0
+    with open(path, mode="rb") as f:
+        for chunk in iter(lambda: f.read(_COPY_BUFFER_SIZE), b""):
+            crc = zlib.crc32(chunk, crc)
+
+    return crc
+
+
+def _is_packaged(
+    source: Any,
+    packaged: Any,
+    zip_file: zipfile.ZipFile,
+    root: Path,
+    sha256: Optional[str] = None,
+) -> bool:
+    """Returns True if the source file has the content of the packaged member.
+
+    Files are compared by the sha256 recorded in the rdf if given (weights),
+    else by the member's CRC32; the checksums of local files are cached.
+    """
+    if not isinstance(source, str) or not isinstance(packaged, str):
+        return False
+    split = split_package_uri(source)
+    if split is not None:
+        # referenced from a package
+        zip_path, member = split
+        return (
+            Path(zip_path).resolve() == Path(str(zip_file.filename)).resolve()
+            and member == packaged
+        )
+    try:
+        info = zip_file.getinfo(packaged)
+    except KeyError:
+        return False
+    path = _resolve(source, root)
+    if not path.is_file() or path.stat().st_size != info.file_size:
+        return False
+    if sha256:
+        return bool(file_sha256(path) == sha256)
+
+    return bool(get_file_cache().get(path, CRC32, _crc32) == info.CRC)
+
+
+def _same_tensors(tensors: List[dict], packaged_tensors: List[dict]) -> bool:
+    if len(tensors) != len(packaged_tensors):
+        return False
+    for tensor, packaged in zip(tensors, packaged_tensors):
+        for key in TENSOR_KEYS:
+            # compare tuples and lists alike
+            if json.dumps(tensor.get(key)) != json.dumps(packaged.get(key)):
+                return False
+
+    return True
+
+
+# a referenced file and its packaged member (with the member's sha256 or None)
+_FilePair = Tuple[Any, Any, Optional[str]]
+
+
+def _paired_weights(weights: dict, packaged_weights: dict) -> Optional[List[_FilePair]]:
+    """Returns the weights files paired with the packaged ones.
+
+    None is returned if the weights entries differ beyond their files.
+    """
+    if weights.keys() != packaged_weights.keys():
+        return None
+    pairs = []
+    for weight_type, entry in weights.items():
+        packaged = packaged_weights[weight_type]
+        pairs.append((entry["source"], packaged["source"], packaged.get("sha256")))
+        if entry.get("kwargs") != packaged.get("kwargs"):
+            return None
+        if "architecture" in entry:
+            source, _, name = entry["architecture"].rpartition(":")
+            packaged_source, _, packaged_name = packaged.get(
+                "architecture", ""
+            ).rpartition(":")
+            if name != packaged_name:
+                return None
+            pairs.append((source, packaged_source, None))
+
+    return pairs
+
+
+def _paired_files(model_data: dict, rdf: dict) -> Optional[List[_FilePair]]:
+    """Returns the files referenced by the model data paired with the packaged ones.
+
+    None is returned if the model data differs from the rdf beyond its metadata
+    and its files.
+    """
+    if not _same_tensors(model_data["inputs"], rdf["inputs"]):
+        return None
+    if not _same_tensors(model_data["outputs"], rdf["outputs"]):
+        return None
+    pairs: List[_FilePair] = [(model_data["documentation"], rdf["documentation"], None)]
+    for key in ("test_inputs", "test_outputs", "covers"):
+        if key == "covers" and key not in model_data:
+            continue
+        members = rdf.get(key, [])
+        if len(model_data[key]) != len(members):
+            return None
+        pairs.extend(
+            (source, member, None) for source, member in zip(model_data[key], members)
+        )
+    weights_pairs = _paired_weights(model_data["weights"], rdf["weights"])
+    if weights_pairs is None:
+        return None
+
+    return pairs + weights_pairs
+
+
+def is_metadata_only_change(
+    model_data: dict, zip_path: Union[str, Path], root: Optional[str] = None
+) -> bool:
+    """Check if the model data differs from the package only in its metadata.
+
+    The referenced files (weights, test tensors, documentation and covers)
+    must have the content of the packaged ones, and the tensor descriptions
+    must be the same. A file that is not a model package is never just
+    updated, so False is returned for it.
+    """
+    root_dir = Path(root) if root is not None else Path(zip_path).parent
+    try:
+        with zipfile.ZipFile(zip_path) as zip_file:
+            rdf = yaml.safe_load(zip_file.read(RDF_NAME))
+            pairs = _paired_files(model_data, rdf)
+            return pairs is not None and all(
+                _is_packaged(source, packaged, zip_file, root_dir, sha256)
+                for source, packaged, sha256 in pairs
+            )
+    except (OSError, KeyError, TypeError, zipfile.BadZipFile, yaml.YAMLError):
+        # not a zip file, or a zip file without a valid rdf
+        return False
+
+
+def _strip_zip64_extra(extra: bytes) -> bytes:
+    """Remove the zip64 extra field; it is re-created when writing the header."""
+    stripped = b""
+    i = 0
+    while i + 4 <= len(extra):
+        field_id, size = struct.unpack("<HH", extra[i : i + 4])
+        if field_id != _ZIP64_EXTRA_ID:
+            stripped += extra[i : i + 4 + size]
+        i += 4 + size
+
+    return stripped
+
+
+def _copy_raw_member(
+    src: zipfile.ZipFile, dst: zipfile.ZipFile, info: zipfile.ZipInfo
+) -> None:
+    """Copy a member's compressed bytes as-is, without decompressing them."""
+    # find the member's data offset from its local header
+    src.fp.seek(info.header_offset)
+    header = struct.unpack(
+        zipfile.structFileHeader, src.fp.read(zipfile.sizeFileHeader)
+    )
+    src.fp.seek(
+        header[zipfile._FH_FILENAME_LENGTH] + header[zipfile._FH_EXTRA_FIELD_LENGTH],
+        os.SEEK_CUR,
+    )
+    new_info = copy.copy(info)
+    # sizes and crc are known: write them in the local header
+    new_info.flag_bits &= ~0x08
+    new_info.extra = _strip_zip64_extra(info.extra)
+    new_info.header_offset = dst.fp.tell()
+    dst.fp.write(new_info.FileHeader())
+    remaining = info.compress_size
+    while remaining > 0:
+        chunk = src.fp.read(min(_COPY_BUFFER_SIZE, remaining))
+        if not chunk:
+            raise zipfile.BadZipFile(f"Truncated member: {info.filename}")
+        dst.fp.write(chunk)
+        remaining -= len(chunk)
+    dst.filelist.append(new_info)
+    dst.NameToInfo[new_info.filename] = new_info
+
+
+def replace_package_members(
+    zip_path: Union[str, Path],
+    members: Dict[str, bytes],
+    dest_path: Optional[Union[str, Path]] = None,
+) -> None:
+    """Write the given members into the package without recompressing the others.
+
+    The compressed bytes of all other members are copied as-is into a new
+    package, which replaces dest_path (the package itself by default); the
+    replaced members are left out, so the package does not grow.
+    """
+    if dest_path is None:
+        dest_path = zip_path
+    dest_path = Path(dest_path)
+    fd, tmp_path = tempfile.mkstemp(suffix=".zip", dir=dest_path.parent)
+    os.close(fd)
+    try:
+        with zipfile.ZipFile(zip_path) as src, zipfile.ZipFile(
+            tmp_path, mode="w"
+        ) as dst:
+            for name, data in members.items():
+                dst.writestr(name, data, compress_type=zipfile.ZIP_DEFLATED)
+            for info in src.infolist():
+                if info.filename not in members:
+                    _copy_raw_member(src, dst, info)
+            # the central directory goes after the copied members
+            dst.start_dir = dst.fp.tell()
+        os.replace(tmp_path, dest_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def update_package_metadata(
+    model_data: dict,
+    zip_path: Union[str, Path],
+    dest_path: Optional[Union[str, Path]] = None,
+    root: Optional[str] = None,
+) -> bool:
+    """Update only the rdf.yaml of a package, if just the metadata has changed.
+
+    Returns False (and leaves the package untouched) if the model data changes
+    anything beyond its metadata; then the package must be rebuilt.
+    """
+    if not is_metadata_only_change(model_data, zip_path, root):
+        return False
+    rdf = read_package_rdf(zip_path)
+    for key in METADATA_KEYS:
+        if key in model_data:
+            rdf[key] = model_data[key]
+        else:
+            rdf.pop(key, None)
+    if "timestamp" in model_data:
+        rdf["timestamp"] = model_data["timestamp"]
+    rdf_data = yaml.safe_dump(rdf, default_flow_style=False).encode()
+    replace_package_members(zip_path, {RDF_NAME: rdf_data}, dest_path)
+
+    return True
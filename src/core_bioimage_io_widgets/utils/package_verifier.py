@@ -0,0 +1,192 @@
+"""Verify the integrity of built model packages."""
+
+import argparse
+import hashlib
+import os
+import sys
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+import yaml
+
+from core_bioimage_io_widgets.utils.package_utils import RDF_NAME
+
+_HASH_BUFFER_SIZE = 1024 * 1024
+
+
+class MemberCheck(NamedTuple):
+    """Verification result of a package member."""
+
+    member: str
+    # the sha256 recorded in rdf.yaml, if any
+    expected: Optional[str]
+    actual: Optional[str]
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        """True if the member is readable and matches its recorded sha256."""
+        return self.error is None and (
+            self.expected is None or self.expected == self.actual
+        )
+
+
+class VerificationReport(NamedTuple):
+    """Verification results of a package."""
+
+    package: str
+    checks: List[MemberCheck]
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        """True if all the referenced members are verified."""
+        return self.error is None and all(check.ok for check in self.checks)
+
+    @property
+    def mismatches(self) -> List[MemberCheck]:
+        """Members that failed the verification."""
+        return [check for check in self.checks if not check.ok]
+
+    def to_errors(self) -> Dict[str, list]:
+        """Returns the failures as a validation errors dictionary."""
+        errors: Dict[str, list] = {}
+        if self.error is not None:
+            errors[self.package] = [self.error]
+        for check in self.mismatches:
+            if check.error is not None:
+                errors[check.member] = [check.error]
+            else:
+                errors[check.member] = [
+                    f"sha256 mismatch: expected {check.expected}, got {check.actual}"
+                ]
+
+        return errors
+
+
+def get_referenced_members(rdf: dict) -> Dict[str, Optional[str]]:
+    """Returns the package members referenced in rdf.yaml with their sha256.
+
+    The sha256 is None for the files that have no recorded checksum.
+    """
+    members: Dict[str, Optional[str]] = {}
+    for weights in rdf.get("weights", {}).values():
+        members[weights["source"]] = weights.get("sha256")
+        source = weights.get("architecture", "").rpartition(":")[0]
+        # an importable module ('pkg.module:Class') is not a packaged file
+        if source.endswith(".py") or "/" in source:
+            members[source] = weights.get("architecture_sha256")
+    for key in ("test_inputs", "test_outputs", "covers"):
+        for path in rdf.get(key, []):
+            members.setdefault(path, None)
+    if "documentation" in rdf:
+        members.setdefault(rdf["documentation"], None)
+
+    return members
+
+
+def hash_member(zip_path: Union[str, Path], member: str) -> str:
+    """Stream a package member and returns its sha256.
+
+    The member's crc is checked as well once it is fully read.
+    """
+    sha = hashlib.sha256()
+    # each call has its own file handle, so members are read concurrently
+    with zipfile.ZipFile(zip_path) as zip_file, zip_file.open(member) as f:
+        for chunk in iter(lambda: f.read(_HASH_BUFFER_SIZE), b""):
+            sha.update(chunk)
+
+    return sha.hexdigest()
+
+
+def _check_member(
+    zip_path: Union[str, Path], member: str, expected: Optional[str]
+) -> MemberCheck:
+    try:
+        return MemberCheck(member, expected, hash_member(zip_path, member))
+    except KeyError:
+        return MemberCheck(member, expected, None, "Missing from the package.")
+    except (zipfile.BadZipFile, OSError) as err:
+        return MemberCheck(member, expected, None, str(err))
+
+
+def _list_checks(zip_path: Union[str, Path]) -> List[Tuple[str, Optional[str]]]:
+    with zipfile.ZipFile(zip_path) as zip_file:
+        rdf = yaml.safe_load(zip_file.read(RDF_NAME))
+    # remote references are not part of the package
+    return [
+        (member, sha)
+        for member, sha in get_referenced_members(rdf).items()
+        if "://" not in member
+    ]
+
+
+def verify_packages(
+    zip_paths: Sequence[Union[str, Path]], max_workers: Optional[int] = None
+) -> List[VerificationReport]:
+    """Verify the packages' members against the checksums in their rdf.yaml.
+
+    Members of all the packages are hashed in one thread pool (hashing and
+    decompression release the GIL), so the throughput is bound by the disk.
+    """
+    max_workers = max_workers or min(32, (os.cpu_count() or 1) + 4)
+    reports: List[VerificationReport] = []
+    with ThreadPoolExecutor(max_workers, thread_name_prefix="verify") as executor:
+        futures = []
+        for zip_path in zip_paths:
+            try:
+                members = _list_checks(zip_path)
+            except (KeyError, zipfile.BadZipFile, OSError, yaml.YAMLError) as err:
+                futures.append((str(zip_path), [], f"Invalid package: {err}"))
+                continue
+            futures.append(
+                (
+                    str(zip_path),
+                    [
+                        executor.submit(_check_member, zip_path, member, sha)
+                        for member, sha in members
+                    ],
+                    None,
+                )
+            )
+        for package, member_futures, error in futures:
+            checks = [future.result() for future in member_futures]
+            reports.append(VerificationReport(package, checks, error))
+
+    return reports
+
+
+def verify_package(
+    zip_path: Union[str, Path], max_workers: Optional[int] = None
+) -> VerificationReport:
+    """Verify a package's members against the checksums in its rdf.yaml."""
+    return verify_packages([zip_path], max_workers)[0]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Verify model packages from the command line."""
+    parser = argparse.ArgumentParser(description="Verify BioImage.io model packages")
+    parser.add_argument("packages", nargs="+", help="model zip files")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument(
+        "-v", "--verbose", action="store_true", help="print each member's sha256"
+    )
+    args = parser.parse_args(argv)
+
+    failed = 0
+    for report in verify_packages(args.packages, args.workers):
+        print(f"{report.package}: {'OK' if report.ok else 'FAILED'}")
+        if args.verbose:
+            for check in report.checks:
+                print(f"  {check.actual or '-':64}  {check.member}")
+        for member, messages in report.to_errors().items():
+            print(f"  {member}: {'; '.join(messages)}")
+        failed += not report.ok
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,344 @@
+"""Import authors and citations in bulk from CSV, BibTeX and CITATION.cff files."""
+
+import csv
+import re
+import unicodedata
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, NamedTuple, Sequence, Tuple, Union
+
+import yaml
+
+from core_bioimage_io_widgets.utils import schemas
+from core_bioimage_io_widgets.utils.doi_resolver import (
+    format_citation,
+    normalize_doi,
+    resolve_dois,
+)
+
+AUTHOR_FIELDS = ("name", "affiliation", "email", "github_user", "orcid")
+CITE_FIELDS = ("text", "doi", "url")
+AUTHORS_FILE_FILTER = "Author lists (*.csv *.cff);;All files (*)"
+CITES_FILE_FILTER = "Reference lists (*.bib *.csv *.cff);;All files (*)"
+ORCID_REGEX = re.compile(r"^\d{4}-\d{4}-\d{4}-\d{3}[\dX]$")
+_ORCID_PREFIXES = ("https://orcid.org/", "http://orcid.org/")
+# bibtex entries that are not references
+_BIBTEX_SKIPPED = ("comment", "preamble")
+# combining characters of the latex accents
+_LATEX_ACCENTS = {
+    '"': "\u0308",
+    "'": "\u0301",
+    "`": "\u0300",
+    "^": "\u0302",
+    "~": "\u0303",
+    "c": "\u0327",
+}
+
+
+class ImportResult(NamedTuple):
+    """The valid entries of an imported file, and the errors of the others."""
+
+    entries: List[dict]
+    # keyed by '<file name> #<entry number>'
+    errors: Dict[str, Any]
+
+
+def _clean(entry: Dict[str, Any], fields: Sequence[str]) -> dict:
+    # keep the known, non empty fields
+    cleaned = {}
+    for field in fields:
+        value = entry.get(field)
+        if value is not None and str(value).strip():
+            cleaned[field] = str(value).strip()
+
+    return cleaned
+
+
+def iter_csv_entries(path: Union[str, Path], fields: Sequence[str]) -> Iterator[dict]:
+    """Yields the rows of a CSV file, with the given fields as columns.
+
+    Column headers are matched case-insensitively, with spaces or dashes
+    standing for underscores (e.g. 'GitHub User').
+    """
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        reader = csv.reader(f)
+        header = next(reader, [])
+        columns = [re.sub(r"[\s-]+", "_", column.strip().lower()) for column in header]
+        for row in reader:
+            if any(value.strip() for value in row):
+                yield _clean(dict(zip(columns, row)), fields)
+
+
+def _scan_delimited(text: str, start: int, closing: str) -> int:
+    # returns the index of the closing delimiter of a {...} or "..." value, or
+    # the text's length if it's missing; braces nest, and a quote only closes
+    # the value outside of braces
+    depth = 0
+    for index in range(start + 1, len(text)):
+        char = text[index]
+        if char == "{":
+            depth += 1
+        elif char == "}":
+            depth -= 1
+            if closing == "}" and depth < 0:
+                return index
+        elif char == closing and depth == 0 and text[index - 1] != "\\":
+            return index
+
+    return len(text)
+
+
+def _bibtex_value(text: str, start: int, macros: Dict[str, str]) -> Tuple[str, int]:
+    # returns a {...}, "..." or bare (maybe a @string macro) value, and the
+    # index after it
+    if text[start] in ("{", '"'):
+        end = _scan_delimited(text, start, "}" if text[start] == "{" else '"')
+        return text[start + 1 : end], min(end + 1, len(text))
+    match = re.match(r"[^,})#\s]*", text[start:])
+    value = match.group(0)
+
+    return macros.get(value.lower(), value), start + match.end()
+
+
+def _latex_accent(match: "re.Match") -> str:
+    return unicodedata.normalize(
+        "NFC", match.group(2) + _LATEX_ACCENTS[match.group(1).strip()]
+    )
+
+
+def _latex_to_text(value: str) -> str:
+    value = re.sub(r"\\([\"'`^~]|c )\s*\{?([A-Za-z])\}?", _latex_accent, value)
+    value = re.sub(r"\\[a-zA-Z]+\s*\{([^{}]*)\}", r"\1", value)
+    value = re.sub(r"\\(.)", r"\1", value)
+    return " ".join(value.replace("{", "").replace("}", "").split())
+
+
+def _parse_bibtex_fields(text: str, index: int, macros: Dict[str, str]) -> dict:
+    fields = {}
+    field_regex = re.compile(r"\s*([\w-]+)\s*=\s*")
+    while True:
+        field = field_regex.match(text, index)
+        if field is None:
+            break
+        index = field.end()
+        parts = []
+        # values can be concatenated by '#'
+        while index < len(text):
+            part, index = _bibtex_value(text, index, macros)
+            parts.append(part)
+            concat = re.match(r"\s*#\s*", text[index:])
+            if concat is None:
+                break
+            index += concat.end()
+        fields[field.group(1).lower()] = "".join(parts)
+        comma = re.match(r"\s*,", text[index:])
+        if comma is None:
+            break
+        index += comma.end()
+
+    return fields
+
+
+def iter_bibtex_entries(path: Union[str, Path]) -> Iterator[dict]:
+    """Yields the entries of a BibTeX file, one at a time.
+
+    Each entry is a dictionary of its lowercase field names, plus its type
+    ('ENTRYTYPE') and key ('ID'); braces and LaTeX escapes are removed from
+    the values.
+    """
+    buffer = ""
+    # @string macros, by their lowercase names
+    macros: Dict[str, str] = {}
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if not buffer:
+                # text between the entries is ignored
+                at = line.find("@")
+                if at < 0:
+                    continue
+                line = line[at:]
+            buffer += line
+            opening = re.match(r"@\s*(\w+)\s*([{(])", buffer)
+            if opening is None:
+                continue
+            closing = "}" if opening.group(2) == "{" else ")"
+            if buffer.count(opening.group(2)) > buffer.count(closing):
+                continue
+            text, buffer = buffer, ""
+            entry_type = opening.group(1).lower()
+            if entry_type == "string":
+                fields = _parse_bibtex_fields(text, opening.end(), macros)
+                macros.update((name.lower(), value) for name, value in fields.items())
+            elif entry_type not in _BIBTEX_SKIPPED:
+                key = re.match(r"\s*([^,\s]*)\s*,?", text[opening.end() :])
+                fields = _parse_bibtex_fields(text, opening.end() + key.end(), macros)
+                entry = {name: _latex_to_text(value) for name, value in fields.items()}
+                yield {"ENTRYTYPE": entry_type, "ID": key.group(1), **entry}
+
+
+def _normalize_orcid(orcid: str) -> str:
+    for prefix in _ORCID_PREFIXES:
+        if orcid.startswith(prefix):
+            return orcid[len(prefix) :]
+    return orcid
+
+
+def _split_bibtex_author(author: str) -> dict:
+    if "," in author:
+        family, given = author.split(",", 1)
+        return {"family": family.strip(), "given": given.strip()}
+    names = author.split()
+    if len(names) == 1:
+        return {"literal": author}
+    return {"family": names[-1], "given": " ".join(names[:-1])}
+
+
+def bibtex_entry_to_cite(entry: dict) -> dict:
+    """Returns the citation entry (text, doi, url) of a BibTeX entry."""
+    csl = {
+        "author": [
+            _split_bibtex_author(author)
+            for author in re.split(r"\s+and\s+", entry.get("author", ""))
+            if author.strip()
+        ],
+        "title": entry.get("title"),
+        "container-title": entry.get("journal") or entry.get("booktitle"),
+    }
+    if entry.get("year"):
+        csl["issued"] = {"date-parts": [[entry["year"]]]}
+    cite = {"doi": normalize_doi(entry.get("doi", "")), "url": entry.get("url")}
+    if entry.get("title"):
+        cite["text"] = format_citation(csl)
+
+    return _clean(cite, CITE_FIELDS)
+
+
+def _cff_author(author: dict) -> dict:
+    name = " ".join(
+        author[key]
+        for key in ("given-names", "name-particle", "family-names", "name-suffix")
+        if author.get(key)
+    )
+    return _clean(
+        {
+            "name": name or author.get("name"),
+            "affiliation": author.get("affiliation"),
+            "email": author.get("email"),
+            "orcid": author.get("orcid"),
+        },
+        AUTHOR_FIELDS,
+    )
+
+
+def _cff_reference_to_cite(reference: dict) -> dict:
+    csl = {
+        "author": [
+            (
+                {
+                    "family": author["family-names"],
+                    "given": author.get("given-names", ""),
+                }
+                if author.get("family-names")
+                else {"literal": author.get("name", "")}
+            )
+            for author in reference.get("authors", [])
+        ],
+        "title": reference.get("title"),
+        "container-title": reference.get("journal")
+        or reference.get("conference", {}).get("name"),
+    }
+    if reference.get("year"):
+        csl["issued"] = {"date-parts": [[reference["year"]]]}
+    cite = {
+        "doi": normalize_doi(str(reference.get("doi", ""))),
+        "url": reference.get("url"),
+    }
+    if reference.get("title"):
+        cite["text"] = format_citation(csl)
+
+    return _clean(cite, CITE_FIELDS)
+
+
+def read_cff(path: Union[str, Path]) -> Tuple[List[dict], List[dict]]:
+    """Returns the authors and the citations (preferred first) of a CITATION.cff."""
+    with open(path, encoding="utf-8") as f:
+        cff = yaml.safe_load(f) or {}
+    authors = [_cff_author(author) for author in cff.get("authors", [])]
+    references = list(cff.get("references", []))
+    if "preferred-citation" in cff:
+        references.insert(0, cff["preferred-citation"])
+
+    return authors, [_cff_reference_to_cite(reference) for reference in references]
+
+
+def validate_entries(
+    entries: List[dict], schema: Any, source: str = "entry"
+) -> ImportResult:
+    """Validate the entries in one pass of the schema (with many=True).
+
+    Returns the valid entries, and the errors of the invalid ones.
+    """
+    errors: Dict[str, Any] = {}
+    # the spec's orcid validator fails on malformed values, so check them first
+    for index, entry in enumerate(entries):
+        if "orcid" in entry and not ORCID_REGEX.match(entry["orcid"]):
+            errors[f"{source} #{index + 1}"] = {"orcid": ["Not a valid ORCID."]}
+    checked = [
+        (index, entry)
+        for index, entry in enumerate(entries)
+        if f"{source} #{index + 1}" not in errors
+    ]
+    schema_errors = schema.validate([entry for _, entry in checked], many=True)
+    valid = []
+    for position, (index, entry) in enumerate(checked):
+        if position in schema_errors:
+            errors[f"{source} #{index + 1}"] = schema_errors[position]
+        else:
+            valid.append(entry)
+
+    return ImportResult(valid, errors)
+
+
+def import_authors(path: Union[str, Path]) -> ImportResult:
+    """Read and validate the authors of a CSV or CITATION.cff file."""
+    path = Path(path)
+    if path.suffix.lower() == ".cff":
+        entries, _ = read_cff(path)
+    else:
+        entries = list(iter_csv_entries(path, AUTHOR_FIELDS))
+
+    for entry in entries:
+        if "orcid" in entry:
+            entry["orcid"] = _normalize_orcid(entry["orcid"])
+
+    return validate_entries(entries, schemas.rdf.Author(), path.name)
+
+
+def import_cites(path: Union[str, Path], resolve: bool = True) -> ImportResult:
+    """Read and validate the citations of a BibTeX, CSV or CITATION.cff file.
+
+    If resolve is True, the texts of citations that only have a DOI are
+    resolved from the DOIs, concurrently.
+    """
+    path = Path(path)
+    suffix = path.suffix.lower()
+    if suffix == ".bib":
+        entries = [bibtex_entry_to_cite(entry) for entry in iter_bibtex_entries(path)]
+    elif suffix == ".cff":
+        _, entries = read_cff(path)
+    else:
+        entries = list(iter_csv_entries(path, CITE_FIELDS))
+        for entry in entries:
+            if "doi" in entry:
+                entry["doi"] = normalize_doi(entry["doi"]) or entry["doi"]
+
+    unresolved = [
+        entry["doi"] for entry in entries if "text" not in entry and "doi" in entry
+    ]
+    if resolve and unresolved:
+        citations = resolve_dois(unresolved)
+        for entry in entries:
+            citation = citations.get(normalize_doi(entry.get("doi", "")) or "")
+            if "text" not in entry and isinstance(citation, dict):
+                entry.update({**citation, **entry})
+
+    return validate_entries(entries, schemas.rdf.CiteEntry(), path.name)
@@ -0,0 +1,469 @@
+"""A Qt-free builder for the model specifications."""
+
+import copy
+import datetime as dt
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+from bioimageio.core.resource_tests import test_resource
+from bioimageio.spec import load_raw_resource_description
+
+from core_bioimage_io_widgets.utils import nodes
+from core_bioimage_io_widgets.utils.constants import (
+    FORMAT_VERSION,
+    PYTORCH_STATE_DICT,
+)
+from core_bioimage_io_widgets.utils.io_utils import (
+    build_model_zip,
+    read_npy_header,
+    write_memory_tensors,
+)
+from core_bioimage_io_widgets.utils.memory_tensors import is_memory_uri, register_array
+from core_bioimage_io_widgets.utils.package_analyzer import MAX_TEST_SIZE
+from core_bioimage_io_widgets.utils.package_utils import (
+    extract_package_references,
+    get_file_references,
+    split_package_uri,
+)
+from core_bioimage_io_widgets.utils.schemas import model
+from core_bioimage_io_widgets.utils.tensor_utils import (
+    crop_test_tensor,
+    crop_test_tensors,
+)
+
+# number of validation results kept, the least recently used are dropped
+VALIDATION_CACHE_SIZE = 128
+
+_local = threading.local()
+_validation_cache: "OrderedDict[str, Dict[str, list]]" = OrderedDict()
+_validation_lock = threading.Lock()
+
+
+def get_model_schema() -> model.Model:
+    """Returns a model schema instance, cached per thread."""
+    model_schema = getattr(_local, "model_schema", None)
+    if model_schema is None:
+        model_schema = model.Model()
+        _local.model_schema = model_schema
+
+    return model_schema
+
+
+def _file_fingerprint(uri: str) -> Any:
+    if is_memory_uri(uri):
+        return None
+    split = split_package_uri(uri)
+    path = split[0] if split is not None else uri
+    try:
+        stat = os.stat(path)
+    except (OSError, ValueError):
+        return None
+
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def get_spec_hash(model_data: dict) -> str:
+    """Returns a hash of the model data, and of the files it references.
+
+    The hash ignores the timestamp and the order of the keys; a change of
+    size or mtime of a referenced file changes it.
+    """
+    data = {key: value for key, value in model_data.items() if key != "timestamp"}
+    fingerprints = [
+        [uri, _file_fingerprint(uri)]
+        for uri in get_file_references(model_data)
+        if isinstance(uri, str)
+    ]
+    canonical = json.dumps(
+        [data, fingerprints], sort_keys=True, separators=(",", ":"), default=str
+    )
+
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+def validate_model_data(model_data: dict) -> Dict[str, list]:
+    """Validate the model data against the model schema and returns the errors.
+
+    Results are cached by the hash of the model data (see get_spec_hash),
+    so validating unchanged specs returns at once.
+    """
+    spec_hash = get_spec_hash(model_data)
+    with _validation_lock:
+        if spec_hash in _validation_cache:
+            _validation_cache.move_to_end(spec_hash)
+            return copy.deepcopy(_validation_cache[spec_hash])
+
+    errors: Dict[str, list] = get_model_schema().validate(model_data)
+    # NOTE: check for the model's name to be not empty.
+    if len(errors) == 0:
+        if len(model_data["name"]) == 0:
+            errors["name"] = ["Model's name is required."]
+    with _validation_lock:
+        _validation_cache[spec_hash] = copy.deepcopy(errors)
+        while len(_validation_cache) > VALIDATION_CACHE_SIZE:
+            _validation_cache.popitem(last=False)
+
+    return errors
+
+
+def clear_validation_cache() -> None:
+    """Drop all the cached validation results."""
+    with _validation_lock:
+        _validation_cache.clear()
+
+
+def deep_validate_model_data(model_data: dict) -> Dict[str, list]:
+    """Validate the model data and run the bioimageio.core resource tests on it.
+
+    As for building the package, in-memory tensors and package members are
+    written to a temporary directory for the tests.
+    """
+    errors = validate_model_data(model_data)
+    if errors:
+        return errors
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        model_data = extract_package_references(model_data, tmp_dir)
+        model_data = write_memory_tensors(model_data, tmp_dir)
+        summaries = test_resource(load_raw_resource_description(model_data))
+    for summary in summaries:
+        if summary["status"] != "passed":
+            errors.setdefault(summary["name"], []).append(summary["error"])
+
+    return errors
+
+
+def _drop_none(data: dict) -> dict:
+    return {k: v for k, v in data.items() if v is not None}
+
+
+class AuthorSpec(NamedTuple):
+    """Model's author."""
+
+    name: str
+    email: Optional[str] = None
+    affiliation: Optional[str] = None
+    github_user: Optional[str] = None
+    orcid: Optional[str] = None
+    # other fields of the author's entry
+    extra: Optional[dict] = None
+
+    def to_dict(self) -> dict:
+        """Returns the author as a spec dictionary."""
+        return _drop_none({**self._asdict(), "extra": None, **(self.extra or {})})
+
+    @classmethod
+    def from_dict(cls, author: dict) -> "AuthorSpec":
+        """Create an author record from a spec author entry."""
+        fields = {k: v for k, v in author.items() if k in cls._fields}
+        extra = {k: v for k, v in author.items() if k not in cls._fields}
+        return cls(extra=extra or None, **fields)
+
+
+class CiteSpec(NamedTuple):
+    """Model's citation entry."""
+
+    text: str
+    doi: Optional[str] = None
+    url: Optional[str] = None
+
+    def to_dict(self) -> dict:
+        """Returns the citation as a spec dictionary."""
+        return _drop_none(self._asdict())
+
+
+class TensorSpec(NamedTuple):
+    """Model's input or output tensor along with its test tensor file."""
+
+    name: str
+    axes: str
+    # explicit, parametrized ({min, step}) or implicit ({reference_tensor, ...})
+    shape: Union[Tuple[int, ...], dict]
+    test_tensor: str
+    data_type: str = "float32"
+    processing: Tuple[dict, ...] = ()
+    halo: Optional[Tuple[int, ...]] = None
+
+    def to_dict(self, processing_key: str) -> dict:
+        """Returns the tensor description as a spec dictionary."""
+        tensor = {
+            "name": self.name,
+            "data_type": self.data_type,
+            "shape": (
+                dict(self.shape) if isinstance(self.shape, dict) else list(self.shape)
+            ),
+            "axes": self.axes,
+        }
+        if self.halo is not None:
+            tensor["halo"] = list(self.halo)
+        if len(self.processing) > 0:
+            tensor[processing_key] = list(self.processing)
+
+        return tensor
+
+    @classmethod
+    def from_dict(cls, tensor: dict, test_tensor: str) -> "TensorSpec":
+        """Create a tensor record from a spec dictionary."""
+        halo = tensor.get("halo")
+        shape = tensor["shape"]
+        return cls(
+            name=tensor["name"],
+            axes=tensor["axes"],
+            shape=dict(shape) if isinstance(shape, dict) else tuple(shape),
+            test_tensor=test_tensor,
+            data_type=tensor.get("data_type", "float32"),
+            processing=tuple(
+                tensor.get("preprocessing", tensor.get("postprocessing", []))
+            ),
+            halo=tuple(halo) if halo is not None else None,
+        )
+
+
+class WeightsSpec(NamedTuple):
+    """Model's weights entry."""
+
+    format: str
+    source: str
+    architecture: Optional[str] = None
+    architecture_sha256: Optional[str] = None
+    kwargs: Optional[dict] = None
+    # other format specific fields, e.g. 'opset_version' for onnx
+    extra: Optional[dict] = None
+
+    def to_dict(self) -> dict:
+        """Returns the weights as a spec dictionary."""
+        entry = {"source": self.source}
+        if self.format == PYTORCH_STATE_DICT:
+            entry.update(
+                _drop_none(
+                    {
+                        "architecture": self.architecture,
+                        "architecture_sha256": self.architecture_sha256,
+                        "kwargs": self.kwargs,
+                    }
+                )
+            )
+        if self.extra:
+            entry.update(self.extra)
+
+        return {self.format: entry}
+
+    @classmethod
+    def from_dict(cls, weights_format: str, entry: dict) -> "WeightsSpec":
+        """Create a weights record from a spec weights entry."""
+        fields = {k: v for k, v in entry.items() if k in cls._fields}
+        extra = {k: v for k, v in entry.items() if k not in cls._fields}
+        return cls(format=weights_format, extra=extra or None, **fields)
+
+
+class ModelSpecBuilder:
+    """Builds, validates and packages model specifications without any ui."""
+
+    def __init__(
+        self,
+        name: str = "",
+        description: str = "",
+        license: str = "",
+        documentation: str = "",
+    ) -> None:
+        self.name = name
+        self.description = description
+        self.license = license
+        self.documentation = documentation
+        self.authors: List[AuthorSpec] = []
+        self.cites: List[CiteSpec] = []
+        self.inputs: List[TensorSpec] = []
+        self.outputs: List[TensorSpec] = []
+        self.weights: Optional[WeightsSpec] = None
+        self.covers: List[str] = []
+        self.tags: List[str] = []
+
+    def add_author(self, name: str, **kwargs: str) -> AuthorSpec:
+        """Add an author to the model."""
+        author = AuthorSpec(name, **kwargs)
+        self.authors.append(author)
+        return author
+
+    def add_cite(
+        self, text: str, doi: Optional[str] = None, url: Optional[str] = None
+    ) -> CiteSpec:
+        """Add a citation to the model."""
+        cite = CiteSpec(text, doi, url)
+        self.cites.append(cite)
+        return cite
+
+    def add_input(
+        self,
+        test_input: Union[str, Path, Any],
+        axes: str,
+        name: Optional[str] = None,
+        preprocessing: Sequence[dict] = (),
+    ) -> TensorSpec:
+        """Add a model's input; the shape is read from the test input file.
+
+        The test input can also be an in-memory array, referenced without a copy.
+        """
+        name = name or f"input_{len(self.inputs) + 1}"
+        if not isinstance(test_input, (str, Path)):
+            test_input = register_array(test_input, name)
+        shape, _dtype = read_npy_header(test_input)
+        tensor = TensorSpec(
+            name=name,
+            axes=axes,
+            shape=tuple(shape),
+            test_tensor=str(test_input),
+            processing=tuple(preprocessing),
+        )
+        self.inputs.append(tensor)
+        return tensor
+
+    def add_output(
+        self,
+        test_output: Union[str, Path, Any],
+        axes: str,
+        name: Optional[str] = None,
+        halo: Optional[Sequence[int]] = None,
+        postprocessing: Sequence[dict] = (),
+    ) -> TensorSpec:
+        """Add a model's output; the shape and type are read from the test output.
+
+        The test output can also be an in-memory array, referenced without a copy.
+        """
+        name = name or f"output_{len(self.outputs) + 1}"
+        if not isinstance(test_output, (str, Path)):
+            test_output = register_array(test_output, name)
+        shape, dtype = read_npy_header(test_output)
+        tensor = TensorSpec(
+            name=name,
+            axes=axes,
+            shape=tuple(shape),
+            test_tensor=str(test_output),
+            data_type=str(dtype),
+            processing=tuple(postprocessing),
+            halo=tuple(halo) if halo is not None else None,
+        )
+        self.outputs.append(tensor)
+        return tensor
+
+    def crop_test_tensors(
+        self,
+        dest_dir: Optional[Union[str, Path]] = None,
+        max_size: int = MAX_TEST_SIZE,
+    ) -> None:
+        """Replace the test tensors by their cropped versions.
+
+        Inputs and outputs are cropped in pairs (by their order) to the same
+        region; unpaired tensors are cropped on their own.
+        """
+        inputs = list(self.inputs)
+        outputs = list(self.outputs)
+        for i, (tensor_in, tensor_out) in enumerate(zip(self.inputs, self.outputs)):
+            cropped_in, cropped_out = crop_test_tensors(
+                tensor_in.test_tensor,
+                tensor_in.axes,
+                tensor_out.test_tensor,
+                tensor_out.axes,
+                dest_dir,
+                max_size,
+                tensor_out.halo,
+            )
+            inputs[i] = self._with_test_tensor(tensor_in, cropped_in)
+            outputs[i] = self._with_test_tensor(tensor_out, cropped_out)
+        n_pairs = min(len(inputs), len(outputs))
+        for tensors in (inputs, outputs):
+            for i, tensor in enumerate(tensors[n_pairs:], start=n_pairs):
+                cropped = crop_test_tensor(
+                    tensor.test_tensor, tensor.axes, dest_dir, max_size, tensor.halo
+                )
+                tensors[i] = self._with_test_tensor(tensor, cropped)
+        self.inputs = inputs
+        self.outputs = outputs
+
+    @staticmethod
+    def _with_test_tensor(
+        tensor: TensorSpec, test_tensor: Union[str, Path]
+    ) -> TensorSpec:
+        shape, _dtype = read_npy_header(test_tensor)
+        return tensor._replace(test_tensor=str(test_tensor), shape=tuple(shape))
+
+    def set_weights(self, weights_format: str, source: str, **kwargs: Any) -> None:
+        """Set the model's weights; kwargs are the format specific fields."""
+        self.weights = WeightsSpec.from_dict(
+            weights_format, {"source": source, **kwargs}
+        )
+
+    def to_dict(self) -> dict:
+        """Returns the model specifications as a dictionary."""
+        model_data = {
+            "type": "model",
+            "format_version": FORMAT_VERSION,
+            "timestamp": dt.datetime.now().isoformat(),
+            "name": self.name,
+            "description": self.description,
+            "license": self.license,
+            "documentation": self.documentation,
+            "authors": [author.to_dict() for author in self.authors],
+            "cite": [cite.to_dict() for cite in self.cites],
+            "weights": self.weights.to_dict() if self.weights is not None else {},
+            "test_inputs": [tensor.test_tensor for tensor in self.inputs],
+            "inputs": [tensor.to_dict("preprocessing") for tensor in self.inputs],
+            "test_outputs": [tensor.test_tensor for tensor in self.outputs],
+            "outputs": [tensor.to_dict("postprocessing") for tensor in self.outputs],
+        }
+        if len(self.covers) > 0:
+            model_data["covers"] = list(self.covers)
+        if len(self.tags) > 0:
+            model_data["tags"] = list(self.tags)
+
+        return model_data
+
+    @classmethod
+    def from_dict(cls, model_data: dict) -> "ModelSpecBuilder":
+        """Create a builder from the model specifications dictionary."""
+        builder = cls(
+            name=model_data.get("name", ""),
+            description=model_data.get("description", ""),
+            license=model_data.get("license", ""),
+            documentation=model_data.get("documentation", ""),
+        )
+        builder.authors = [
+            AuthorSpec.from_dict(author) for author in model_data["authors"]
+        ]
+        builder.cites = [CiteSpec(**cite) for cite in model_data["cite"]]
+        builder.inputs = [
+            TensorSpec.from_dict(tensor, test_input)
+            for tensor, test_input in zip(
+                model_data["inputs"], model_data["test_inputs"]
+            )
+        ]
+        builder.outputs = [
+            TensorSpec.from_dict(tensor, test_output)
+            for tensor, test_output in zip(
+                model_data["outputs"], model_data["test_outputs"]
+            )
+        ]
+        if len(model_data.get("weights", {})) > 0:
+            weights_format, entry = next(iter(model_data["weights"].items()))
+            builder.weights = WeightsSpec.from_dict(weights_format, entry)
+        builder.covers = list(model_data.get("covers", []))
+        builder.tags = list(model_data.get("tags", []))
+
+        return builder
+
+    def validate(self) -> Dict[str, list]:
+        """Validate the model specifications and returns the errors."""
+        return validate_model_data(self.to_dict())
+
+    def build(self, zip_file_path: Union[str, Path]) -> nodes.model.Model:
+        """Validate the specifications and build the model zip file."""
+        model_data = self.to_dict()
+        errors = validate_model_data(model_data)
+        if errors:
+            raise ValueError(f"Invalid model specifications: {errors}")
+
+        return build_model_zip(model_data, str(zip_file_path))
@@ -0,0 +1,277 @@
+"""Lazy readers of the test tensor formats, and their conversion to .npy."""
+
+import contextlib
+import os
+import shutil
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path, PurePosixPath
+from typing import Any, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+
+from core_bioimage_io_widgets.utils.io_utils import read_npy_header
+from core_bioimage_io_widgets.utils.package_utils import (
+    open_package_member,
+    split_package_uri,
+)
+
+try:
+    import tifffile
+except ImportError:
+    tifffile = None
+
+try:
+    import zarr
+except ImportError:
+    zarr = None
+
+# an array inside a .npz file or a zarr group is referenced as '<path>#<key>'
+# ('::' already separates the member and the package of package uris)
+KEY_SEPARATOR = "#"
+TENSOR_FILE_FILTER = "Tensor files (*.npy *.npz *.tif *.tiff *.zarray)"
+# bytes read at once by each worker of the conversion
+CHUNK_SIZE = 64 * 1024 * 1024
+
+
+def _source_name(source: str) -> str:
+    # the file name of a path, or of a package member
+    split = split_package_uri(source)
+    return PurePosixPath(split[1]).name if split is not None else Path(source).name
+
+
+def _has_arrays(source: str) -> bool:
+    # a .npz file or a zarr store, which can hold several arrays
+    name = _source_name(source)
+    return (
+        Path(name).suffix.lower() in (".npz", ".zarr")
+        or name in (".zarray", ".zgroup")
+        or os.path.isdir(source)
+    )
+
+
+def _split_key(path: Union[str, Path]) -> Tuple[str, Optional[str]]:
+    source, separator, key = str(path).rpartition(KEY_SEPARATOR)
+    if not separator or not _has_arrays(source):
+        source, key = str(path), ""
+    if _source_name(source) in (".zarray", ".zgroup"):
+        # a zarr store selected by its metadata file
+        source = str(Path(source).parent)
+
+    return source, key or None
+
+
+@contextlib.contextmanager
+def _open_npz(source: str) -> Iterator[zipfile.ZipFile]:
+    if split_package_uri(source) is None:
+        with zipfile.ZipFile(source) as npz_file:
+            yield npz_file
+        return
+    # a package member is read through the package
+    with open_package_member(source) as f, zipfile.ZipFile(f) as npz_file:
+        yield npz_file
+
+
+def get_tensor_format(path: Union[str, Path]) -> str:
+    """Returns the format of a test tensor file: npy, npz, tiff or zarr."""
+    source, _key = _split_key(path)
+    suffix = Path(_source_name(source)).suffix.lower()
+    if suffix in (".tif", ".tiff"):
+        return "tiff"
+    if (
+        suffix == ".zarr"
+        or (Path(source) / ".zarray").exists()
+        or (Path(source) / ".zgroup").exists()
+    ):
+        return "zarr"
+    if suffix == ".npz":
+        return "npz"
+
+    return "npy"
+
+
+def _npz_member(npz_file: zipfile.ZipFile, key: Optional[str]) -> str:
+    names = [name for name in npz_file.namelist() if name.endswith(".npy")]
+    if key is None:
+        if len(names) != 1:
+            raise ValueError(
+                "The .npz file has several arrays;"
+                f" select one as '<file>{KEY_SEPARATOR}<key>'."
+            )
+        return names[0]
+
+    return f"{key}.npy"
+
+
+def list_tensor_keys(path: Union[str, Path]) -> List[str]:
+    """Returns the keys of the arrays of a .npz file or a zarr group.
+
+    Other formats (and paths already selecting an array) have no keys.
+    """
+    source, key = _split_key(path)
+    tensor_format = get_tensor_format(path)
+    if key is not None or tensor_format not in ("npz", "zarr"):
+        return []
+    if tensor_format == "npz":
+        with _open_npz(source) as npz_file:
+            return [
+                name[: -len(".npy")]
+                for name in npz_file.namelist()
+                if name.endswith(".npy")
+            ]
+    if zarr is None or not (Path(source) / ".zgroup").exists():
+        return []
+    keys: List[str] = []
+
+    def _add_array(name: str, item: Any) -> None:
+        # groups have no dtype
+        if hasattr(item, "dtype"):
+            keys.append(name)
+
+    zarr.open_group(source, mode="r").visititems(_add_array)
+
+    return keys
+
+
+class _TiffArray:
+    """A TIFF series read lazily, page by page, when sliced along the first axis."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        with tifffile.TiffFile(path) as tif:
+            series = tif.series[0]
+            self.shape: Tuple[int, ...] = tuple(series.shape)
+            self.dtype = np.dtype(series.dtype)
+            # the series' axes are the pages' axes, after the page shape
+            # (which includes the samples, e.g. of RGB images)
+            page_axes = self.shape[: len(self.shape) - len(series.pages[0].shape)]
+        # number of pages per index of the first axis; 0 if the first axis is
+        # one of the page's axes
+        self.pages_per_row = int(np.prod(page_axes[1:])) if page_axes else 0
+
+    def __getitem__(self, index: slice) -> np.ndarray:
+        start, stop, _step = index.indices(self.shape[0])
+        if stop <= start:
+            return np.empty((0, *self.shape[1:]), dtype=self.dtype)
+        if self.pages_per_row == 0:
+            # a single page
+            return np.asarray(tifffile.imread(self.path))[start:stop]
+        pages = range(start * self.pages_per_row, stop * self.pages_per_row)
+        data = tifffile.imread(self.path, key=pages)
+        return np.asarray(data).reshape((stop - start, *self.shape[1:]))
+
+
+def open_tensor(path: Union[str, Path]) -> Any:
+    """Open a test tensor lazily, as an array-like having shape and dtype.
+
+    Only the metadata is read; the data is read when the array is sliced.
+    """
+    source, key = _split_key(path)
+    tensor_format = get_tensor_format(path)
+    if tensor_format == "tiff":
+        if tifffile is None:
+            raise ImportError("Reading TIFF files requires 'tifffile'.")
+        return _TiffArray(Path(source))
+    if tensor_format == "zarr":
+        if zarr is None:
+            raise ImportError("Reading zarr stores requires 'zarr'.")
+        store = zarr.open(source, mode="r")
+        if key is not None:
+            return store[key]
+        if not hasattr(store, "dtype"):
+            raise ValueError(
+                "The zarr group has several arrays;"
+                f" select one as '<path>{KEY_SEPARATOR}<key>'."
+            )
+        return store
+    if tensor_format == "npz":
+        # compressed arrays can't be memory-mapped
+        with _open_npz(source) as npz_file, npz_file.open(
+            _npz_member(npz_file, key)
+        ) as f:
+            return np.load(f)
+
+    if split_package_uri(source) is not None:
+        # compressed package members can't be memory-mapped either
+        with open_package_member(source) as f:
+            return np.load(f)
+
+    return np.load(source, mmap_mode="r")
+
+
+def read_tensor_header(path: Union[str, Path]) -> Tuple[Tuple[int, ...], np.dtype]:
+    """Returns the shape and dtype of a test tensor, reading only its metadata."""
+    tensor_format = get_tensor_format(path)
+    if tensor_format == "npy":
+        return read_npy_header(_split_key(path)[0])
+    if tensor_format == "npz":
+        source, key = _split_key(path)
+        with _open_npz(source) as npz_file, npz_file.open(
+            _npz_member(npz_file, key)
+        ) as f:
+            return read_npy_header(f)
+    array = open_tensor(path)
+
+    return tuple(array.shape), np.dtype(array.dtype)
+
+
+def get_npy_path(path: Union[str, Path]) -> Path:
+    """Returns the default path of the converted .npy file (next to the source).
+
+    The .npy file of a package member goes next to the package.
+    """
+    source, key = _split_key(path)
+    split = split_package_uri(source)
+    directory = Path(split[0] if split is not None else source).parent
+    stem = Path(_source_name(source)).stem
+    if key is not None:
+        stem = f"{stem}_{key.replace('/', '_')}"
+
+    return directory / f"{stem}.npy"
+
+
+def convert_to_npy(
+    path: Union[str, Path],
+    dest: Optional[Union[str, Path]] = None,
+    max_workers: Optional[int] = None,
+    chunk_size: int = CHUNK_SIZE,
+) -> Path:
+    """Convert a test tensor to a .npy file in bounded memory.
+
+    Slabs of at most chunk_size bytes along the first axis are read and
+    written by a pool of workers into the memory-mapped destination.
+    A .npz array is already in the .npy format, and is copied as a stream.
+    """
+    dest = Path(dest) if dest is not None else get_npy_path(path)
+    tensor_format = get_tensor_format(path)
+    if tensor_format == "npz":
+        source, key = _split_key(path)
+        with _open_npz(source) as npz_file, npz_file.open(
+            _npz_member(npz_file, key)
+        ) as src, open(dest, mode="wb") as dst:
+            shutil.copyfileobj(src, dst, chunk_size)
+        return dest
+
+    array = open_tensor(path)
+    shape = tuple(array.shape)
+    out = np.lib.format.open_memmap(
+        dest, mode="w+", dtype=np.dtype(array.dtype), shape=shape
+    )
+    if len(shape) == 0 or 0 in shape:
+        if len(shape) == 0:
+            out[...] = np.asarray(array[...])
+        out.flush()
+        return dest
+    row_size = max(1, out.dtype.itemsize * int(np.prod(shape[1:])))
+    rows = max(1, chunk_size // row_size)
+
+    def _copy(start: int) -> None:
+        out[start : start + rows] = np.asarray(array[start : start + rows])
+
+    max_workers = max_workers or min(8, os.cpu_count() or 1)
+    with ThreadPoolExecutor(max_workers, thread_name_prefix="to-npy") as executor:
+        # consume the results to raise the workers' errors
+        list(executor.map(_copy, range(0, shape[0], rows)))
+    out.flush()
+
+    return dest
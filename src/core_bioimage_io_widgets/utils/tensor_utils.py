@@ -0,0 +1,406 @@
+"""Utilities to derive smaller test tensors, and to compare tensors."""
+
+import math
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Iterator, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from core_bioimage_io_widgets.utils.constants import OUTPUT_TYPES
+from core_bioimage_io_widgets.utils.memory_tensors import (
+    get_array,
+    is_memory_uri,
+    register_array,
+)
+from core_bioimage_io_widgets.utils.package_analyzer import (
+    MAX_TEST_SIZE,
+    SPATIAL_AXES,
+    get_crop_shape,
+)
+from core_bioimage_io_widgets.utils.package_utils import (
+    open_package_member,
+    split_package_uri,
+)
+
+CROP_SUFFIX = "_crop"
+# number of elements scanned at once
+CHUNK_SIZE = 4 * 1024 * 1024
+# the absolute tolerance of the model tests, at their default decimal (4)
+TEST_TOLERANCE = 1.5e-4
+
+
+def load_npy(npy_file: Union[str, Path]) -> np.ndarray:
+    """Load a numpy file memory-mapped, so only the sliced parts are read.
+
+    Package members are compressed and can't be mapped: they are loaded as a whole.
+    In-memory arrays are returned as they are.
+    """
+    if is_memory_uri(npy_file):
+        return get_array(str(npy_file))
+    if split_package_uri(npy_file) is not None:
+        with open_package_member(str(npy_file)) as f:
+            return np.load(f)
+
+    return np.load(npy_file, mmap_mode="r")
+
+
+def get_crop_window(
+    shape: Sequence[int],
+    axes: str,
+    max_size: int = MAX_TEST_SIZE,
+    halo: Optional[Sequence[int]] = None,
+    min_shape: Optional[Sequence[int]] = None,
+    step: Optional[Sequence[int]] = None,
+) -> Tuple[slice, ...]:
+    """Returns a centered crop window of the spatial axes.
+
+    The crop size is aligned to the valid input sizes (min + k * step), and
+    keeps more than twice the halo along each axis (rounded up to the next
+    valid size).
+    """
+    crop_shape = get_crop_shape(shape, axes, min_shape, step, max_size)
+    window = []
+    for i, (size, crop_size) in enumerate(zip(shape, crop_shape)):
+        if halo is not None and crop_size < 2 * halo[i] + 1:
+            crop_size = 2 * halo[i] + 1
+            if min_shape is not None and step is not None and step[i] > 0:
+                n_steps = max(0, -(-(crop_size - min_shape[i]) // step[i]))
+                crop_size = min_shape[i] + n_steps * step[i]
+            crop_size = min(size, crop_size)
+        start = (size - crop_size) // 2
+        window.append(slice(start, start + crop_size))
+
+    return tuple(window)
+
+
+def _dest_path(
+    npy_file: Union[str, Path],
+    dest_dir: Optional[Union[str, Path]],
+    suffix: str = CROP_SUFFIX,
+) -> Path:
+    split = split_package_uri(npy_file)
+    path = Path(split[1] if split is not None else npy_file)
+    if dest_dir is None:
+        dest_dir = Path(split[0]).parent if split is not None else path.parent
+
+    return Path(dest_dir) / f"{path.stem}{suffix}.npy"
+
+
+def _save_crop(
+    npy_file: Union[str, Path],
+    arr: np.ndarray,
+    window: Tuple[slice, ...],
+    dest_dir: Optional[Union[str, Path]],
+) -> Union[str, Path]:
+    if is_memory_uri(npy_file) and dest_dir is None:
+        # the crop of an in-memory array is a view, registered as a new array
+        name = f"{Path(str(npy_file)).stem}{CROP_SUFFIX}"
+        return register_array(arr[window], name)
+
+    return _save_window(arr, window, _dest_path(npy_file, dest_dir))
+
+
+def _save_window(arr: np.ndarray, window: Tuple[slice, ...], dest: Path) -> Path:
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    # only the window is read from the memory-mapped array
+    np.save(dest, np.ascontiguousarray(arr[window]))
+    return dest
+
+
+def crop_test_tensor(
+    npy_file: Union[str, Path],
+    axes: str,
+    dest_dir: Optional[Union[str, Path]] = None,
+    max_size: int = MAX_TEST_SIZE,
+    halo: Optional[Sequence[int]] = None,
+) -> Union[str, Path]:
+    """Save a centered crop of the test tensor, and returns its path.
+
+    The cropped file is written next to the source (or its package) as
+    '<name>_crop.npy', unless a destination directory is given.
+    Without a destination directory, in-memory arrays are cropped in memory,
+    and the uri of the crop is returned.
+    """
+    arr = load_npy(npy_file)
+    if len(axes) != arr.ndim:
+        raise ValueError(f"Axes '{axes}' do not match the tensor shape {arr.shape}.")
+    window = get_crop_window(arr.shape, axes, max_size, halo)
+
+    return _save_crop(npy_file, arr, window, dest_dir)
+
+
+def crop_test_tensors(
+    test_input: Union[str, Path],
+    input_axes: str,
+    test_output: Union[str, Path],
+    output_axes: str,
+    dest_dir: Optional[Union[str, Path]] = None,
+    max_size: int = MAX_TEST_SIZE,
+    halo: Optional[Sequence[int]] = None,
+    min_shape: Optional[Sequence[int]] = None,
+    step: Optional[Sequence[int]] = None,
+    scale: Optional[Sequence[float]] = None,
+    offset: Optional[Sequence[float]] = None,
+) -> Tuple[Union[str, Path], Union[str, Path]]:
+    """Crop a test input and output pair to the same region.
+
+    The output's window follows the input's one, by the output's scale and
+    offset (of an output shape referencing the input); without them, the
+    scale is the ratio of the spatial sizes. The halo (of the output) is
+    kept on both sides.
+    Only the tensor values inside the halo-free region are independent of
+    the crop, so the model's test tolerance must allow for the borders (or
+    the test output should be regenerated from the cropped input).
+    """
+    arr_in = load_npy(test_input)
+    arr_out = load_npy(test_output)
+    if len(input_axes) != arr_in.ndim or len(output_axes) != arr_out.ndim:
+        raise ValueError("Axes do not match the test tensors' shapes.")
+    # the halo and scale of the input's spatial axes
+    scales: List[float] = []
+    input_halo: List[int] = []
+    for axis, size in zip(input_axes, arr_in.shape):
+        j = output_axes.find(axis)
+        if axis not in SPATIAL_AXES or j < 0:
+            axis_scale = 1.0
+        elif scale is not None:
+            axis_scale = scale[j]
+        else:
+            axis_scale = arr_out.shape[j] / size
+        scales.append(axis_scale)
+        out_halo = halo[j] if halo is not None and j >= 0 else 0
+        input_halo.append(math.ceil(out_halo / axis_scale))
+    in_window = get_crop_window(
+        arr_in.shape, input_axes, max_size, input_halo, min_shape, step
+    )
+    out_window = []
+    for j, axis in enumerate(output_axes):
+        i = input_axes.find(axis)
+        if axis in SPATIAL_AXES and i >= 0:
+            # the output is larger (or smaller) by twice the offset
+            pad = 2 * offset[j] if offset is not None else 0
+            start = max(0, round(in_window[i].start * scales[i]))
+            stop = round(in_window[i].stop * scales[i] + pad)
+            out_window.append(slice(start, min(arr_out.shape[j], stop)))
+        else:
+            out_window.append(slice(None))
+
+    return (
+        _save_crop(test_input, arr_in, in_window, dest_dir),
+        _save_crop(test_output, arr_out, tuple(out_window), dest_dir),
+    )
+
+
+class TensorStats(NamedTuple):
+    """Value range of a tensor."""
+
+    dtype: str
+    min: float
+    max: float
+    # all values are whole numbers (and finite)
+    is_integral: bool
+    has_nan: bool
+    # the largest error of the (float64) values saved as float32
+    float32_error: float = 0.0
+
+
+def _iter_chunks(arr: np.ndarray, chunk_size: int) -> Iterator[np.ndarray]:
+    # a flat view of the (memory-mapped) array; fortran ordered ones as well
+    flat = arr.reshape(-1, order="F" if np.isfortran(arr) else "C")
+    for start in range(0, flat.size, chunk_size):
+        yield flat[start : start + chunk_size]
+
+
+def scan_tensor(
+    npy_file: Union[str, Path], chunk_size: int = CHUNK_SIZE
+) -> TensorStats:
+    """Find the value range and integrality of a tensor, chunk by chunk."""
+    arr = load_npy(npy_file)
+    is_float = np.issubdtype(arr.dtype, np.floating)
+    min_value, max_value = math.inf, -math.inf
+    is_integral = True
+    has_nan = False
+    float32_error = 0.0
+    for chunk in _iter_chunks(arr, chunk_size):
+        if is_float:
+            nans = np.isnan(chunk)
+            if nans.any():
+                has_nan = True
+                is_integral = False
+                chunk = chunk[~nans]
+            if chunk.size == 0:
+                continue
+            if is_integral:
+                is_integral = bool(np.all(np.isfinite(chunk) & (np.mod(chunk, 1) == 0)))
+            if arr.dtype == np.float64:
+                with np.errstate(over="ignore", invalid="ignore"):
+                    error = np.abs(chunk - chunk.astype(np.float32))
+                finite = error[np.isfinite(error)]
+                if finite.size > 0:
+                    float32_error = max(float32_error, finite.max().item())
+        if chunk.size > 0:
+            min_value = min(min_value, chunk.min().item())
+            max_value = max(max_value, chunk.max().item())
+
+    return TensorStats(
+        str(arr.dtype), min_value, max_value, is_integral, has_nan, float32_error
+    )
+
+
+def narrowest_dtype(stats: TensorStats, tolerance: float = TEST_TOLERANCE) -> str:
+    """Returns the narrowest data type of OUTPUT_TYPES holding the tensor's values.
+
+    Whole numbers get the smallest integer type covering their range; other
+    values get float32 when they are within its range, and saving them as
+    float32 changes them by at most the tolerance (of the model tests).
+    """
+    candidates = sorted(
+        OUTPUT_TYPES,
+        # unsigned, then signed integers, then floats of the same size
+        key=lambda t: (np.dtype(t).itemsize, "uif".index(np.dtype(t).kind)),
+    )
+    for candidate in candidates:
+        dtype = np.dtype(candidate)
+        if dtype.itemsize >= np.dtype(stats.dtype).itemsize:
+            break
+        if dtype.kind in "iu":
+            if not stats.is_integral:
+                continue
+            info = np.iinfo(dtype)
+        else:
+            if stats.float32_error > tolerance:
+                continue
+            info = np.finfo(dtype)  # type: ignore[assignment]
+        if info.min <= stats.min and stats.max <= info.max:
+            return candidate
+
+    return stats.dtype
+
+
+def convert_test_tensor(
+    npy_file: Union[str, Path],
+    dtype: str,
+    dest: Optional[Union[str, Path]] = None,
+    chunk_size: int = CHUNK_SIZE,
+) -> Union[str, Path]:
+    """Save the tensor with the given data type, chunk by chunk.
+
+    The destination defaults to '<name>_<dtype>.npy' next to the source;
+    in-memory arrays are converted in memory by default.
+    """
+    arr = load_npy(npy_file)
+    if is_memory_uri(npy_file) and dest is None:
+        name = f"{Path(str(npy_file)).stem}_{dtype}"
+        return register_array(np.asarray(arr).astype(dtype), name)
+    dest = Path(dest) if dest is not None else _dest_path(npy_file, None, f"_{dtype}")
+    out = np.lib.format.open_memmap(
+        dest,
+        mode="w+",
+        dtype=dtype,
+        shape=arr.shape,
+        fortran_order=bool(np.isfortran(arr)),
+    )
+    for src_chunk, out_chunk in zip(
+        _iter_chunks(arr, chunk_size), _iter_chunks(out, chunk_size)
+    ):
+        out_chunk[...] = src_chunk
+    out.flush()
+    del out
+
+    return dest
+
+
+class TensorComparison(NamedTuple):
+    """Differences between a predicted tensor and its reference."""
+
+    max_abs_error: float
+    max_rel_error: float
+    # number of values out of tolerance, and the coordinates of the first one
+    mismatches: int
+    first_mismatch: Optional[Tuple[int, ...]]
+
+    @property
+    def ok(self) -> bool:
+        """True if all the values are within the tolerance."""
+        return self.mismatches == 0
+
+
+def _compare_chunk(
+    predicted: np.ndarray, reference: np.ndarray, atol: float, rtol: float
+) -> Tuple[float, float, int, int]:
+    predicted = predicted.astype("float64")
+    reference = reference.astype("float64")
+    diff = np.abs(predicted - reference)
+    abs_ref = np.abs(reference)
+    # nan at the same places are equal; a single nan is a mismatch
+    both_nan = np.isnan(predicted) & np.isnan(reference)
+    valid = ~np.isnan(diff)
+    rel = np.divide(
+        diff, abs_ref, out=np.where(diff > 0, np.inf, 0.0), where=abs_ref > 0
+    )
+    mismatch = ~(diff <= atol + rtol * abs_ref) & ~both_nan
+    count = int(np.count_nonzero(mismatch))
+
+    return (
+        float(np.max(diff, initial=0.0, where=valid)),
+        float(np.max(rel, initial=0.0, where=valid)),
+        count,
+        int(np.argmax(mismatch)) if count else -1,
+    )
+
+
+def compare_tensors(
+    predicted: Any,
+    reference: Any,
+    atol: float = 1.5e-4,
+    rtol: float = 0.0,
+    chunk_size: int = CHUNK_SIZE,
+    max_workers: Optional[int] = None,
+) -> TensorComparison:
+    """Compare a predicted tensor to its reference, chunk by chunk.
+
+    Either tensor can be a numpy file, which is memory-mapped, so tensors
+    larger than the memory can be compared. Chunks are compared in a thread
+    pool; at most max_workers chunks of each tensor are in memory at once.
+    A value is a mismatch if it differs by more than atol + rtol * |reference|.
+    """
+    if isinstance(predicted, (str, Path)):
+        predicted = load_npy(predicted)
+    if isinstance(reference, (str, Path)):
+        reference = load_npy(reference)
+    predicted = np.asarray(predicted)
+    reference = np.asarray(reference)
+    if predicted.shape != reference.shape:
+        raise ValueError(
+            f"The predicted shape {predicted.shape} is not {reference.shape}."
+        )
+    # flatten in the reference's memory order, to keep it a view
+    order = "F" if np.isfortran(reference) else "C"
+    flat_predicted = predicted.reshape(-1, order=order)
+    flat_reference = reference.reshape(-1, order=order)
+    starts = range(0, flat_reference.size, chunk_size)
+
+    def _compare(start: int) -> Tuple[float, float, int, int]:
+        stop = start + chunk_size
+        return _compare_chunk(
+            flat_predicted[start:stop], flat_reference[start:stop], atol, rtol
+        )
+
+    max_workers = max_workers or min(8, os.cpu_count() or 1)
+    with ThreadPoolExecutor(max_workers, thread_name_prefix="compare") as executor:
+        results = list(executor.map(_compare, starts))
+    first_mismatch = None
+    for start, (_abs, _rel, count, index) in zip(starts, results):
+        if count:
+            coords = np.unravel_index(start + index, reference.shape, order=order)
+            first_mismatch = tuple(int(c) for c in coords)
+            break
+
+    return TensorComparison(
+        max((result[0] for result in results), default=0.0),
+        max((result[1] for result in results), default=0.0),
+        sum(result[2] for result in results),
+        first_mismatch,
+    )
@@ -1,25 +1,37 @@
 """UI Widgets for this project."""
 
 from .author_widget import AuthorWidget
+from .batch_validation_widget import BatchValidationWidget
 from .cite_widget import CiteWidget
+from .file_watcher import FileWatcher
 from .inputs_widget import InputTensorWidget
+from .lazy_tab_widget import LazyTabWidget
 from .main_widget import BioImageModelWidget
+from .model_test_widget import ModelTestWidget
 from .outputs_widget import OutputTensorWidget
 from .postprocessing_widget import PostprocessingWidget
 from .preprocessing_widget import PreprocessingWidget
 from .single_input_widget import SingleInputWidget
 from .tags_input_widget import TagsInputWidget
+from .task_runner import TaskRunner
 from .validation_widget import ValidationWidget
+from .validation_worker import ValidationWorker
 
 __all__ = [
     "AuthorWidget",
+    "BatchValidationWidget",
     "CiteWidget",
+    "FileWatcher",
     "InputTensorWidget",
+    "LazyTabWidget",
+    "ModelTestWidget",
     "OutputTensorWidget",
     "PostprocessingWidget",
     "PreprocessingWidget",
     "SingleInputWidget",
     "TagsInputWidget",
+    "TaskRunner",
     "ValidationWidget",
+    "ValidationWorker",
     "BioImageModelWidget",
 ]
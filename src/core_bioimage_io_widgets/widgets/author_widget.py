@@ -1,8 +1,10 @@
-from typing import Optional
+from functools import partial
+from typing import Dict, Optional
 
-from qtpy.QtCore import Qt, Signal
+from qtpy.QtCore import QStringListModel, Qt, Signal
 from qtpy.QtWidgets import (
     QApplication,
+    QCompleter,
     QGridLayout,
     QHBoxLayout,
     QLineEdit,
@@ -10,7 +12,7 @@ from qtpy.QtWidgets import (
     QWidget,
 )
 
-from core_bioimage_io_widgets.utils import schemas
+from core_bioimage_io_widgets.utils import get_author_index, schemas
 from core_bioimage_io_widgets.widgets.ui_helper import (
     create_validation_ui,
     enhance_widget,
@@ -18,6 +20,7 @@ from core_bioimage_io_widgets.widgets.ui_helper import (
     set_ui_data_from_dict,
 )
 from core_bioimage_io_widgets.widgets.validation_widget import ValidationWidget
+from core_bioimage_io_widgets.widgets.validation_worker import ValidationWorker
 
 
 class AuthorWidget(QWidget):
@@ -31,10 +34,15 @@ class AuthorWidget(QWidget):
         super().__init__(parent)
 
         self.author_schema = schemas.rdf.Author()
+        self.validation_worker = ValidationWorker(self)
+        # past authors, to complete the fields
+        self.author_index = get_author_index()
 
         self.create_ui()
         if author_data is not None:
             set_ui_data_from_dict(self, author_data)
+        for field, textbox in self.field_textboxes.items():
+            self.add_completer(field, textbox)
 
     def create_ui(self) -> None:
         """Creates ui for author's profile."""
@@ -62,6 +70,13 @@ class AuthorWidget(QWidget):
         orcid_label, _ = enhance_widget(
             self.orcid_textbox, "ORCID", self.author_schema.fields["orcid"]
         )
+        self.field_textboxes = {
+            "name": self.name_textbox,
+            "email": self.email_textbox,
+            "affiliation": self.affiliation_textbox,
+            "github_user": self.git_textbox,
+            "orcid": self.orcid_textbox,
+        }
         submit_button = QPushButton("&Submit")
         submit_button.clicked.connect(self.submit_author)
         cancel_button = QPushButton("&Cancel")
@@ -90,14 +105,53 @@ class AuthorWidget(QWidget):
         self.setWindowTitle("Author Profile")
         self.setMinimumWidth(340)
 
+    def add_completer(self, field: str, textbox: QLineEdit) -> None:
+        """Complete the textbox with the field's values of the past authors."""
+        completer = QCompleter(QStringListModel(self), self)
+        # the index already filtered the values by prefix or substring
+        completer.setCompletionMode(QCompleter.UnfilteredPopupCompletion)
+        completer.setCaseSensitivity(Qt.CaseInsensitive)
+        textbox.setCompleter(completer)
+        textbox.textEdited.connect(partial(self.update_completions, field, completer))
+        if field == "name":
+            completer.activated[str].connect(self.fill_author)
+
+    def update_completions(self, field: str, completer: QCompleter, text: str) -> None:
+        """Show the completions of the typed text."""
+        completions = self.author_index.complete(field, text)
+        completer.model().setStringList(completions)
+        if completions:
+            completer.complete()
+
+    def fill_author(self, name: str) -> None:
+        """Fill the empty fields with the known data of the completed author."""
+        author = self.author_index.get_author(name)
+        if author is None:
+            return
+        for field, textbox in self.field_textboxes.items():
+            if not textbox.text() and author.get(field):
+                textbox.setText(author[field])
+
     def submit_author(self) -> None:
-        """Validate and submit the entered author's profile."""
+        """Validate (in the background) and submit the entered author's profile."""
         author_data = get_ui_input_data(self)
-        # validation
-        errors = self.author_schema.validate(author_data)
+        self.validation_worker.validate(
+            self.validate_author,
+            author_data,
+            callback=partial(self.author_validated, author_data),
+        )
+
+    def validate_author(self, author_data: dict) -> Dict:
+        """Validate the author's data, and returns the errors."""
+        errors: Dict = self.author_schema.validate(author_data)
         # NOTE: handling empty string
-        if len(self.name_textbox.text().strip()) == 0:
+        if len(author_data.get("name", "").strip()) == 0:
             errors["name"] = ["Author's name is required."]
+
+        return errors
+
+    def author_validated(self, author_data: dict, errors: Dict) -> None:
+        """Show the validation errors, or submit the author if there is none."""
         if errors:
             self.validation_widget.update_content(create_validation_ui(errors))
             return
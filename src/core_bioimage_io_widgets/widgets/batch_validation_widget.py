@@ -0,0 +1,140 @@
+from typing import Any, List, Optional
+
+from qtpy.QtCore import Qt, Signal
+from qtpy.QtWidgets import (
+    QAbstractItemView,
+    QApplication,
+    QFileDialog,
+    QHBoxLayout,
+    QHeaderView,
+    QLabel,
+    QPushButton,
+    QTableWidget,
+    QTableWidgetItem,
+    QVBoxLayout,
+    QWidget,
+)
+
+from core_bioimage_io_widgets.utils.batch_validation import (
+    SpecResult,
+    find_spec_files,
+    validate_spec_files,
+)
+from core_bioimage_io_widgets.widgets.ui_helper import create_validation_ui
+from core_bioimage_io_widgets.widgets.validation_widget import ValidationWidget
+from core_bioimage_io_widgets.widgets.validation_worker import ValidationWorker
+
+
+class _CountItem(QTableWidgetItem):
+    """A table item sorted by its number."""
+
+    def __lt__(self, other: QTableWidgetItem) -> bool:
+        return int(self.text()) < int(other.text())
+
+
+class BatchValidationWidget(QWidget):
+    """Validates all the model specs of a folder, and shows their results."""
+
+    spec_activated = Signal(str, name="spec_activated")
+
+    def __init__(self, parent: Optional[QWidget] = None) -> None:
+        super().__init__(parent)
+
+        self.results: List[SpecResult] = []
+        self.validation_worker = ValidationWorker(self)
+
+        folder_button = QPushButton("Select &Folder...")
+        folder_button.clicked.connect(self.select_folder)
+        self.status_label = QLabel()
+        top_hbox = QHBoxLayout()
+        top_hbox.addWidget(folder_button)
+        top_hbox.addWidget(self.status_label, stretch=1)
+
+        self.table = QTableWidget(0, 3)
+        self.table.setHorizontalHeaderLabels(["Status", "Errors", "Spec"])
+        self.table.horizontalHeader().setSectionResizeMode(2, QHeaderView.Stretch)
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.table.setSortingEnabled(True)
+        self.table.itemSelectionChanged.connect(self.show_selected_errors)
+        self.table.cellDoubleClicked.connect(self.open_spec)
+        self.table.setToolTip("Double-click a spec to open it in the editor.")
+
+        self.validation_widget = ValidationWidget()
+
+        vbox = QVBoxLayout()
+        vbox.addLayout(top_hbox)
+        vbox.addWidget(self.table, stretch=2)
+        vbox.addWidget(self.validation_widget, stretch=1)
+        self.setLayout(vbox)
+        self.setWindowTitle("Batch Validation")
+        self.resize(800, 600)
+
+    def select_folder(self) -> None:
+        """Show a dialog to select the folder of model specs to validate."""
+        folder = QFileDialog.getExistingDirectory(self, "Select Folder", ".")
+        if folder:
+            self.validate_folder(folder)
+
+    def validate_folder(self, folder: str) -> None:
+        """Validate (in the background) the model specs of the folder."""
+        self.status_label.setText(f"Validating specs in {folder}...")
+        self.validation_worker.validate(
+            lambda: validate_spec_files(find_spec_files([folder])),
+            callback=self.show_results,
+        )
+
+    def show_results(self, results: Any) -> None:
+        """Fill the table with the validation results."""
+        if isinstance(results, dict):
+            # the validation itself failed
+            self.status_label.setText("Validation failed.")
+            self.validation_widget.update_content(create_validation_ui(results))
+            return
+        self.results = results
+        self.table.setSortingEnabled(False)
+        self.table.setRowCount(len(results))
+        for row, result in enumerate(results):
+            status = QTableWidgetItem("PASS" if result.ok else "FAIL")
+            # the row's result, kept through sorting
+            status.setData(Qt.UserRole, row)
+            self.table.setItem(row, 0, status)
+            self.table.setItem(row, 1, _CountItem(str(result.error_count)))
+            self.table.setItem(row, 2, QTableWidgetItem(result.path))
+        self.table.setSortingEnabled(True)
+        failed = sum(not result.ok for result in results)
+        self.status_label.setText(
+            f"{len(results) - failed} passed, {failed} failed"
+            f" ({sum(result.cached for result in results)} unchanged)"
+        )
+
+    def selected_result(self) -> Optional[SpecResult]:
+        """Returns the result of the selected row."""
+        rows = self.table.selectionModel().selectedRows()
+        if not rows:
+            return None
+        index = self.table.item(rows[0].row(), 0).data(Qt.UserRole)
+
+        return self.results[index]
+
+    def show_selected_errors(self) -> None:
+        """Show the validation errors of the selected spec."""
+        result = self.selected_result()
+        if result is None or result.ok:
+            self.validation_widget.clear_content_area()
+            return
+        self.validation_widget.update_content(create_validation_ui(result.errors))
+
+    def open_spec(self, row: int, _column: int) -> None:
+        """Emit the path of the double-clicked spec."""
+        self.spec_activated.emit(self.table.item(row, 2).text())
+
+
+if __name__ == "__main__":
+    import sys
+
+    app = QApplication(sys.argv)
+    win = BatchValidationWidget()
+    win.show()
+    sys.exit(app.exec_())
@@ -1,6 +1,7 @@
-from typing import Optional
+from functools import partial
+from typing import Dict, Optional
 
-from qtpy.QtCore import Qt, Signal
+from qtpy.QtCore import Qt, QTimer, Signal
 from qtpy.QtWidgets import (
     QApplication,
     QGridLayout,
@@ -10,13 +11,18 @@ from qtpy.QtWidgets import (
     QWidget,
 )
 
-from core_bioimage_io_widgets.utils import schemas
+from core_bioimage_io_widgets.utils import get_doi_resolver, normalize_doi, schemas
+from core_bioimage_io_widgets.widgets.task_runner import TaskRunner
 from core_bioimage_io_widgets.widgets.ui_helper import (
     create_validation_ui,
     enhance_widget,
     get_ui_input_data,
 )
 from core_bioimage_io_widgets.widgets.validation_widget import ValidationWidget
+from core_bioimage_io_widgets.widgets.validation_worker import ValidationWorker
+
+# typing pause after which the DOI is resolved
+DOI_DEBOUNCE_MSECS = 500
 
 
 class CiteWidget(QWidget):
@@ -30,11 +36,21 @@ class CiteWidget(QWidget):
         super().__init__(parent)
 
         self.cite_schema = schemas.rdf.CiteEntry()
+        self.validation_worker = ValidationWorker(self)
+        # typed DOIs are resolved in the background
+        self.doi_resolver = get_doi_resolver()
+        self.doi_runner = TaskRunner(parent=self)
+        self.doi_timer = QTimer(self)
+        self.doi_timer.setSingleShot(True)
+        self.doi_timer.setInterval(DOI_DEBOUNCE_MSECS)
+        self.doi_timer.timeout.connect(self.resolve_doi)
+        self._filled_citation: Dict[str, str] = {}
 
         self.create_ui()
         # check edit mode
         if cite_data is not None:
             self.set_ui_data(cite_data)
+        self.doi_textbox.textEdited.connect(self.doi_edited)
 
     def create_ui(self) -> None:
         """Create ui for the citation entry."""
@@ -81,10 +97,64 @@ class CiteWidget(QWidget):
         self.doi_textbox.setText(cite_data.get("doi"))
         self.url_textbox.setText(cite_data.get("url"))
 
+    def doi_edited(self, text: str) -> None:
+        """Fill the citation from the typed DOI's metadata.
+
+        Cached DOIs are filled right away; others are resolved once the
+        typing pauses.
+        """
+        self.doi_timer.stop()
+        doi = normalize_doi(text)
+        if doi is None:
+            return
+        citation = self.doi_resolver.cached(doi)
+        if citation is not None:
+            self.fill_citation(citation)
+        else:
+            self.doi_timer.start()
+
+    def resolve_doi(self) -> None:
+        """Resolve the typed DOI in the background."""
+        doi = normalize_doi(self.doi_textbox.text())
+        if doi is None:
+            return
+        self.doi_runner.run(
+            self.doi_resolver.resolve,
+            doi,
+            on_success=partial(self.doi_resolved, doi),
+            on_error=partial(self.doi_not_resolved, doi),
+        )
+
+    def doi_resolved(self, doi: str, citation: dict) -> None:
+        """Fill the citation, unless the DOI was changed meanwhile."""
+        if doi == normalize_doi(self.doi_textbox.text()):
+            self.fill_citation(citation)
+
+    def doi_not_resolved(self, doi: str, err: Exception) -> None:
+        """Show why the DOI could not be resolved."""
+        if doi == normalize_doi(self.doi_textbox.text()):
+            self.validation_widget.update_content(
+                create_validation_ui({"doi": [str(err)]})
+            )
+
+    def fill_citation(self, citation: dict) -> None:
+        """Fill the citation's text and url, unless they were typed by the user."""
+        for key, textbox in (("text", self.cite_textbox), ("url", self.url_textbox)):
+            if textbox.text() in ("", self._filled_citation.get(key)):
+                textbox.setText(citation[key])
+        self._filled_citation = citation
+
     def submit_cite(self) -> None:
-        """Validate and submit the citation."""
+        """Validate (in the background) and submit the citation."""
         cite_data = get_ui_input_data(self)
-        errors = self.cite_schema.validate(cite_data)
+        self.validation_worker.validate(
+            self.cite_schema.validate,
+            cite_data,
+            callback=partial(self.cite_validated, cite_data),
+        )
+
+    def cite_validated(self, cite_data: dict, errors: Dict) -> None:
+        """Show the validation errors, or submit the citation if there is none."""
         if errors:
             self.validation_widget.update_content(create_validation_ui(errors))
             return
@@ -0,0 +1,68 @@
+import os
+from typing import Any, Dict, List, Optional, Set
+
+from qtpy.QtCore import QFileSystemWatcher, QObject, QTimer, Signal
+
+
+class FileWatcher(QObject):
+    """Watches files and reports their changes debounced and coalesced.
+
+    Each watched file has a list of keys (e.g. the spec entries referencing it).
+    All the changes happening within the debounce interval of each other are
+    reported once, by a single files_changed signal: {path: keys}.
+    """
+
+    files_changed = Signal(object, name="files_changed")
+
+    def __init__(
+        self, debounce_msecs: int = 500, parent: Optional[QObject] = None
+    ) -> None:
+        super().__init__(parent)
+
+        self._keys: Dict[str, List[Any]] = {}
+        self._pending: Set[str] = set()
+        self.watcher = QFileSystemWatcher(self)
+        self.watcher.fileChanged.connect(self._file_changed)
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(debounce_msecs)
+        self.timer.timeout.connect(self._flush)
+
+    def set_files(self, files: Dict[str, List[Any]]) -> None:
+        """Watch the given files with their keys, instead of the current ones."""
+        keys = {
+            os.path.abspath(path): path_keys
+            for path, path_keys in files.items()
+            if os.path.isfile(path)
+        }
+        watched = set(self.watcher.files())
+        removed = watched - keys.keys()
+        if removed:
+            self.watcher.removePaths(list(removed))
+        added = keys.keys() - watched
+        if added:
+            self.watcher.addPaths(list(added))
+        self._keys = keys
+        self._pending &= keys.keys()
+
+    def files(self) -> List[str]:
+        """Returns the watched files."""
+        return list(self._keys)
+
+    def _file_changed(self, path: str) -> None:
+        self._pending.add(path)
+        # restart the debounce interval
+        self.timer.start()
+
+    def _flush(self) -> None:
+        changed = {
+            path: self._keys[path] for path in self._pending if path in self._keys
+        }
+        self._pending.clear()
+        # files replaced by writing a new file and renaming it are not watched anymore
+        watched = set(self.watcher.files())
+        for path in changed:
+            if path not in watched and os.path.isfile(path):
+                self.watcher.addPath(path)
+        if changed:
+            self.files_changed.emit(changed)
@@ -1,6 +1,6 @@
-from typing import List, Optional
+from functools import partial
+from typing import Any, Dict, List, Optional
 
-import numpy as np
 from qtpy.QtCore import QRegExp, Qt, Signal
 from qtpy.QtGui import QRegExpValidator
 from qtpy.QtWidgets import (
@@ -17,14 +17,27 @@ from qtpy.QtWidgets import (
     QWidget,
 )
 
-from core_bioimage_io_widgets.utils import AXES_REGEX, schemas
+from core_bioimage_io_widgets.utils import (
+    AXES_REGEX,
+    TENSOR_FILE_FILTER,
+    convert_to_npy,
+    crop_test_tensor,
+    get_tensor_format,
+    read_npy_header,
+    read_tensor_header,
+    register_array,
+    schemas,
+)
 from core_bioimage_io_widgets.widgets.preprocessing_widget import PreprocessingWidget
+from core_bioimage_io_widgets.widgets.task_runner import TaskRunner
 from core_bioimage_io_widgets.widgets.ui_helper import (
     create_validation_ui,
     enhance_widget,
     remove_from_listview,
+    select_tensor_key,
 )
 from core_bioimage_io_widgets.widgets.validation_widget import ValidationWidget
+from core_bioimage_io_widgets.widgets.validation_worker import ValidationWorker
 
 
 class InputTensorWidget(QWidget):
@@ -41,11 +54,14 @@ class InputTensorWidget(QWidget):
         super().__init__(parent)
 
         self.input_tensor_schema = schemas.model.InputTensor()
+        self.validation_worker = ValidationWorker(self)
+        self.convert_runner = TaskRunner(parent=self)
         if input_names is None:
             self.input_names = []
         else:
             self.input_names = input_names
         self.input_shape: List[int] = []
+        self.test_input = ""
         self.preprocessings: List[dict] = []
 
         self.create_ui()
@@ -56,17 +72,26 @@ class InputTensorWidget(QWidget):
     def create_ui(self) -> None:
         """Creates ui for model's input tensor."""
         self.test_input_textbox = QLineEdit()
-        self.test_input_textbox.setPlaceholderText("select Test Input file (*.npy)")
+        self.test_input_textbox.setPlaceholderText(
+            "select Test Input file (*.npy, *.npz, *.tif, zarr)"
+        )
         self.test_input_textbox.setReadOnly(True)
         test_input_label, _ = enhance_widget(
             self.test_input_textbox, "Test Input<sup>*</sup>"
         )
         test_input_button = QPushButton("Browse...")
         test_input_button.clicked.connect(self.select_test_input)
+        self.crop_button = QPushButton("Crop")
+        self.crop_button.setToolTip(
+            "Replace the test input with a small representative crop of it."
+        )
+        self.crop_button.setEnabled(False)
+        self.crop_button.clicked.connect(self.crop_test_input)
         test_input_hbox = QHBoxLayout()
         test_input_hbox.addWidget(test_input_label)
         test_input_hbox.addWidget(self.test_input_textbox)
         test_input_hbox.addWidget(test_input_button)
+        test_input_hbox.addWidget(self.crop_button)
         #
         self.name_textbox = QLineEdit()
         name_label, _ = enhance_widget(
@@ -96,13 +121,13 @@ class InputTensorWidget(QWidget):
         preprocessing_btn_vbox.addWidget(preprocessing_button_del)
         preprocessing_btn_vbox.insertStretch(-1, 1)
         #
-        submit_button = QPushButton("&Submit")
-        submit_button.clicked.connect(self.submit_input_tensor)
+        self.submit_button = QPushButton("&Submit")
+        self.submit_button.clicked.connect(self.submit_input_tensor)
         cancel_button = QPushButton("&Cancel")
         cancel_button.clicked.connect(lambda: self.close())
         form_btn_hbox = QHBoxLayout()
         form_btn_hbox.addWidget(cancel_button)
-        form_btn_hbox.addWidget(submit_button)
+        form_btn_hbox.addWidget(self.submit_button)
         #
         self.validation_widget = ValidationWidget()
         #
@@ -144,7 +169,7 @@ class InputTensorWidget(QWidget):
             self.add_preprocessing(process)
 
     def submit_input_tensor(self) -> None:
-        """Validate and submit the input tensor."""
+        """Validate (in the background) and submit the input tensor."""
         input_data = {
             "name": self.name_textbox.text(),
             "data_type": "float32",
@@ -153,14 +178,24 @@ class InputTensorWidget(QWidget):
         }
         if len(self.preprocessings) > 0:
             input_data["preprocessing"] = self.preprocessings
-        # validation
-        errors = self.input_tensor_schema.validate(input_data)
-        if errors:
-            self.validation_widget.update_content(create_validation_ui(errors))
-            return
+        self.validation_worker.validate(
+            self.validate_input_tensor,
+            input_data,
+            callback=partial(self.input_tensor_validated, input_data),
+        )
+
+    def validate_input_tensor(self, input_data: dict) -> Dict:
+        """Validate the input tensor's data, and returns the errors."""
+        errors: Dict = self.input_tensor_schema.validate(input_data)
         # check input name is unique
-        if self.name_textbox.text() in self.input_names:
+        if not errors and input_data["name"] in self.input_names:
             errors = {"name": ["Input name must be unique."]}
+
+        return errors
+
+    def input_tensor_validated(self, input_data: dict, errors: Dict) -> None:
+        """Show the validation errors, or submit the input if there is none."""
+        if errors:
             self.validation_widget.update_content(create_validation_ui(errors))
             return
 
@@ -176,23 +211,40 @@ class InputTensorWidget(QWidget):
         Then read the input shape.
         """
         selected_file, _ = QFileDialog.getOpenFileName(
-            self, "Browse", ".", "Numpy file (*.npy)"
+            self, "Browse", ".", TENSOR_FILE_FILTER
         )
         if selected_file:
             self.test_input_selected(selected_file)
 
     def test_input_selected(self, selected_file: str) -> None:
         """Read selected numpy file and update corresponding ui."""
+        try:
+            selected_file = select_tensor_key(selected_file, self)
+            if selected_file is None:
+                return
+            if get_tensor_format(selected_file) == "npy":
+                # read only the numpy file header (the file can be a package member)
+                shape, _dtype = read_npy_header(selected_file)
+            else:
+                # read the metadata now, and convert to the packaged .npy meanwhile
+                shape, _dtype = read_tensor_header(selected_file)
+        except (OSError, ValueError, ImportError) as err:
+            self.validation_widget.update_content(
+                create_validation_ui({"test_input": [str(err)]})
+            )
+            return
+        previous = self.test_input
         self.test_input_textbox.setText(selected_file)
         self.input_groupbox.setEnabled(True)
+        self.crop_button.setEnabled(True)
+        self.submit_button.setEnabled(True)
         self.test_input = selected_file
-        # read numpy file
-        with open(selected_file, mode="rb") as f:
-            arr = np.load(f)
-        _max_len = len(arr.shape)
+        if get_tensor_format(selected_file) != "npy":
+            self.convert_test_input(selected_file, previous)
+        _max_len = len(shape)
         # input shape
-        self.input_shape = arr.shape
-        self.shape_textbox.setText(" x ".join(str(d) for d in arr.shape))
+        self.input_shape = shape
+        self.shape_textbox.setText(" x ".join(str(d) for d in shape))
         # set axes textbox validator based on the test input array shape:
         self.axes_textbox.setMaxLength(_max_len)
         validator = QRegExpValidator(QRegExp(AXES_REGEX.replace("LEN", str(_max_len))))
@@ -200,6 +252,65 @@ class InputTensorWidget(QWidget):
         # set input name
         self.name_textbox.setText(self.get_input_name())
 
+    def convert_test_input(self, selected_file: str, previous: str = "") -> None:
+        """Convert the test input to a .npy file in the background.
+
+        If the conversion fails, the previous test input is restored.
+        """
+        self.submit_button.setEnabled(False)
+        self.crop_button.setEnabled(False)
+        self.test_input_textbox.setText(f"{selected_file} (converting...)")
+        self.convert_runner.run(
+            convert_to_npy,
+            selected_file,
+            on_success=partial(self.test_input_converted, selected_file),
+            on_error=partial(self.test_input_not_converted, selected_file, previous),
+        )
+
+    def test_input_converted(self, selected_file: str, npy_file: Any) -> None:
+        """Use the converted .npy file as the test input."""
+        if selected_file != self.test_input:
+            # another test input was selected meanwhile
+            return
+        self.submit_button.setEnabled(True)
+        self.test_input = str(npy_file)
+        self.test_input_textbox.setText(self.test_input)
+        self.crop_button.setEnabled(True)
+
+    def test_input_not_converted(
+        self, selected_file: str, previous: str, err: Exception
+    ) -> None:
+        """Show the conversion error, and restore the previous test input."""
+        if selected_file != self.test_input:
+            return
+        self.test_input = ""
+        self.test_input_textbox.clear()
+        if previous:
+            self.test_input_selected(previous)
+        self.validation_widget.update_content(
+            create_validation_ui({"test_input": [f"{type(err).__name__}: {err}"]})
+        )
+
+    def set_test_input_array(self, array: Any, name: Optional[str] = None) -> None:
+        """Use an in-memory array as the test input, without copying it."""
+        self.test_input_selected(register_array(array, name or self.get_input_name()))
+
+    def crop_test_input(self) -> None:
+        """Replace the test input with its centered crop along the spatial axes."""
+        axes = self.axes_textbox.text()
+        if len(axes) != len(self.input_shape):
+            self.validation_widget.update_content(
+                create_validation_ui(
+                    {"axes": ["Axes are required to crop the test input."]}
+                )
+            )
+            return
+        name = self.name_textbox.text()
+        cropped = crop_test_tensor(self.test_input, axes)
+        self.test_input_selected(str(cropped))
+        self.name_textbox.setText(name)
+        self.axes_textbox.setText(axes)
+
     def show_preprocessing_form(self) -> None:
         """Show Preprocessing form."""
         preprocess_form = PreprocessingWidget()
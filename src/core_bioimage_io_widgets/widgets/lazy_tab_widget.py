@@ -0,0 +1,61 @@
+from typing import Callable, Dict, Optional
+
+from qtpy.QtWidgets import (
+    QApplication,
+    QLabel,
+    QTabWidget,
+    QVBoxLayout,
+    QWidget,
+)
+
+
+class LazyTabWidget(QTabWidget):
+    """A tab widget that builds each page the first time it is shown."""
+
+    def __init__(self, parent: Optional[QWidget] = None) -> None:
+        super().__init__(parent)
+
+        # page builders by their placeholder widget
+        self._builders: Dict[QWidget, Callable[[], QWidget]] = {}
+        self.currentChanged.connect(self.build_page)
+
+    def add_lazy_tab(self, builder: Callable[[], QWidget], label: str) -> int:
+        """Add a tab which its page is created by the builder on the first show."""
+        placeholder = QWidget()
+        self._builders[placeholder] = builder
+        index = self.addTab(placeholder, label)
+        if index == self.currentIndex():
+            self.build_page(index)
+
+        return index
+
+    def is_built(self, index: int) -> bool:
+        """Returns True if the page at the given index is already built."""
+        return self.widget(index) not in self._builders
+
+    def build_page(self, index: int) -> None:
+        """Build the page at the given index, if it is not built yet."""
+        placeholder = self.widget(index)
+        builder = self._builders.pop(placeholder, None)
+        if builder is None:
+            return
+        vbox = QVBoxLayout()
+        vbox.setContentsMargins(0, 0, 0, 0)
+        vbox.addWidget(builder())
+        placeholder.setLayout(vbox)
+
+    def build_all(self) -> None:
+        """Build all the pages that are not built yet."""
+        for index in range(self.count()):
+            self.build_page(index)
+
+
+if __name__ == "__main__":
+    import sys
+
+    app = QApplication(sys.argv)
+    win = LazyTabWidget()
+    win.add_lazy_tab(lambda: QLabel("First page"), "First")
+    win.add_lazy_tab(lambda: QLabel("Second page"), "Second")
+    win.show()
+    sys.exit(app.exec_())
@@ -1,9 +1,12 @@
 import datetime as dt
+import os
 import sys
-from typing import List, Optional
+from concurrent.futures import Future
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 import yaml
-from qtpy.QtCore import Qt
+from qtpy.QtCore import QObject, QSize, Qt, Signal
 from qtpy.QtWidgets import (
     QApplication,
     QComboBox,
@@ -18,38 +21,79 @@ from qtpy.QtWidgets import (
     QMessageBox,
     QPlainTextEdit,
     QPushButton,
-    QTabWidget,
     QVBoxLayout,
     QWidget,
 )
 
 from core_bioimage_io_widgets.utils import (
+    AUTHORS_FILE_FILTER,
+    CITES_FILE_FILTER,
     FORMAT_VERSION,
     PYTORCH_STATE_DICT,
+    THUMBNAIL_SIZE,
     WEIGHT_FORMATS,
+    ImportResult,
+    Thumbnail,
+    ThumbnailCache,
     build_model_zip,
+    deep_validate_model_data,
+    fetch_urls,
+    file_sha256,
+    generate_cover,
+    get_author_index,
     get_predefined_tags,
+    get_remote_references,
     get_spdx_licenses,
+    get_weight_formats,
+    image_size,
+    import_authors,
+    import_cites,
+    is_memory_uri,
+    is_remote_uri,
+    load_package_specs,
     nodes,
+    read_changed_files,
+    read_npy_header,
+    regenerate_test_outputs,
+    register_array,
+    release_array,
     schemas,
+    validate_model_data,
+    verify_package,
 )
 from core_bioimage_io_widgets.widgets.author_widget import AuthorWidget
+from core_bioimage_io_widgets.widgets.batch_validation_widget import (
+    BatchValidationWidget,
+)
 from core_bioimage_io_widgets.widgets.cite_widget import CiteWidget
+from core_bioimage_io_widgets.widgets.file_watcher import FileWatcher
 from core_bioimage_io_widgets.widgets.inputs_widget import InputTensorWidget
+from core_bioimage_io_widgets.widgets.lazy_tab_widget import LazyTabWidget
+from core_bioimage_io_widgets.widgets.model_test_widget import ModelTestWidget
 from core_bioimage_io_widgets.widgets.outputs_widget import OutputTensorWidget
 from core_bioimage_io_widgets.widgets.single_input_widget import SingleInputWidget
 from core_bioimage_io_widgets.widgets.tags_input_widget import TagsInputWidget
+from core_bioimage_io_widgets.widgets.task_runner import TaskRunner
 from core_bioimage_io_widgets.widgets.ui_helper import (
+    bulk_update,
     create_validation_ui,
     enhance_widget,
+    get_cover_label,
     get_ui_input_data,
     remove_from_listview,
     save_file_as,
     select_file,
     set_ui_data_from_dict,
     set_widget_text,
+    thumbnail_to_icon,
 )
 from core_bioimage_io_widgets.widgets.validation_widget import ValidationWidget
+from core_bioimage_io_widgets.widgets.validation_worker import ValidationWorker
+
+
+class _ThumbnailSignals(QObject):
+    # not a widget, so bulk_update doesn't block its signals
+    ready = Signal(str, object)
 
 
 class BioImageModelWidget(QWidget):
@@ -66,14 +110,47 @@ class BioImageModelWidget(QWidget):
         self.output_tensors: List[dict] = []
         self.test_outputs: List[str] = []
         self.cites: List[dict] = []
-
-        tabs = QTabWidget()
-        tabs.addTab(self.create_required_specs_ui(), "Required Fields")
-        tabs.addTab(self.create_other_spec_ui(), "Optional Fields")
+        self.weights: dict = {}
+        self.covers: List[str] = []
+        self.tags: List[str] = []
+        # widgets of the tab pages that are built on their first show
+        self.authors_listview: Optional[QListWidget] = None
+        self.cites_listview: Optional[QListWidget] = None
+        self.weights_combo: Optional[QComboBox] = None
+        self.inputs_listview: Optional[QListWidget] = None
+        self.outputs_listview: Optional[QListWidget] = None
+        self.covers_listview: Optional[QListWidget] = None
+        self.tags_widget: Optional[TagsInputWidget] = None
+        self.validation_win: Optional[ValidationWidget] = None
+        self.batch_validation_win: Optional[BatchValidationWidget] = None
+        self.model_test_win: Optional[ModelTestWidget] = None
+        # one validation worker per action (e.g. save, build), so a validation
+        # only supersedes the previous one of the same action
+        self.validation_workers: Dict[str, ValidationWorker] = {}
+        # background tasks other than validations: every result is delivered
+        self.task_runner = TaskRunner(max_threads=4, parent=self)
+        # revalidates the entries whose referenced files change on disk
+        self.file_watcher = FileWatcher(parent=self)
+        self.file_watcher.files_changed.connect(self.referenced_files_changed)
+        # one thread: the changes are read in order, and none is dropped
+        self.file_check_runner = TaskRunner(parent=self)
+        # cover thumbnails are decoded in a thread pool
+        self.thumbnail_cache = ThumbnailCache()
+        self.thumbnail_signals = _ThumbnailSignals(self)
+        self.thumbnail_signals.ready.connect(self.show_thumbnail)
+        # remote files are downloaded in the background: url -> cached file
+        self.remote_files: Dict[str, str] = {}
+
+        self.tabs = LazyTabWidget()
+        self.tabs.add_lazy_tab(self.create_required_specs_ui, "Required Fields")
+        self.tabs.add_lazy_tab(self.create_other_spec_ui, "Optional Fields")
         #
         load_button = QPushButton("&Load Config")
         load_button.setToolTip("To load a model specifications from a YAML file.")
         load_button.clicked.connect(self.load_from_file)
+        load_package_button = QPushButton("Load &Package")
+        load_package_button.setToolTip("To load a model from a built zip package.")
+        load_package_button.clicked.connect(self.load_from_package)
         save_button = QPushButton("&Save Config")
         save_button.setToolTip("To save the model specifications to a YAML file.")
         save_button.clicked.connect(self.save_specs)
@@ -83,44 +160,99 @@ class BioImageModelWidget(QWidget):
             " zoo."
         )
         build_button.clicked.connect(self.build_model)
+        validate_button = QPushButton("&Validate")
+        validate_button.setToolTip(
+            "To validate the model specifications and run the bioimageio.core"
+            " resource tests."
+        )
+        validate_button.clicked.connect(self.deep_validate)
+        test_button = QPushButton("T&est Model")
+        test_button.setToolTip(
+            "To test a built model package: its weights must reproduce the test"
+            " outputs from the test inputs."
+        )
+        test_button.clicked.connect(self.test_model)
+        batch_button = QPushButton("Ba&tch Validate...")
+        batch_button.setToolTip("To validate all the model specifications of a folder.")
+        batch_button.clicked.connect(self.show_batch_validation)
         btn_hbox = QHBoxLayout()
         btn_hbox.addWidget(load_button)
+        btn_hbox.addWidget(load_package_button)
         btn_hbox.addWidget(save_button)
+        btn_hbox.addWidget(validate_button)
+        btn_hbox.addWidget(test_button)
+        btn_hbox.addWidget(batch_button)
         btn_hbox.addWidget(build_button)
 
         grid = QGridLayout()
-        grid.addWidget(tabs, 0, 0)
+        grid.addWidget(self.tabs, 0, 0)
         grid.addLayout(btn_hbox, 1, 0, alignment=Qt.AlignRight)
 
         self.setLayout(grid)
         self.setWindowTitle("Bioimage.io Model Specification")
 
     def save_specs(self) -> None:
-        """Save the model specs into a YAML file."""
-        model_data = self.collect_specs()
-        if model_data:
-            dest_file = save_file_as(
-                "Yaml file (*.yaml)",
-                f"./{model_data['name'].replace(' ', '_')}.yaml",
-                self,
+        """Validate (in the background) and save the model specs into a YAML file."""
+        self.validate_specs(
+            self.get_specs(), on_valid=self.save_valid_specs, action="save"
+        )
+
+    def save_valid_specs(self, model_data: dict) -> None:
+        """Save the validated model specs into a YAML file."""
+        dest_file = save_file_as(
+            "Yaml file (*.yaml)",
+            f"./{model_data['name'].replace(' ', '_')}.yaml",
+            self,
+        )
+        if dest_file:
+            with open(dest_file, mode="w") as f:
+                yaml.safe_dump(model_data, f, default_flow_style=False)
+            get_author_index().add_spec_files([dest_file])
+            QMessageBox.information(
+                self, "BioImage.io", "Model data saved successfully."
             )
-            if dest_file:
-                with open(dest_file, mode="w") as f:
-                    yaml.safe_dump(model_data, f, default_flow_style=False)
-                QMessageBox.information(
-                    self, "BioImage.io", "Model data saved successfully."
-                )
 
     def load_from_file(self) -> None:
         """Open a file dialog to select model YAML file."""
         selected_yml = select_file("Yaml file (*.yaml)", self)
         if selected_yml:
-            with open(selected_yml) as f:
-                model_data = yaml.safe_load(f)
-                self.load_specs(model_data)
+            self.load_spec_file(selected_yml)
+
+    def load_spec_file(self, spec_file: str) -> None:
+        """Load the model specifications of a YAML file."""
+        with open(spec_file) as f:
+            model_data = yaml.safe_load(f)
+            self.load_specs(model_data)
+        get_author_index().add_spec_files([spec_file])
+
+    def show_batch_validation(self) -> None:
+        """Show the batch validation of a folder of model specs."""
+        if self.batch_validation_win is None:
+            self.batch_validation_win = BatchValidationWidget()
+            self.batch_validation_win.spec_activated.connect(self.load_spec_file)
+        self.batch_validation_win.show()
+        self.batch_validation_win.raise_()
+
+    def load_from_package(self) -> None:
+        """Open a file dialog to select a model zip package.
+
+        Only the package's rdf.yaml is read; other members are referenced in place.
+        """
+        selected_zip = select_file("Model package (*.zip)", self)
+        if selected_zip:
+            self.load_specs(load_package_specs(selected_zip))
 
     def collect_specs(self) -> Optional[dict]:
         """Collect and validate model specifications from ui."""
+        model_data = self.get_specs()
+        # validate the model data
+        if self.is_valid(model_data):
+            return model_data
+
+        return None
+
+    def get_specs(self) -> dict:
+        """Collect model specifications from ui, without validation."""
         # collect part of data from ui-entries with a schema fields attached to them:
         model_data = get_ui_input_data(self)
         # remove 'architecture' and 'architecture_sha256' fields
@@ -129,18 +261,6 @@ class BioImageModelWidget(QWidget):
             del model_data["architecture"]
         if "architecture_sha256" in model_data.keys():
             del model_data["architecture_sha256"]
-        # set the model's weights data
-        weights = {
-            self.weights_combo.currentText(): {"source": self.weights_textbox.text()}
-        }
-        # on pytorch_state_dict format must add architecture & sha256 fields
-        if self.weights_combo.currentText() == PYTORCH_STATE_DICT:
-            weights[self.weights_combo.currentText()][
-                "architecture"
-            ] = self.model_source_textbox.text()
-            weights[self.weights_combo.currentText()][
-                "architecture_sha256"
-            ] = self.model_source_sha256_textbox.text()
         # add other required data
         model_data.update(
             {
@@ -149,7 +269,7 @@ class BioImageModelWidget(QWidget):
                 "timestamp": dt.datetime.now().isoformat(),
                 "authors": self.authors,
                 "cite": self.cites,
-                "weights": weights,
+                "weights": self.get_weights(),
                 "test_inputs": self.test_inputs,
                 "inputs": self.input_tensors,
                 "test_outputs": self.test_outputs,
@@ -157,97 +277,311 @@ class BioImageModelWidget(QWidget):
             }
         )
         # add optional data
-        if self.covers_listview.count() > 0:
-            model_data["covers"] = [
-                self.covers_listview.item(i).text()
-                for i in range(self.covers_listview.count())
-            ]
-        if len(self.tags_widget.tags) > 0:
-            model_data["tags"] = self.tags_widget.tags
-        # validate the model data
-        if self.is_valid(model_data):
-            return model_data
+        if len(self.covers) > 0:
+            model_data["covers"] = self.covers
+        if len(self.tags) > 0:
+            model_data["tags"] = self.tags
 
-        return None
+        return model_data
 
-    def load_specs(self, model_data: dict) -> None:
+    def load_specs(self, model_data: dict, validate: bool = True) -> None:
         """
         Fill ui with the the given model's specifications.
 
+        The whole spec is applied in one pass with repaints and signals suspended,
+        so the ui is refreshed only once at the end.
+
         Parameters
         ----------
         model_data: dict
             a dictionary contains all required and optional fields
             for validationg a model RDF specs.
+        validate: bool
+            whether to validate the model_data and show potential errors.
         """
         # model_data should be a valid specs (only show potential errors)
-        self.is_valid(model_data)
-        # set ui data
-        set_ui_data_from_dict(self, model_data)  # handles basic direct inputs
-        # weights
-        weight_type = list(model_data["weights"].keys())[0]
-        weight_specs = model_data["weights"][weight_type]
+        if validate:
+            self.validate_specs(model_data)
+        replaced = self.test_inputs + self.test_outputs
+        with bulk_update(self):
+            # set ui data
+            set_ui_data_from_dict(self, model_data)  # handles basic direct inputs
+            # weights
+            self.weights = model_data["weights"]
+            self.populate_weights()
+            # authors
+            self.authors = model_data["authors"]
+            self.populate_authors_list()
+            # cites
+            self.cites = model_data["cite"]
+            self.populate_cites_list()
+            # inputs
+            self.input_tensors = model_data["inputs"]
+            self.test_inputs = model_data["test_inputs"]
+            self.populate_inputs_list()
+            # outputs
+            self.output_tensors = model_data["outputs"]
+            self.test_outputs = model_data["test_outputs"]
+            self.populate_outputs_list()
+            # covers
+            self.covers = list(model_data.get("covers", []))
+            self.populate_covers_list()
+            # tags
+            self.tags = list(model_data.get("tags", []))
+            if self.tags_widget is not None:
+                self.tags_widget.tags = self.tags
+        self.release_unused_arrays(replaced)
+        self.watch_referenced_files()
+        self.prefetch_remote_files(get_remote_references(model_data))
+
+    def get_weights(self) -> dict:
+        """Returns the model's weights data."""
+        if self.weights_combo is None:
+            # weights page is not built yet
+            return self.weights
+        weights = {
+            self.weights_combo.currentText(): {"source": self.weights_textbox.text()}
+        }
+        # on pytorch_state_dict format must add architecture & sha256 fields
+        if self.weights_combo.currentText() == PYTORCH_STATE_DICT:
+            weights[self.weights_combo.currentText()][
+                "architecture"
+            ] = self.model_source_textbox.text()
+            weights[self.weights_combo.currentText()][
+                "architecture_sha256"
+            ] = self.model_source_sha256_textbox.text()
+
+        return weights
+
+    def populate_weights(self) -> None:
+        """Fills the weights' page inputs with the model's weights data."""
+        if self.weights_combo is None or len(self.weights) == 0:
+            return
+        weight_type = list(self.weights.keys())[0]
+        weight_specs = self.weights[weight_type]
         set_widget_text(self.weights_combo, weight_type)
+        # the combo's signals may be blocked: update the dependant inputs directly
+        self.check_weight_format()
         self.weights_textbox.setText(weight_specs["source"])
         if weight_type == PYTORCH_STATE_DICT:
             self.model_source_textbox.setText(weight_specs["architecture"])
             self.model_source_sha256_textbox.setText(
                 weight_specs.get("architecture_sha256", "")
             )
-        # authors
-        self.authors = model_data["authors"]
-        self.populate_authors_list()
-        # cites
-        self.cites = model_data["cite"]
-        self.populate_cites_list()
-        # inputs
-        self.input_tensors = model_data["inputs"]
-        self.test_inputs = model_data["test_inputs"]
-        self.populate_inputs_list()
-        # outputs
-        self.output_tensors = model_data["outputs"]
-        self.test_outputs = model_data["test_outputs"]
-        self.populate_outputs_list()
-        # covers
-        for cover in model_data.get("covers", []):
-            self.covers_listview.addItem(cover)
-        # tags
-        self.tags_widget.tags = model_data["tags"]
+
+    def model_source_changed(self) -> None:
+        """Fill in the model source code's sha256, if the source is a local file."""
+        source = self.model_source_textbox.text().rpartition(":")[0]
+        if os.path.isfile(source):
+            self.model_source_sha256_textbox.setText(file_sha256(source))
+
+    def watch_referenced_files(self) -> None:
+        """Watch the local files referenced by the current specs."""
+        files: Dict[str, List[tuple]] = {}
+
+        def _add(path: Any, key: tuple) -> None:
+            if isinstance(path, str) and path and "://" not in path:
+                files.setdefault(path, []).append(key)
+
+        _add(self.doc_textbox.text(), ("documentation", 0))
+        for weights_format, entry in self.get_weights().items():
+            _add(entry.get("source"), ("weights", weights_format))
+        for i, path in enumerate(self.test_inputs):
+            _add(path, ("inputs", i))
+        for i, path in enumerate(self.test_outputs):
+            _add(path, ("outputs", i))
+        for i, path in enumerate(self.covers):
+            _add(path, ("covers", i))
+        self.file_watcher.set_files(files)
+
+    def referenced_files_changed(self, changed: Dict[str, List[tuple]]) -> None:
+        """Re-read (in the background) only the changed files."""
+        self.file_check_runner.run(
+            read_changed_files,
+            changed,
+            on_success=self.revalidate_entries,
+            on_error=self.show_task_error,
+        )
+
+    def validate_weights_entry(self, weights_format: str, entry: dict) -> Dict:
+        """Validate the weights entry against its format's schema."""
+        schema_name = (
+            "".join(word.capitalize() for word in weights_format.split("_"))
+            + "WeightsEntry"
+        )
+        schema = getattr(schemas.model, schema_name, None)
+        if schema is None:
+            return {"weights_format": [f"Unknown weights format: '{weights_format}'"]}
+        # empty fields are not set yet
+        entry = {key: value for key, value in entry.items() if value}
+
+        return schema().validate({**entry, "weights_format": weights_format})
+
+    def revalidate_tensor(self, kind: str, index: int, header: tuple) -> Dict:
+        """Update the tensor's shape (and output type) from its test tensor header.
+
+        Returns the tensor's validation errors.
+        """
+        shape, dtype = header
+        if kind == "inputs":
+            if index >= len(self.input_tensors):
+                return {}
+            tensor = dict(self.input_tensors[index], shape=list(shape))
+            self.input_tensors[index] = tensor
+            return schemas.model.InputTensor().validate(tensor)
+        if index >= len(self.output_tensors):
+            return {}
+        tensor = dict(
+            self.output_tensors[index], shape=list(shape), data_type=str(dtype)
+        )
+        self.output_tensors[index] = tensor
+
+        return schemas.model.OutputTensor().validate(tensor)
+
+    def revalidate_weights(self, weights_format: str, sha256: str) -> Dict:
+        """Show the weights' new sha256, and returns the entry's validation errors."""
+        if self.weights_combo is not None:
+            self.weights_textbox.setToolTip(f"sha256: {sha256}")
+        weights_entry = self.get_weights().get(weights_format, {})
+
+        return self.validate_weights_entry(
+            weights_format, {**weights_entry, "sha256": sha256}
+        )
+
+    def revalidate_entries(self, results: Dict[Any, Any]) -> None:
+        """Update and revalidate only the spec entries of the changed files.
+
+        The documentation and covers are only checked to exist.
+        """
+        errors: Dict[str, list] = {}
+        for (kind, index), result in results.items():
+            entry = f"{kind}[{index}]"
+            entry_errors: Dict = {}
+            if isinstance(result, Exception):
+                errors[entry] = [f"{result.__class__.__name__}: {result}"]
+                continue
+            if kind in ("inputs", "outputs"):
+                entry_errors = self.revalidate_tensor(kind, index, result)
+            elif kind == "weights":
+                entry_errors = self.revalidate_weights(index, result)
+            if entry_errors:
+                errors[entry] = [entry_errors]
+        if any(kind == "covers" for kind, _index in results):
+            self.populate_covers_list()
+        if errors:
+            self.show_validation_errors(errors)
 
     def build_model(self) -> None:
-        """Build bioimage model zip file."""
-        model_data = self.collect_specs()
-        if model_data is None:
-            return
+        """Validate (in the background) and build bioimage model zip file."""
+        self.validate_specs(
+            self.get_specs(), on_valid=self.build_valid_model, action="build"
+        )
 
+    def build_valid_model(self, model_data: dict) -> None:
+        """Build bioimage model zip file from the validated model specs."""
         dest_file = save_file_as(
             "Zip file (*.zip)", f"./{model_data['name'].replace(' ', '_')}.zip", self
         )
         if dest_file:
-            # buil model zip file
-            build_model_zip(model_data, dest_file)
-            QMessageBox.information(
-                self, "BioImage.io", "Model zip file created successfully."
-            )
+            # buil model zip file (only rdf.yaml is rewritten if just metadata changed)
+            build_model_zip(model_data, dest_file, incremental=True)
+            self.verify_package(dest_file)
+
+    def verify_package(self, zip_file: str) -> None:
+        """Verify (in the background) the built package's checksums."""
+
+        def _verified(errors: Dict) -> None:
+            if errors:
+                self.show_validation_errors(errors)
+            else:
+                QMessageBox.information(
+                    self,
+                    "BioImage.io",
+                    "Model zip file created and verified successfully.",
+                )
+
+        self.task_runner.run(
+            lambda path: verify_package(path).to_errors(),
+            zip_file,
+            on_success=_verified,
+            on_error=self.show_task_error,
+        )
+
+    def test_model(self) -> None:
+        """Select a built model package, and test its weight formats.
+
+        Each weight format is tested in a subprocess, so a crashing model
+        can't take the editor down.
+        """
+        selected_zip = select_file("Model package (*.zip)", self)
+        if not selected_zip:
+            return
+        if self.model_test_win is None:
+            self.model_test_win = ModelTestWidget()
+        self.model_test_win.run_tests(selected_zip, get_weight_formats(selected_zip))
+        self.model_test_win.show()
 
     def is_valid(self, model_data: dict) -> bool:
         """Validate passed model_data against the model schema."""
-        model_schema = schemas.model.Model()
-        errors = model_schema.validate(model_data)
-        # NOTE: check for the model's name to be not empty.
-        if len(errors) == 0:
-            if len(model_data["name"]) == 0:
-                errors["name"] = ["Model's name is required."]
-
+        errors = validate_model_data(model_data)
         if errors:
-            validation_win = ValidationWidget()
-            validation_win.update_content(create_validation_ui(errors))
-            validation_win.setMinimumHeight(300)
-            validation_win.show()
+            self.show_validation_errors(errors)
             return False
 
         return True
 
+    def validate_specs(
+        self,
+        model_data: dict,
+        on_valid: Optional[Callable[[dict], Any]] = None,
+        deep: bool = False,
+        action: str = "validate",
+    ) -> None:
+        """Validate model_data in the background.
+
+        Errors are shown if any, otherwise on_valid is called with the model_data.
+        Results of validations superseded by a newer one of the same action are
+        dropped. The deep validation also runs the bioimageio.core resource tests.
+        """
+
+        def _validated(errors: Dict) -> None:
+            if errors:
+                self.show_validation_errors(errors)
+            elif on_valid is not None:
+                on_valid(model_data)
+
+        worker = self.validation_workers.get(action)
+        if worker is None:
+            worker = self.validation_workers[action] = ValidationWorker(self)
+        worker.validate(
+            deep_validate_model_data if deep else validate_model_data,
+            model_data,
+            callback=_validated,
+        )
+
+    def show_task_error(self, err: Exception) -> None:
+        """Show the error of a failed background task."""
+        self.show_validation_errors({type(err).__name__: [str(err)]})
+
+    def show_validation_errors(self, errors: Dict) -> None:
+        """Show the validation errors in the validation window."""
+        if self.validation_win is None:
+            self.validation_win = ValidationWidget()
+            self.validation_win.setMinimumHeight(300)
+        self.validation_win.update_content(create_validation_ui(errors))
+        self.validation_win.show()
+
+    def deep_validate(self) -> None:
+        """Validate the model specs and run the bioimageio.core resource tests."""
+        self.validate_specs(
+            self.get_specs(),
+            on_valid=lambda _: QMessageBox.information(
+                self, "BioImage.io", "Model specifications are valid."
+            ),
+            deep=True,
+            action="deep_validate",
+        )
+
     def create_required_specs_ui(self) -> QWidget:
         """Create ui for the required specifications and fields."""
         # model name
@@ -264,11 +598,12 @@ class BioImageModelWidget(QWidget):
         )
 
         # license
+        licenses = get_spdx_licenses()
         license_combo = QComboBox()
-        license_combo.addItems(get_spdx_licenses())
+        license_combo.addItems(licenses)
         license_combo.setEditable(True)
         license_combo.setInsertPolicy(QComboBox.NoInsert)
-        license_completer = QCompleter(get_spdx_licenses())
+        license_completer = QCompleter(licenses)
         license_completer.setCompletionMode(QCompleter.UnfilteredPopupCompletion)
         license_completer.setCaseSensitivity(Qt.CaseInsensitive)
         license_combo.setCompleter(license_completer)
@@ -277,46 +612,48 @@ class BioImageModelWidget(QWidget):
         )
 
         # documentation
-        doc_textbox = QLineEdit()
-        doc_textbox.setPlaceholderText("Select Documentation file (*.md)")
-        doc_textbox.setReadOnly(True)
+        self.doc_textbox = QLineEdit()
+        self.doc_textbox.setPlaceholderText("Select Documentation file (*.md)")
+        self.doc_textbox.setReadOnly(True)
         doc_label, _ = enhance_widget(
-            doc_textbox, "Documentation", self.model_schema.fields["documentation"]
+            self.doc_textbox, "Documentation", self.model_schema.fields["documentation"]
         )
+        self.doc_textbox.textChanged.connect(self.watch_referenced_files)
         doc_button = QPushButton("Browse...")
         doc_button.clicked.connect(
-            lambda: select_file("Mark Down files (*.md)", self, doc_textbox)
+            lambda: select_file("Mark Down files (*.md)", self, self.doc_textbox)
         )
 
-        # model's weights
-        weights_type_label = QLabel("Weights Format<sup>*</sup>:")
-        self.weights_combo = QComboBox()
-        self.weights_combo.addItems(WEIGHT_FORMATS)
-        self.weights_combo.currentIndexChanged.connect(self.check_weight_format)
-        weights_label = QLabel("Weights File<sup>*</sup>:")
-        self.weights_textbox = QLineEdit()
-        self.weights_textbox.setPlaceholderText("Select model's weights file")
-        self.weights_textbox.setReadOnly(True)
-        weights_button = QPushButton("Browse...")
-        weights_button.clicked.connect(
-            lambda: select_file("*.*", self, self.weights_textbox)
-        )
-        # if weight format selected as pytorch_state_dict
-        pytorch_state_dict_schema = schemas.model.PytorchStateDictWeightsEntry()
-        self.model_source_textbox = QLineEdit()
-        self.model_src_label, _ = enhance_widget(
-            self.model_source_textbox,
-            "Model Source Code",
-            pytorch_state_dict_schema.fields["architecture"],
-        )
-        self.model_source_sha256_textbox = QLineEdit()
-        self.model_src_sha256_label, _ = enhance_widget(
-            self.model_source_sha256_textbox,
-            "Model Source Code SHA256",
-            pytorch_state_dict_schema.fields["architecture_sha256"],
-        )
+        # add widgets to the layout
+        required_layout = QGridLayout()
+        required_layout.addWidget(name_label, 0, 0)
+        required_layout.addWidget(name_textbox, 0, 1)
+        required_layout.addWidget(description_label, 1, 0)
+        required_layout.addWidget(description_textbox, 1, 1)
+        required_layout.addWidget(license_label, 2, 0)
+        required_layout.addWidget(license_combo, 2, 1)
+        required_layout.addWidget(doc_label, 3, 0)
+        required_layout.addWidget(self.doc_textbox, 3, 1)
+        required_layout.addWidget(doc_button, 3, 2)
+        # put the rest into tabs (each page is built on its first show)
+        self.required_tabs = LazyTabWidget()
+        self.required_tabs.add_lazy_tab(self.create_authors_ui, "Authors")
+        self.required_tabs.add_lazy_tab(self.create_cites_ui, "Citations")
+        self.required_tabs.add_lazy_tab(self.create_weights_ui, "Weights")
+        self.required_tabs.add_lazy_tab(self.create_inputs_ui, "Inputs")
+        self.required_tabs.add_lazy_tab(self.create_outputs_ui, "Outputs")
+
+        required_layout.addWidget(self.required_tabs, 4, 0, 1, 3)
+        # required_layout.setRowStretch(-1, 1)  # BUG: causes segmentation fault crash!!
+        #
+        frame = QFrame()
+        frame.setFrameStyle(QFrame.NoFrame)
+        frame.setLayout(required_layout)
 
-        # authors
+        return frame
+
+    def create_authors_ui(self) -> QWidget:
+        """Create ui for the authors' tab page."""
         authors_label = QLabel("Authors<sup>*</sup>:")
         self.authors_listview = QListWidget()
         self.authors_listview.setFixedHeight(70)
@@ -326,12 +663,26 @@ class BioImageModelWidget(QWidget):
         authors_button_edit.clicked.connect(self.edit_author)
         authors_button_del = QPushButton("Remove")
         authors_button_del.clicked.connect(self.del_author)
+        authors_button_import = QPushButton("Import...")
+        authors_button_import.clicked.connect(self.import_authors_file)
         authors_btn_vbox = QVBoxLayout()
         authors_btn_vbox.addWidget(authors_button_add)
         authors_btn_vbox.addWidget(authors_button_edit)
         authors_btn_vbox.addWidget(authors_button_del)
+        authors_btn_vbox.addWidget(authors_button_import)
+
+        page = QWidget()
+        page_grid = QGridLayout()
+        page.setLayout(page_grid)
+        page_grid.addWidget(authors_label, 0, 0)
+        page_grid.addWidget(self.authors_listview, 0, 1)
+        page_grid.addLayout(authors_btn_vbox, 0, 2)
+        self.populate_authors_list()
+
+        return page
 
-        # citations
+    def create_cites_ui(self) -> QWidget:
+        """Create ui for the citations' tab page."""
         cites_label = QLabel("Citations<sup>*</sup>:")
         self.cites_listview = QListWidget()
         self.cites_listview.setFixedHeight(70)
@@ -341,12 +692,73 @@ class BioImageModelWidget(QWidget):
         cites_button_edit.clicked.connect(self.edit_cite)
         cites_button_del = QPushButton("Remove")
         cites_button_del.clicked.connect(self.del_cite)
+        cites_button_import = QPushButton("Import...")
+        cites_button_import.clicked.connect(self.import_cites_file)
         cites_btn_vbox = QVBoxLayout()
         cites_btn_vbox.addWidget(cites_button_add)
         cites_btn_vbox.addWidget(cites_button_edit)
         cites_btn_vbox.addWidget(cites_button_del)
+        cites_btn_vbox.addWidget(cites_button_import)
+
+        page = QWidget()
+        page_grid = QGridLayout()
+        page.setLayout(page_grid)
+        page_grid.addWidget(cites_label, 0, 0)
+        page_grid.addWidget(self.cites_listview, 0, 1)
+        page_grid.addLayout(cites_btn_vbox, 0, 2)
+        self.populate_cites_list()
+
+        return page
+
+    def create_weights_ui(self) -> QWidget:
+        """Create ui for the model's weights tab page."""
+        weights_type_label = QLabel("Weights Format<sup>*</sup>:")
+        self.weights_combo = QComboBox()
+        self.weights_combo.addItems(WEIGHT_FORMATS)
+        self.weights_combo.currentIndexChanged.connect(self.check_weight_format)
+        weights_label = QLabel("Weights File<sup>*</sup>:")
+        self.weights_textbox = QLineEdit()
+        self.weights_textbox.setPlaceholderText("Select model's weights file")
+        self.weights_textbox.setReadOnly(True)
+        self.weights_textbox.textChanged.connect(self.watch_referenced_files)
+        weights_button = QPushButton("Browse...")
+        weights_button.clicked.connect(
+            lambda: select_file("*.*", self, self.weights_textbox)
+        )
+        # if weight format selected as pytorch_state_dict
+        pytorch_state_dict_schema = schemas.model.PytorchStateDictWeightsEntry()
+        self.model_source_textbox = QLineEdit()
+        self.model_src_label, _ = enhance_widget(
+            self.model_source_textbox,
+            "Model Source Code",
+            pytorch_state_dict_schema.fields["architecture"],
+        )
+        self.model_source_textbox.editingFinished.connect(self.model_source_changed)
+        self.model_source_sha256_textbox = QLineEdit()
+        self.model_src_sha256_label, _ = enhance_widget(
+            self.model_source_sha256_textbox,
+            "Model Source Code SHA256",
+            pytorch_state_dict_schema.fields["architecture_sha256"],
+        )
 
-        # inputs
+        page = QWidget()
+        page_grid = QGridLayout()
+        page.setLayout(page_grid)
+        page_grid.addWidget(weights_type_label, 0, 0)
+        page_grid.addWidget(self.weights_combo, 0, 1)
+        page_grid.addWidget(weights_label, 1, 0)
+        page_grid.addWidget(self.weights_textbox, 1, 1)
+        page_grid.addWidget(weights_button, 1, 2)
+        page_grid.addWidget(self.model_src_label, 2, 0)
+        page_grid.addWidget(self.model_source_textbox, 2, 1)
+        page_grid.addWidget(self.model_src_sha256_label, 3, 0)
+        page_grid.addWidget(self.model_source_sha256_textbox, 3, 1)
+        self.populate_weights()
+
+        return page
+
+    def create_inputs_ui(self) -> QWidget:
+        """Create ui for the model's inputs tab page."""
         inputs_label = QLabel("Inputs<sup>*</sup>:")
         self.inputs_listview = QListWidget()
         self.inputs_listview.setFixedHeight(70)
@@ -361,7 +773,18 @@ class BioImageModelWidget(QWidget):
         inputs_btn_vbox.addWidget(inputs_button_edit)
         inputs_btn_vbox.addWidget(inputs_button_del)
 
-        # outputs
+        page = QWidget()
+        page_grid = QGridLayout()
+        page.setLayout(page_grid)
+        page_grid.addWidget(inputs_label, 0, 0)
+        page_grid.addWidget(self.inputs_listview, 0, 1)
+        page_grid.addLayout(inputs_btn_vbox, 0, 2)
+        self.populate_inputs_list()
+
+        return page
+
+    def create_outputs_ui(self) -> QWidget:
+        """Create ui for the model's outputs tab page."""
         outputs_label = QLabel("Outputs<sup>*</sup>:")
         self.outputs_listview = QListWidget()
         self.outputs_listview.setFixedHeight(70)
@@ -371,103 +794,56 @@ class BioImageModelWidget(QWidget):
         outputs_button_edit.clicked.connect(self.edit_model_output)
         outputs_button_del = QPushButton("Remove")
         outputs_button_del.clicked.connect(self.del_output)
+        outputs_button_regenerate = QPushButton("Regenerate")
+        outputs_button_regenerate.setToolTip(
+            "To replace the test outputs with the model's predictions of the test"
+            " inputs."
+        )
+        outputs_button_regenerate.clicked.connect(self.regenerate_test_outputs)
         outputs_btn_vbox = QVBoxLayout()
         outputs_btn_vbox.addWidget(outputs_button_add)
         outputs_btn_vbox.addWidget(outputs_button_edit)
         outputs_btn_vbox.addWidget(outputs_button_del)
+        outputs_btn_vbox.addWidget(outputs_button_regenerate)
 
-        # add widgets to the layout
-        required_layout = QGridLayout()
-        required_layout.addWidget(name_label, 0, 0)
-        required_layout.addWidget(name_textbox, 0, 1)
-        required_layout.addWidget(description_label, 1, 0)
-        required_layout.addWidget(description_textbox, 1, 1)
-        required_layout.addWidget(license_label, 2, 0)
-        required_layout.addWidget(license_combo, 2, 1)
-        required_layout.addWidget(doc_label, 3, 0)
-        required_layout.addWidget(doc_textbox, 3, 1)
-        required_layout.addWidget(doc_button, 3, 2)
-        # put the rest into tabs
-        tabs = QTabWidget()
-        # authors
-        page = QWidget()
-        page_grid = QGridLayout()
-        page.setLayout(page_grid)
-        page_grid.addWidget(authors_label, 0, 0)
-        page_grid.addWidget(self.authors_listview, 0, 1)
-        page_grid.addLayout(authors_btn_vbox, 0, 2)
-        tabs.addTab(page, "Authors")
-        # cites
-        page = QWidget()
-        page_grid = QGridLayout()
-        page.setLayout(page_grid)
-        page_grid.addWidget(cites_label, 0, 0)
-        page_grid.addWidget(self.cites_listview, 0, 1)
-        page_grid.addLayout(cites_btn_vbox, 0, 2)
-        tabs.addTab(page, "Citations")
-        # weights
-        page = QWidget()
-        page_grid = QGridLayout()
-        page.setLayout(page_grid)
-        page_grid.addWidget(weights_type_label, 0, 0)
-        page_grid.addWidget(self.weights_combo, 0, 1)
-        page_grid.addWidget(weights_label, 1, 0)
-        page_grid.addWidget(self.weights_textbox, 1, 1)
-        page_grid.addWidget(weights_button, 1, 2)
-        page_grid.addWidget(self.model_src_label, 2, 0)
-        page_grid.addWidget(self.model_source_textbox, 2, 1)
-        page_grid.addWidget(self.model_src_sha256_label, 3, 0)
-        page_grid.addWidget(self.model_source_sha256_textbox, 3, 1)
-        tabs.addTab(page, "Weights")
-        # inputs
-        page = QWidget()
-        page_grid = QGridLayout()
-        page.setLayout(page_grid)
-        page_grid.addWidget(inputs_label, 0, 0)
-        page_grid.addWidget(self.inputs_listview, 0, 1)
-        page_grid.addLayout(inputs_btn_vbox, 0, 2)
-        tabs.addTab(page, "Inputs")
-        # outputs
         page = QWidget()
         page_grid = QGridLayout()
         page.setLayout(page_grid)
         page_grid.addWidget(outputs_label, 0, 0)
         page_grid.addWidget(self.outputs_listview, 0, 1)
         page_grid.addLayout(outputs_btn_vbox, 0, 2)
-        tabs.addTab(page, "Outputs")
-
-        required_layout.addWidget(tabs, 4, 0, 1, 3)
-        # required_layout.setRowStretch(-1, 1)  # BUG: causes segmentation fault crash!!
-        #
-        frame = QFrame()
-        frame.setFrameStyle(QFrame.NoFrame)
-        frame.setLayout(required_layout)
+        self.populate_outputs_list()
 
-        return frame
+        return page
 
     def create_other_spec_ui(self) -> QWidget:
         """Create ui for optional specs."""
         covers_label = QLabel("Covers:")
         self.covers_listview = QListWidget()
-        self.covers_listview.setFixedHeight(100)
+        self.covers_listview.setFixedHeight(120)
+        self.covers_listview.setIconSize(
+            QSize(THUMBNAIL_SIZE // 2, THUMBNAIL_SIZE // 2)
+        )
         covers_button_add = QPushButton("Add Image File")
         covers_button_add.clicked.connect(self.add_cover_images)
         covers_button_add_uri = QPushButton("Add from URI")
         covers_button_add_uri.clicked.connect(self.add_cover_from_uri)
-        covers_button_del = QPushButton("Remove")
-        covers_button_del.clicked.connect(
-            lambda: remove_from_listview(
-                self,
-                self.covers_listview,
-                "Are you sure you want to remove the selected cover?",
-            )
+        covers_button_generate = QPushButton("Generate")
+        covers_button_generate.setToolTip(
+            "To generate a cover from the first test input and output."
         )
+        covers_button_generate.clicked.connect(self.generate_cover)
+        covers_button_del = QPushButton("Remove")
+        covers_button_del.clicked.connect(self.del_cover)
         covers_btn_vbox = QVBoxLayout()
         covers_btn_vbox.addWidget(covers_button_add)
         covers_btn_vbox.addWidget(covers_button_add_uri)
+        covers_btn_vbox.addWidget(covers_button_generate)
         covers_btn_vbox.addWidget(covers_button_del)
+        self.populate_covers_list()
         #
         self.tags_widget = TagsInputWidget(predefined_tags=get_predefined_tags())
+        self.tags_widget.tags = self.tags
         #
         grid = QGridLayout()
         grid.addWidget(covers_label, 0, 0)
@@ -535,6 +911,8 @@ class BioImageModelWidget(QWidget):
 
     def populate_authors_list(self) -> None:
         """Populates the authors' listview widget with the list of authors."""
+        if self.authors_listview is None:
+            return
         self.authors_listview.clear()
         self.authors_listview.addItems(author["name"] for author in self.authors)
 
@@ -543,31 +921,161 @@ class BioImageModelWidget(QWidget):
         self.authors.append(author_data)
         self.populate_authors_list()
 
+    def import_authors_file(self) -> None:
+        """Import the authors of a CSV or CITATION.cff file, in the background."""
+        selected_file = select_file(AUTHORS_FILE_FILTER, self)
+        if selected_file:
+            self.task_runner.run(
+                import_authors,
+                selected_file,
+                on_success=self.authors_imported,
+                on_error=self.show_task_error,
+            )
+
+    def authors_imported(self, result: ImportResult) -> None:
+        """Add the valid imported authors at once, and show the invalid ones."""
+        self.authors.extend(result.entries)
+        self.populate_authors_list()
+        if result.errors:
+            self.show_validation_errors(result.errors)
+
     def update_author(self, index: int, author_data: dict) -> None:
         """Update the author at the given index with the given data."""
         self.authors[index] = author_data
         self.populate_authors_list()
 
+    def populate_covers_list(self) -> None:
+        """Populates the covers' listview widget with the list of covers.
+
+        Thumbnails of local images are made in the background, and shown
+        once ready.
+        """
+        self.watch_referenced_files()
+        if self.covers_listview is None:
+            return
+        self.covers_listview.clear()
+        for cover in self.covers:
+            path = self.remote_files.get(cover, cover)
+            if not os.path.isfile(path):
+                self.covers_listview.addItem(get_cover_label(cover))
+                continue
+            try:
+                # the persistent cache has the sizes of the covers seen before
+                size: Optional[Tuple[int, int]] = image_size(path)
+            except (OSError, ValueError):
+                size = None
+            self.covers_listview.addItem(get_cover_label(cover, size))
+            self.thumbnail_cache.request(
+                path, callback=partial(self._thumbnail_done, cover)
+            )
+
+    def _thumbnail_done(self, cover: str, future: Future) -> None:
+        # called in a worker thread, or right away for cached thumbnails
+        if future.exception() is None:
+            self.thumbnail_signals.ready.emit(cover, future.result())
+
+    def show_thumbnail(self, cover: str, thumbnail: Thumbnail) -> None:
+        """Show the cover's thumbnail and image size in the listview."""
+        if self.covers_listview is None:
+            return
+        for row, item_cover in enumerate(self.covers):
+            item = self.covers_listview.item(row)
+            if item_cover == cover and item is not None:
+                item.setText(
+                    get_cover_label(cover, (thumbnail.width, thumbnail.height))
+                )
+                item.setIcon(thumbnail_to_icon(thumbnail))
+
+    def generate_cover(self) -> None:
+        """Generate a cover from the first test input and output."""
+        if not self.test_inputs or not self.test_outputs:
+            QMessageBox.warning(
+                self, "BioImage.io", "A test input and output are required."
+            )
+            return
+        dest_file = save_file_as("PNG image (*.png)", "./cover.png", self)
+        if not dest_file:
+            return
+        self.task_runner.run(
+            generate_cover,
+            self.test_inputs[0],
+            self.input_tensors[0]["axes"],
+            self.test_outputs[0],
+            self.output_tensors[0]["axes"],
+            dest_file,
+            on_success=self.cover_generated,
+            on_error=self.show_task_error,
+        )
+
+    def cover_generated(self, cover: Any) -> None:
+        """Add the generated cover to the covers."""
+        self.covers.append(str(cover))
+        self.populate_covers_list()
+
     def add_cover_images(self) -> None:
         """Select cover images by a file dialog, and add them to the listview."""
         selected_files, _ = QFileDialog.getOpenFileNames(
             self, "Select Cover Image(s)", ".", "Images(*.png *.jpg *.gif)"
         )
-        for file in selected_files:
-            self.covers_listview.addItem(file)
+        self.covers.extend(selected_files)
+        self.populate_covers_list()
 
     def add_cover_from_uri(self) -> None:
         """Shows a simple form to get a URI string."""
 
         def _get_uri(uri: str) -> None:
             if len(uri) > 0:
-                self.covers_listview.addItem(uri)
+                self.covers.append(uri)
+                self.populate_covers_list()
+                self.prefetch_remote_files(
+                    [
+                        cover
+                        for cover in self.covers
+                        if is_remote_uri(cover) and cover not in self.remote_files
+                    ]
+                )
 
         input_win = SingleInputWidget(label="Cover Image URI:", title="Cover Image")
         input_win.setWindowModality(Qt.ApplicationModal)
         input_win.submit.connect(_get_uri)
         input_win.show()
 
+    def prefetch_remote_files(self, urls: List[str]) -> None:
+        """Download the urls in the background, to report unreachable ones early."""
+        if urls:
+            self.task_runner.run(
+                fetch_urls,
+                urls,
+                on_success=self.remote_files_fetched,
+                on_error=self.show_task_error,
+            )
+
+    def remote_files_fetched(self, results: Dict[str, Any]) -> None:
+        """Keep the downloaded files, and show the urls that failed."""
+        errors = []
+        for url, result in results.items():
+            if isinstance(result, Exception):
+                errors.append(f"{url}: {result}")
+            else:
+                self.remote_files[url] = str(result)
+        if errors:
+            self.show_validation_errors({"remote files": errors})
+        if any(is_remote_uri(cover) for cover in self.covers):
+            # show the thumbnails of the downloaded covers
+            self.populate_covers_list()
+
+    def del_cover(self) -> None:
+        """Remove the selected cover."""
+        selected_index = self.covers_listview.currentRow()
+        if selected_index > -1:
+            reply, del_row = remove_from_listview(
+                self,
+                self.covers_listview,
+                "Are you sure you want to remove the selected cover?",
+            )
+            if reply:
+                del self.covers[del_row]
+
     def select_add_npy_to_listview(self, list_widget: QListWidget) -> None:
         """Select a numpy file as a test input/outpu and add it to the listview."""
         selected_file = select_file("Numpy File (*.npy)", parent=self)
@@ -606,6 +1114,9 @@ class BioImageModelWidget(QWidget):
 
     def populate_inputs_list(self) -> None:
         """Populates the inputs' listview widget with the list of model's inputs."""
+        self.watch_referenced_files()
+        if self.inputs_listview is None:
+            return
         self.inputs_listview.clear()
         self.inputs_listview.addItems(
             f"{in_tensor['name']} ({in_test})"
@@ -619,10 +1130,34 @@ class BioImageModelWidget(QWidget):
         self.test_inputs.append(model_input["test_input"])
         self.populate_inputs_list()
 
+    def add_input_array(self, array: Any, axes: str, name: Optional[str] = None) -> str:
+        """Add a model's input with an in-memory test input, e.g. a napari layer.
+
+        The array is referenced without a copy; returns the test input's uri.
+        """
+        name = name or f"input_{len(self.input_tensors) + 1}"
+        test_input = register_array(array, name)
+        shape, _dtype = read_npy_header(test_input)
+        self.add_model_input(
+            {
+                "test_input": test_input,
+                "input_tensor": {
+                    "name": name,
+                    "data_type": "float32",
+                    "shape": list(shape),
+                    "axes": axes,
+                },
+            }
+        )
+
+        return test_input
+
     def update_model_input(self, index: int, input_data: dict) -> None:
         """Update model's input at given index with given data."""
+        replaced = self.test_inputs[index]
         self.test_inputs[index] = input_data["test_input"]
         self.input_tensors[index] = input_data["input_tensor"]
+        self.release_unused_arrays([replaced])
         self.populate_inputs_list()
 
     def del_input(self) -> None:
@@ -636,13 +1171,14 @@ class BioImageModelWidget(QWidget):
             )
             if reply:
                 del self.input_tensors[del_row]
-                del self.test_inputs[del_row]
+                self.release_unused_arrays([self.test_inputs.pop(del_row)])
                 self.populate_inputs_list()
 
     def new_model_output(self) -> None:
         """Shows the output form to add a new model's output."""
         output_win = OutputTensorWidget(
-            output_names=[item["name"] for item in self.output_tensors]
+            output_names=[item["name"] for item in self.output_tensors],
+            paired_input=self.get_paired_input(len(self.output_tensors)),
         )
         output_win.setWindowModality(Qt.ApplicationModal)
         output_win.submit.connect(self.add_model_output)
@@ -663,6 +1199,7 @@ class BioImageModelWidget(QWidget):
                     if item["name"] != self.output_tensors[selected_index]["name"]
                 ],
                 output_data=output_data,
+                paired_input=self.get_paired_input(selected_index),
             )
             output_win.setWindowModality(Qt.ApplicationModal)
             output_win.submit.connect(
@@ -674,23 +1211,120 @@ class BioImageModelWidget(QWidget):
 
     def populate_outputs_list(self) -> None:
         """Populates the outputs' listview widget with the list of model's outputs."""
+        self.watch_referenced_files()
+        if self.outputs_listview is None:
+            return
         self.outputs_listview.clear()
         self.outputs_listview.addItems(
             f"{out_tensor['name']} ({out_test})"
             for out_tensor, out_test in zip(self.output_tensors, self.test_outputs)
         )
 
+    def release_unused_arrays(self, uris: List[str]) -> None:
+        """Release the in-memory test tensors the specs no longer reference."""
+        used = set(self.test_inputs + self.test_outputs)
+        for uri in uris:
+            if is_memory_uri(uri) and uri not in used:
+                release_array(uri)
+
+    def get_paired_input(self, index: int) -> Optional[dict]:
+        """Returns the input paired (by order) with the output at index, if any."""
+        if index >= len(self.input_tensors):
+            return None
+
+        return {
+            "test_input": self.test_inputs[index],
+            "input_tensor": self.input_tensors[index],
+        }
+
+    def update_paired_input(self, index: int, model_output: dict) -> None:
+        """Use the test input cropped along with the output at index."""
+        if "test_input" in model_output and index < len(self.input_tensors):
+            shape, _dtype = read_npy_header(model_output["test_input"])
+            replaced = self.test_inputs[index]
+            self.test_inputs[index] = model_output["test_input"]
+            self.release_unused_arrays([replaced])
+            if isinstance(self.input_tensors[index].get("shape"), list):
+                self.input_tensors[index] = dict(
+                    self.input_tensors[index], shape=list(shape)
+                )
+            self.populate_inputs_list()
+
     def add_model_output(self, model_output: dict) -> None:
         """Add a new model's output to the list."""
-        # model_output keys: 'test_output', 'output_tensor'
+        # model_output keys: 'test_output', 'output_tensor' (and 'test_input')
+        self.update_paired_input(len(self.output_tensors), model_output)
         self.output_tensors.append(model_output["output_tensor"])
         self.test_outputs.append(model_output["test_output"])
         self.populate_outputs_list()
 
+    def regenerate_test_outputs(self) -> None:
+        """Validate the specs, and predict new test outputs from the test inputs."""
+        self.validate_specs(
+            self.get_specs(), on_valid=self.predict_test_outputs, action="regenerate"
+        )
+
+    def predict_test_outputs(self, model_data: dict) -> None:
+        """Run the model (in a worker process) to regenerate the test outputs."""
+        dest_dir = QFileDialog.getExistingDirectory(
+            self, "Select the folder of the new test outputs", "."
+        )
+        if not dest_dir:
+            return
+        self.task_runner.run(
+            regenerate_test_outputs,
+            model_data,
+            dest_dir,
+            on_success=self.test_outputs_regenerated,
+            on_error=self.show_task_error,
+        )
+
+    def test_outputs_regenerated(self, result: dict) -> None:
+        """Use the regenerated test outputs and their shapes."""
+        replaced = self.test_outputs
+        self.output_tensors = result["outputs"]
+        self.test_outputs = result["test_outputs"]
+        self.release_unused_arrays(replaced)
+        self.populate_outputs_list()
+        QMessageBox.information(
+            self, "BioImage.io", "The test outputs were regenerated successfully."
+        )
+
+    def add_output_array(
+        self,
+        array: Any,
+        axes: str,
+        name: Optional[str] = None,
+        halo: Optional[List[int]] = None,
+    ) -> str:
+        """Add a model's output with an in-memory test output.
+
+        The array is referenced without a copy; returns the test output's uri.
+        """
+        name = name or f"output_{len(self.output_tensors) + 1}"
+        test_output = register_array(array, name)
+        shape, dtype = read_npy_header(test_output)
+        output_tensor = {
+            "name": name,
+            "data_type": str(dtype),
+            "shape": list(shape),
+            "axes": axes,
+        }
+        if halo is not None:
+            output_tensor["halo"] = list(halo)
+        self.add_model_output(
+            {"test_output": test_output, "output_tensor": output_tensor}
+        )
+
+        return test_output
+
     def update_model_output(self, index: int, output_data: dict) -> None:
         """Update model's output at given index with given data."""
+        self.update_paired_input(index, output_data)
+        replaced = self.test_outputs[index]
         self.test_outputs[index] = output_data["test_output"]
         self.output_tensors[index] = output_data["output_tensor"]
+        self.release_unused_arrays([replaced])
         self.populate_outputs_list()
 
     def del_output(self) -> None:
@@ -704,7 +1338,7 @@ class BioImageModelWidget(QWidget):
             )
             if reply:
                 del self.output_tensors[del_row]
-                del self.test_outputs[del_row]
+                self.release_unused_arrays([self.test_outputs.pop(del_row)])
                 self.populate_outputs_list()
 
     def new_cite(self) -> None:
@@ -741,6 +1375,8 @@ class BioImageModelWidget(QWidget):
 
     def populate_cites_list(self) -> None:
         """Populates the citations' listview widget with the list of citations."""
+        if self.cites_listview is None:
+            return
         self.cites_listview.clear()
         self.cites_listview.addItems(cite["text"] for cite in self.cites)
 
@@ -749,6 +1385,25 @@ class BioImageModelWidget(QWidget):
         self.cites.append(cite_data)
         self.populate_cites_list()
 
+    def import_cites_file(self) -> None:
+        """Import the citations of a BibTeX, CSV or CITATION.cff file."""
+        selected_file = select_file(CITES_FILE_FILTER, self)
+        if selected_file:
+            # citations with only a DOI are resolved, so this runs in the background
+            self.task_runner.run(
+                import_cites,
+                selected_file,
+                on_success=self.cites_imported,
+                on_error=self.show_task_error,
+            )
+
+    def cites_imported(self, result: ImportResult) -> None:
+        """Add the valid imported citations at once, and show the invalid ones."""
+        self.cites.extend(result.entries)
+        self.populate_cites_list()
+        if result.errors:
+            self.show_validation_errors(result.errors)
+
     def update_cite(self, index: int, cite_data: dict) -> None:
         """Update the citation at the given index with the given data."""
         self.cites[index] = cite_data
@@ -0,0 +1,138 @@
+from typing import List, Optional
+
+from qtpy.QtCore import QObject, QRunnable, QThreadPool, Signal
+from qtpy.QtWidgets import (
+    QAbstractItemView,
+    QApplication,
+    QHeaderView,
+    QPlainTextEdit,
+    QTableWidget,
+    QTableWidgetItem,
+    QVBoxLayout,
+    QWidget,
+)
+
+from core_bioimage_io_widgets.utils.model_tester import (
+    ModelTestResult,
+    TensorError,
+    run_model_test,
+)
+
+
+def _tensor_status(tensor: TensorError) -> str:
+    if tensor.ok:
+        return "ok"
+    if tensor.mismatches < 0:
+        return "FAIL"
+    return f"FAIL ({tensor.mismatches} values, first at {tensor.first_mismatch})"
+
+
+class _TestSignals(QObject):
+    progress = Signal(str, str, name="progress")
+    finished = Signal(object, name="finished")
+
+
+class _ModelTestTask(QRunnable):
+    def __init__(
+        self, zip_path: str, weight_format: str, signals: _TestSignals, **kwargs
+    ) -> None:
+        super().__init__()
+        self.zip_path = zip_path
+        self.weight_format = weight_format
+        self.signals = signals
+        self.kwargs = kwargs
+
+    def run(self) -> None:
+        # the test itself runs in a subprocess; this thread only supervises it
+        result = run_model_test(
+            self.zip_path,
+            self.weight_format,
+            progress_fn=lambda _package, weight_format, message: (
+                self.signals.progress.emit(weight_format, message)
+            ),
+            **self.kwargs,
+        )
+        self.signals.finished.emit(result)
+
+
+class ModelTestWidget(QWidget):
+    """Tests a model package's weight formats, and shows their progress and errors.
+
+    Each weight format is tested in its own subprocess, at most max_workers
+    at once; the table lists the max absolute error of each test output.
+    """
+
+    def __init__(self, max_workers: int = 2, parent: Optional[QWidget] = None) -> None:
+        super().__init__(parent)
+
+        self.results: List[ModelTestResult] = []
+        self.thread_pool = QThreadPool(self)
+        self.thread_pool.setMaxThreadCount(max_workers)
+        # emitted from the supervising threads, received in this object's thread
+        self._signals = _TestSignals()
+        self._signals.progress.connect(self.show_progress)
+        self._signals.finished.connect(self.test_finished)
+
+        self.table = QTableWidget(0, 4)
+        self.table.setHorizontalHeaderLabels(
+            ["Weights", "Output", "Max Abs Error", "Status"]
+        )
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.log_textbox = QPlainTextEdit()
+        self.log_textbox.setReadOnly(True)
+
+        vbox = QVBoxLayout()
+        vbox.addWidget(self.table, stretch=1)
+        vbox.addWidget(self.log_textbox, stretch=1)
+        self.setLayout(vbox)
+        self.setWindowTitle("Test Model")
+        self.resize(700, 500)
+
+    def run_tests(self, zip_path: str, weight_formats: List[str], **kwargs) -> None:
+        """Test the package's weight formats; kwargs are passed to run_model_test."""
+        self.results = []
+        self.table.setRowCount(0)
+        self.log_textbox.clear()
+        self.log_textbox.appendPlainText(f"Testing {zip_path}")
+        for weight_format in weight_formats:
+            self.thread_pool.start(
+                _ModelTestTask(zip_path, weight_format, self._signals, **kwargs)
+            )
+
+    def is_running(self) -> bool:
+        """Returns True if a test is running or queued."""
+        return self.thread_pool.activeThreadCount() > 0
+
+    def show_progress(self, weight_format: str, message: str) -> None:
+        """Log a test's progress message."""
+        self.log_textbox.appendPlainText(f"[{weight_format}] {message}")
+
+    def test_finished(self, result: ModelTestResult) -> None:
+        """Add the test's per-tensor errors to the table, and log its status."""
+        self.results.append(result)
+        rows = [
+            (tensor.name, f"{tensor.max_abs_error:.3g}", _tensor_status(tensor))
+            for tensor in result.tensors
+        ] or [("-", "-", result.status)]
+        for output, error, status in rows:
+            row = self.table.rowCount()
+            self.table.insertRow(row)
+            for column, text in enumerate(
+                (result.weight_format, output, error, status)
+            ):
+                self.table.setItem(row, column, QTableWidgetItem(text))
+        self.log_textbox.appendPlainText(
+            f"[{result.weight_format}] {result.status} in {result.duration:.1f} s"
+        )
+        if result.error:
+            self.log_textbox.appendPlainText(result.error)
+
+
+if __name__ == "__main__":
+    import sys
+
+    app = QApplication(sys.argv)
+    win = ModelTestWidget()
+    win.show()
+    sys.exit(app.exec_())
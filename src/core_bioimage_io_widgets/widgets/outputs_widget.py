@@ -1,6 +1,6 @@
-from typing import List, Optional
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional
 
-import numpy as np
 from qtpy.QtCore import QRegExp, Qt, Signal
 from qtpy.QtGui import QRegExpValidator
 from qtpy.QtWidgets import (
@@ -21,17 +21,32 @@ from qtpy.QtWidgets import (
 from core_bioimage_io_widgets.utils import (
     AXES_REGEX,
     # OUTPUT_TYPES,
+    TENSOR_FILE_FILTER,
+    TensorStats,
+    convert_test_tensor,
+    convert_to_npy,
+    crop_test_tensor,
+    crop_test_tensors,
+    get_tensor_format,
+    narrowest_dtype,
     nodes,
+    read_npy_header,
+    read_tensor_header,
+    register_array,
     safe_cast,
+    scan_tensor,
     schemas,
 )
 from core_bioimage_io_widgets.widgets.postprocessing_widget import PostprocessingWidget
+from core_bioimage_io_widgets.widgets.task_runner import TaskRunner
 from core_bioimage_io_widgets.widgets.ui_helper import (
     create_validation_ui,
     enhance_widget,
     remove_from_listview,
+    select_tensor_key,
 )
 from core_bioimage_io_widgets.widgets.validation_widget import ValidationWidget
+from core_bioimage_io_widgets.widgets.validation_worker import ValidationWorker
 
 
 class OutputTensorWidget(QWidget):
@@ -43,18 +58,29 @@ class OutputTensorWidget(QWidget):
         self,
         output_names: Optional[list] = None,
         output_data: Optional[dict] = None,
+        paired_input: Optional[dict] = None,
         parent: Optional[QWidget] = None,
     ) -> None:
         super().__init__(parent)
 
         self.output_tensor_schema = schemas.model.OutputTensor()
+        self.validation_worker = ValidationWorker(self)
+        # converts, crops and narrows the test output in the background
+        self.convert_runner = TaskRunner(parent=self)
+        # scans the test output values in the background
+        self.scan_runner = TaskRunner(parent=self)
         if output_names is None:
             self.output_names = []
         else:
             self.output_names = output_names
         self.output_shape: List[int] = []
+        self.test_output = ""
         self.output_type: str = "float32"
+        self.proposed_type: str = "float32"
         self.postprocessings: List[dict] = []
+        # the input ('test_input', 'input_tensor') cropped along with the output
+        self.paired_input = paired_input
+        self.cropped_input: Optional[str] = None
 
         self.create_ui()
         # check edit mode
@@ -64,17 +90,26 @@ class OutputTensorWidget(QWidget):
     def create_ui(self) -> None:
         """Creates ui for model's output tensor."""
         self.test_output_textbox = QLineEdit()
-        self.test_output_textbox.setPlaceholderText("select Test Output file (*.npy)")
+        self.test_output_textbox.setPlaceholderText(
+            "select Test Output file (*.npy, *.npz, *.tif, zarr)"
+        )
         self.test_output_textbox.setReadOnly(True)
         test_output_label, _ = enhance_widget(
             self.test_output_textbox, "Test Output<sup>*</sup>"
         )
         test_output_button = QPushButton("Browse...")
         test_output_button.clicked.connect(self.select_test_output)
+        self.crop_button = QPushButton("Crop")
+        self.crop_button.setToolTip(
+            "Replace the test output with a small representative crop of it."
+        )
+        self.crop_button.setEnabled(False)
+        self.crop_button.clicked.connect(self.crop_test_output)
         test_output_hbox = QHBoxLayout()
         test_output_hbox.addWidget(test_output_label)
         test_output_hbox.addWidget(self.test_output_textbox)
         test_output_hbox.addWidget(test_output_button)
+        test_output_hbox.addWidget(self.crop_button)
         #
         self.name_textbox = QLineEdit()
         self.name_textbox.setMinimumWidth(180)
@@ -111,6 +146,20 @@ class OutputTensorWidget(QWidget):
         #     "Data Type",
         #     self.output_tensor_schema.fields["data_type"],
         # )
+        self.data_type_textbox = QLineEdit()
+        self.data_type_textbox.setMinimumWidth(180)
+        self.data_type_textbox.setReadOnly(True)
+        data_type_label, _ = enhance_widget(
+            self.data_type_textbox,
+            "Data Type",
+            self.output_tensor_schema.fields["data_type"],
+        )
+        self.narrow_button = QPushButton("Narrow")
+        self.narrow_button.setToolTip(
+            "Save the test output with the narrowest data type holding its values."
+        )
+        self.narrow_button.setEnabled(False)
+        self.narrow_button.clicked.connect(self.narrow_test_output)
         #
         postprocessing_label = QLabel("Postprocessing:")
         self.postprocessing_listview = QListWidget()
@@ -124,13 +173,13 @@ class OutputTensorWidget(QWidget):
         postprocessing_btn_vbox.addWidget(postprocessing_button_del)
         postprocessing_btn_vbox.insertStretch(-1, 1)
         #
-        submit_button = QPushButton("&Submit")
-        submit_button.clicked.connect(self.submit_output_tensor)
+        self.submit_button = QPushButton("&Submit")
+        self.submit_button.clicked.connect(self.submit_output_tensor)
         cancel_button = QPushButton("&Cancel")
         cancel_button.clicked.connect(lambda: self.close())
         form_btn_hbox = QHBoxLayout()
         form_btn_hbox.addWidget(cancel_button)
-        form_btn_hbox.addWidget(submit_button)
+        form_btn_hbox.addWidget(self.submit_button)
         #
         self.validation_widget = ValidationWidget()
         #
@@ -145,6 +194,9 @@ class OutputTensorWidget(QWidget):
         grid.addWidget(self.halo_textbox, 3, 1, alignment=Qt.AlignLeft)
         # grid.addWidget(data_type_label, 4, 0)
         # grid.addWidget(self.data_type_combo, 4, 1, alignment=Qt.AlignLeft)
+        grid.addWidget(data_type_label, 4, 0)
+        grid.addWidget(self.data_type_textbox, 4, 1, alignment=Qt.AlignLeft)
+        grid.addWidget(self.narrow_button, 4, 2)
         grid.addWidget(postprocessing_label, 5, 0, alignment=Qt.AlignTop)
         grid.addWidget(self.postprocessing_listview, 5, 1, alignment=Qt.AlignTop)
         grid.addLayout(postprocessing_btn_vbox, 5, 2)
@@ -184,7 +236,7 @@ class OutputTensorWidget(QWidget):
             self.add_postprocessing(process)
 
     def submit_output_tensor(self) -> None:
-        """Validate and submit the output tensor."""
+        """Validate (in the background) and submit the output tensor."""
         output_data = {
             "name": self.name_textbox.text(),
             "data_type": self.output_type,
@@ -198,24 +250,35 @@ class OutputTensorWidget(QWidget):
         # output_data["data_type"] = self.data_type_combo.currentText()
         if len(self.postprocessings) > 0:
             output_data["postprocessing"] = self.postprocessings
-        # validation
-        errors = self.output_tensor_schema.validate(output_data)
-        if errors:
-            self.validation_widget.update_content(create_validation_ui(errors))
-            return
+        self.validation_worker.validate(
+            self.validate_output_tensor,
+            output_data,
+            callback=partial(self.output_tensor_validated, output_data),
+        )
+
+    def validate_output_tensor(self, output_data: dict) -> Dict:
+        """Validate the output tensor's data, and returns the errors."""
+        errors: Dict = self.output_tensor_schema.validate(output_data)
         # check output name is unique
-        if self.name_textbox.text() in self.output_names:
+        if not errors and output_data["name"] in self.output_names:
             errors = {"name": ["Output name must be unique."]}
+
+        return errors
+
+    def output_tensor_validated(self, output_data: dict, errors: Dict) -> None:
+        """Show the validation errors, or submit the output if there is none."""
+        if errors:
             self.validation_widget.update_content(create_validation_ui(errors))
             return
 
         # emit submit signal and send output data
-        self.submit.emit(
-            {
-                "test_output": self.test_output_textbox.text(),
-                "output_tensor": output_data,
-            }
-        )
+        submitted = {
+            "test_output": self.test_output_textbox.text(),
+            "output_tensor": output_data,
+        }
+        if self.cropped_input is not None:
+            submitted["test_input"] = self.cropped_input
+        self.submit.emit(submitted)
         self.close()
 
     def select_test_output(self) -> None:
@@ -224,24 +287,49 @@ class OutputTensorWidget(QWidget):
         Then reads the output shape.
         """
         selected_file, _ = QFileDialog.getOpenFileName(
-            self, "Browse", ".", "Numpy file (*.npy)"
+            self, "Browse", ".", TENSOR_FILE_FILTER
         )
-        if selected_file is not None:
+        if selected_file:
             self.test_output_selected(selected_file)
 
     def test_output_selected(self, selected_file: str) -> None:
         """Read selected numpy file and update corresponding ui."""
+        try:
+            selected_file = select_tensor_key(selected_file, self)
+            if selected_file is None:
+                return
+            if get_tensor_format(selected_file) == "npy":
+                # read only the numpy file header (the file can be a package member)
+                shape, dtype = read_npy_header(selected_file)
+            else:
+                # read the metadata now, and convert to the packaged .npy meanwhile
+                shape, dtype = read_tensor_header(selected_file)
+        except (OSError, ValueError, ImportError) as err:
+            self.validation_widget.update_content(
+                create_validation_ui({"test_output": [str(err)]})
+            )
+            return
+        previous = self.test_output
         self.test_output_textbox.setText(selected_file)
         self.output_groupbox.setEnabled(True)
+        self.crop_button.setEnabled(True)
+        self.submit_button.setEnabled(True)
         self.test_output = selected_file
-        # read numpy file
-        with open(selected_file, mode="rb") as f:
-            arr = np.load(f)
-        _max_len = len(arr.shape)
+        _max_len = len(shape)
         # output shape
-        self.output_shape = arr.shape
-        self.output_type = str(arr.dtype)
-        self.shape_textbox.setText(" x ".join(str(d) for d in arr.shape))
+        self.output_shape = shape
+        self.output_type = str(dtype)
+        self.data_type_textbox.setText(self.output_type)
+        # look for a narrower data type
+        self.narrow_button.setText("Narrow")
+        self.narrow_button.setEnabled(False)
+        self.proposed_type = self.output_type
+        if get_tensor_format(selected_file) == "npy":
+            self.scan_test_output(selected_file)
+        else:
+            # scanned once converted
+            self.convert_test_output(selected_file, previous)
+        self.shape_textbox.setText(" x ".join(str(d) for d in shape))
         # set axes textbox validator based on the test output array shape:
         self.axes_textbox.setMaxLength(_max_len)
         validator = QRegExpValidator(QRegExp(AXES_REGEX.replace("LEN", str(_max_len))))
@@ -249,6 +337,168 @@ class OutputTensorWidget(QWidget):
         # set output name
         self.name_textbox.setText(self.get_output_name())
 
+    def convert_test_output(self, selected_file: str, previous: str = "") -> None:
+        """Convert the test output to a .npy file in the background.
+
+        If the conversion fails, the previous test output is restored.
+        """
+        self.submit_button.setEnabled(False)
+        self.crop_button.setEnabled(False)
+        self.test_output_textbox.setText(f"{selected_file} (converting...)")
+        self.convert_runner.run(
+            convert_to_npy,
+            selected_file,
+            on_success=partial(self.test_output_converted, selected_file),
+            on_error=partial(self.test_output_not_converted, selected_file, previous),
+        )
+
+    def test_output_not_converted(
+        self, selected_file: str, previous: str, err: Exception
+    ) -> None:
+        """Show the conversion error, and restore the previous test output."""
+        if selected_file != self.test_output:
+            return
+        self.test_output = ""
+        self.test_output_textbox.clear()
+        if previous:
+            self.test_output_selected(previous)
+        self.validation_widget.update_content(
+            create_validation_ui({"test_output": [f"{type(err).__name__}: {err}"]})
+        )
+
+    def test_output_converted(self, selected_file: str, npy_file: Any) -> None:
+        """Use the converted .npy file as the test output."""
+        if selected_file != self.test_output:
+            # another test output was selected meanwhile
+            return
+        self.submit_button.setEnabled(True)
+        self.test_output = str(npy_file)
+        self.test_output_textbox.setText(self.test_output)
+        self.crop_button.setEnabled(True)
+        self.scan_test_output(self.test_output)
+
+    def set_test_output_array(self, array: Any, name: Optional[str] = None) -> None:
+        """Use an in-memory array as the test output, without copying it."""
+        self.test_output_selected(register_array(array, name or self.get_output_name()))
+
+    def crop_test_output(self) -> None:
+        """Replace (in the background) the test output with its centered crop.
+
+        The halo is kept. With a paired input, both are cropped to the same
+        region: the input's crop is submitted along with the output.
+        """
+        axes = self.axes_textbox.text()
+        if len(axes) != len(self.output_shape):
+            self.validation_widget.update_content(
+                create_validation_ui(
+                    {"axes": ["Axes are required to crop the test output."]}
+                )
+            )
+            return
+        halo = None
+        if len(self.halo_textbox.text()) > 0:
+            halo = [safe_cast(s, int, 0) for s in self.halo_textbox.text().split(",")]
+        if self.paired_input is None:
+            task = partial(crop_test_tensor, self.test_output, axes, halo=halo)
+        else:
+            input_tensor = self.paired_input["input_tensor"]
+            input_shape = input_tensor.get("shape")
+            min_shape = step = None
+            if isinstance(input_shape, dict):
+                min_shape, step = input_shape.get("min"), input_shape.get("step")
+            task = partial(
+                crop_test_tensors,
+                self.paired_input["test_input"],
+                input_tensor["axes"],
+                self.test_output,
+                axes,
+                halo=halo,
+                min_shape=min_shape,
+                step=step,
+            )
+        self.rewrite_test_output(task)
+
+    def narrow_test_output(self) -> None:
+        """Replace (in the background) the test output with its narrowed copy."""
+        self.rewrite_test_output(
+            partial(convert_test_tensor, self.test_output, self.proposed_type)
+        )
+
+    def rewrite_test_output(self, task: Callable[[], Any]) -> None:
+        """Run the task making a new test output off the gui thread.
+
+        The task returns the new test output, or the new test input and output.
+        """
+        self.crop_button.setEnabled(False)
+        self.narrow_button.setEnabled(False)
+        self.submit_button.setEnabled(False)
+        self.convert_runner.run(
+            task,
+            on_success=partial(
+                self.test_output_rewritten,
+                self.test_output,
+                self.name_textbox.text(),
+                self.axes_textbox.text(),
+            ),
+            on_error=partial(self.test_output_not_rewritten, self.test_output),
+        )
+
+    def test_output_rewritten(
+        self, test_output: str, name: str, axes: str, result: Any
+    ) -> None:
+        """Use the new test output, keeping the entered name and axes."""
+        if test_output != self.test_output:
+            # another test output was selected meanwhile
+            return
+        if isinstance(result, tuple):
+            # cropped along with the paired input
+            self.cropped_input, result = map(str, result)
+        self.test_output_selected(str(result))
+        self.name_textbox.setText(name)
+        self.axes_textbox.setText(axes)
+
+    def test_output_not_rewritten(self, test_output: str, err: Exception) -> None:
+        """Show the error, and keep the current test output."""
+        if test_output != self.test_output:
+            return
+        self.crop_button.setEnabled(True)
+        self.narrow_button.setEnabled(self.proposed_type != self.output_type)
+        self.submit_button.setEnabled(True)
+        self.validation_widget.update_content(
+            create_validation_ui({"test_output": [f"{type(err).__name__}: {err}"]})
+        )
+
+    def scan_test_output(self, test_output: str) -> None:
+        """Scan the test output's values in the background."""
+        self.scan_runner.run(
+            scan_tensor,
+            test_output,
+            on_success=partial(self.test_output_scanned, test_output),
+            on_error=partial(self.test_output_not_scanned, test_output),
+        )
+
+    def test_output_scanned(self, test_output: str, stats: TensorStats) -> None:
+        """Propose the narrowest data type holding the test output's values."""
+        if test_output != self.test_output:
+            # another test output was selected meanwhile
+            return
+        self.proposed_type = narrowest_dtype(stats)
+        if self.proposed_type != self.output_type:
+            self.narrow_button.setText(f"Narrow to {self.proposed_type}")
+            self.narrow_button.setEnabled(True)
+            if self.proposed_type == "float32":
+                self.narrow_button.setToolTip(
+                    f"The values change by at most {stats.float32_error:.3g}."
+                )
+
+    def test_output_not_scanned(self, test_output: str, err: Exception) -> None:
+        """Show the error of the test output's scan."""
+        if test_output != self.test_output:
+            return
+        self.validation_widget.update_content(
+            create_validation_ui({"test_output": [f"{type(err).__name__}: {err}"]})
+        )
+
     def show_postprocessing(self) -> None:
         """Show postprocessing form."""
         preprocess_form = PostprocessingWidget()
@@ -0,0 +1,90 @@
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from qtpy.QtCore import QObject, QRunnable, QThreadPool, Signal
+
+Callbacks = Tuple[Optional[Callable[[Any], Any]], Optional[Callable[[Exception], Any]]]
+
+
+class _TaskSignals(QObject):
+    succeeded = Signal(int, object)
+    failed = Signal(int, object)
+
+
+class _Task(QRunnable):
+    def __init__(
+        self, task_id: int, fn: Callable, args: tuple, signals: _TaskSignals
+    ) -> None:
+        super().__init__()
+        self.task_id = task_id
+        self.fn = fn
+        self.args = args
+        self.signals = signals
+
+    def run(self) -> None:
+        try:
+            result = self.fn(*self.args)
+        except Exception as err:
+            self.signals.failed.emit(self.task_id, err)
+            return
+        self.signals.succeeded.emit(self.task_id, result)
+
+
+class TaskRunner(QObject):
+    """Runs functions off the gui thread, and delivers each result or error.
+
+    Unlike ValidationWorker, no run is superseded: every task's success or
+    error callback is called, in this object's thread.
+    """
+
+    succeeded = Signal(object, name="succeeded")
+    failed = Signal(object, name="failed")
+
+    def __init__(self, max_threads: int = 1, parent: Optional[QObject] = None) -> None:
+        super().__init__(parent)
+
+        self._next_id = 0
+        self._callbacks: Dict[int, Callbacks] = {}
+        self.thread_pool = QThreadPool(self)
+        self.thread_pool.setMaxThreadCount(max_threads)
+        # emitted from the worker threads, received in this object's thread
+        self._signals = _TaskSignals()
+        self._signals.succeeded.connect(self._task_succeeded)
+        self._signals.failed.connect(self._task_failed)
+
+    def run(
+        self,
+        fn: Callable,
+        *args: Any,
+        on_success: Optional[Callable[[Any], Any]] = None,
+        on_error: Optional[Callable[[Exception], Any]] = None,
+    ) -> int:
+        """Run fn(*args) in the thread pool, and returns the task's id.
+
+        on_success receives the returned value, and on_error the raised
+        exception.
+        """
+        self._next_id += 1
+        self._callbacks[self._next_id] = (on_success, on_error)
+        self.thread_pool.start(_Task(self._next_id, fn, args, self._signals))
+
+        return self._next_id
+
+    def is_running(self) -> bool:
+        """Returns True if a task is running or queued."""
+        return bool(self._callbacks)
+
+    def wait(self, msecs: int = -1) -> bool:
+        """Wait for the running tasks to be done."""
+        return bool(self.thread_pool.waitForDone(msecs))
+
+    def _task_succeeded(self, task_id: int, result: Any) -> None:
+        on_success, _ = self._callbacks.pop(task_id, (None, None))
+        if on_success is not None:
+            on_success(result)
+        self.succeeded.emit(result)
+
+    def _task_failed(self, task_id: int, err: Exception) -> None:
+        _, on_error = self._callbacks.pop(task_id, (None, None))
+        if on_error is not None:
+            on_error(err)
+        self.failed.emit(err)
@@ -1,13 +1,16 @@
 import json
-from typing import Any, Dict, List, Optional, Tuple, Union
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
 
 import markdown
 from marshmallow import missing
 from marshmallow.fields import Field
 from qtpy.QtCore import Qt
+from qtpy.QtGui import QIcon, QImage, QPixmap
 from qtpy.QtWidgets import (
     QComboBox,
     QFileDialog,
+    QInputDialog,
     QLabel,
     QLayout,
     QLineEdit,
@@ -17,7 +20,14 @@ from qtpy.QtWidgets import (
     QWidget,
 )
 
-from core_bioimage_io_widgets.utils import nodes, safe_cast, schemas
+from core_bioimage_io_widgets.utils import (
+    KEY_SEPARATOR,
+    Thumbnail,
+    list_tensor_keys,
+    nodes,
+    safe_cast,
+    schemas,
+)
 
 # def none_for_empty(text: str) -> Optional[str]:
 #     """Makes sure the string is not empty otherwise returns None."""
@@ -34,6 +44,29 @@ def get_tooltip(field: schemas.SharedBioImageIOSchema) -> Any:
     return to_html(field.bioimageio_description)
 
 
+def get_cover_label(cover: str, size: Optional[Tuple[int, int]] = None) -> str:
+    """Returns the cover's list label, with the (width, height) of the image."""
+    if size is None:
+        return cover
+
+    return f"{cover}  ({size[0]} x {size[1]})"
+
+
+def thumbnail_to_icon(thumbnail: Thumbnail) -> QIcon:
+    """Returns an icon of the thumbnail's rgb(a) pixels."""
+    image = thumbnail.image
+    height, width, channels = image.shape
+    q_image = QImage(
+        image.data,
+        width,
+        height,
+        image.strides[0],
+        QImage.Format_RGBA8888 if channels == 4 else QImage.Format_RGB888,
+    )
+    # copied, as the image doesn't own the pixels
+    return QIcon(QPixmap.fromImage(q_image.copy()))
+
+
 def get_widget_text(widget: QWidget) -> str:
     """Returns current text inside the input widget."""
     if isinstance(widget, QComboBox):
@@ -99,6 +132,24 @@ def set_ui_data_from_dict(parent: QWidget, data: dict) -> None:
             set_widget_text(child, value)
 
 
+@contextmanager
+def bulk_update(parent: QWidget) -> Iterator[None]:
+    """Suspends repaints and signals of the parent and all its children.
+
+    The parent is repainted once when leaving the context.
+    """
+    widgets = [parent, *parent.findChildren(QWidget)]
+    signals_blocked = [widget.blockSignals(True) for widget in widgets]
+    parent.setUpdatesEnabled(False)
+    try:
+        yield
+    finally:
+        for widget, was_blocked in zip(widgets, signals_blocked):
+            widget.blockSignals(was_blocked)
+        parent.setUpdatesEnabled(True)
+        parent.update()
+
+
 def set_ui_data_from_node(parent: QWidget, data: nodes.RawNode) -> None:
     """Fills ui widgets with given data based on widget's field property."""
     if data is None:
@@ -190,6 +241,23 @@ def select_file(
     return str(selected_file)
 
 
+def select_tensor_key(path: str, parent: Optional[QWidget] = None) -> Optional[str]:
+    """Let the user pick an array of a multi-array tensor file (.npz, zarr group).
+
+    Returns the path selecting the array, or None if the selection is canceled.
+    """
+    keys = list_tensor_keys(path)
+    if len(keys) <= 1:
+        return path if not keys else f"{path}{KEY_SEPARATOR}{keys[0]}"
+    key, ok = QInputDialog.getItem(
+        parent, "BioImageIO", "Select the test tensor's array:", keys, 0, False
+    )
+    if not ok:
+        return None
+
+    return f"{path}{KEY_SEPARATOR}{key}"
+
+
 def save_file_as(
     filter: str, default_dir: Optional[str] = None, parent: Optional[QWidget] = None
 ) -> str:
@@ -0,0 +1,88 @@
+from typing import Any, Callable, Dict, Optional
+
+from qtpy.QtCore import QObject, QRunnable, QThreadPool, Signal
+
+
+class _TaskSignals(QObject):
+    finished = Signal(int, object)
+
+
+class _ValidationTask(QRunnable):
+    def __init__(
+        self,
+        generation: int,
+        validate_fn: Callable[..., Dict],
+        args: tuple,
+        signals: _TaskSignals,
+    ) -> None:
+        super().__init__()
+        self.generation = generation
+        self.validate_fn = validate_fn
+        self.args = args
+        self.signals = signals
+
+    def run(self) -> None:
+        try:
+            errors = self.validate_fn(*self.args)
+        except Exception as err:
+            errors = {"validation": [str(err)]}
+        self.signals.finished.emit(self.generation, errors)
+
+
+class ValidationWorker(QObject):
+    """Runs validations off the gui thread and delivers only the newest result.
+
+    Each call to validate starts a new generation; results of superseded
+    generations are dropped, and superseded runs that are not started yet
+    are removed from the queue.
+    """
+
+    finished = Signal(object, name="finished")
+
+    def __init__(self, parent: Optional[QObject] = None) -> None:
+        super().__init__(parent)
+
+        self.generation = 0
+        self._callback: Optional[Callable[[Dict], Any]] = None
+        # one validation at a time: schema instances are not shared across threads
+        self.thread_pool = QThreadPool(self)
+        self.thread_pool.setMaxThreadCount(1)
+        # emitted from the worker thread, received in this object's thread
+        self._signals = _TaskSignals()
+        self._signals.finished.connect(self._task_finished)
+
+    def validate(
+        self,
+        validate_fn: Callable[..., Dict],
+        *args: Any,
+        callback: Optional[Callable[[Dict], Any]] = None,
+    ) -> int:
+        """Run validate_fn(*args) in the worker, and returns the run's generation.
+
+        The callback (and the finished signal) receives the errors dictionary
+        only if no newer validation was requested meanwhile.
+        """
+        self.generation += 1
+        self._callback = callback
+        self.thread_pool.clear()
+        self.thread_pool.start(
+            _ValidationTask(self.generation, validate_fn, args, self._signals)
+        )
+
+        return self.generation
+
+    def is_running(self) -> bool:
+        """Returns True if a validation is running or queued."""
+        return self.thread_pool.activeThreadCount() > 0
+
+    def wait(self, msecs: int = -1) -> bool:
+        """Wait for the running validation to be done."""
+        return bool(self.thread_pool.waitForDone(msecs))
+
+    def _task_finished(self, generation: int, errors: Dict) -> None:
+        if generation != self.generation:
+            # superseded by a newer validation
+            return
+        if self._callback is not None:
+            self._callback(errors)
+        self.finished.emit(errors)
@@ -0,0 +1,44 @@
+import os
+
+import numpy as np
+import pytest
+
+from core_bioimage_io_widgets.utils import ModelSpecBuilder
+from core_bioimage_io_widgets.utils.file_cache import CACHE_DIR_ENV
+
+
+@pytest.fixture(scope="session", autouse=True)
+def file_cache_dir(tmp_path_factory):
+    # keep the tests' file cache out of the user cache directory
+    cache_dir = tmp_path_factory.mktemp("cache")
+    os.environ[CACHE_DIR_ENV] = str(cache_dir)
+    return cache_dir
+
+
+@pytest.fixture
+def builder(tmp_path):
+    np.save(tmp_path / "test_input.npy", np.zeros((1, 1, 64, 64), dtype="float32"))
+    np.save(tmp_path / "test_output.npy", np.zeros((1, 1, 64, 64), dtype="uint8"))
+    (tmp_path / "README.md").write_text("# model")
+    (tmp_path / "weights.onnx").write_bytes(b"weights")
+
+    builder = ModelSpecBuilder(
+        name="model",
+        description="a test model",
+        license="MIT",
+        documentation=str(tmp_path / "README.md"),
+    )
+    builder.add_author("Jane Doe", affiliation="Lab")
+    builder.add_cite("A paper", doi="10.1234/abcd")
+    builder.add_input(tmp_path / "test_input.npy", "bcyx")
+    builder.add_output(tmp_path / "test_output.npy", "bcyx", halo=[0, 0, 8, 8])
+    builder.set_weights("onnx", str(tmp_path / "weights.onnx"), opset_version=15)
+    return builder
+
+
+@pytest.fixture(scope="session")
+def qapp():
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    QtWidgets = pytest.importorskip("qtpy.QtWidgets")
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+    yield app
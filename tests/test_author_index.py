@@ -0,0 +1,82 @@
+import os
+
+import yaml
+
+from core_bioimage_io_widgets.utils import AuthorIndex
+
+
+def test_index_spec_files(tmp_path):
+    spec = tmp_path / "rdf.yaml"
+    spec.write_text(
+        yaml.safe_dump(
+            {
+                "name": "model",
+                "authors": [
+                    {"name": "Jane Doe", "affiliation": "EMBL Heidelberg"},
+                    {"name": "John  Smith", "github_user": "jsmith"},
+                ],
+            }
+        )
+    )
+    index = AuthorIndex(tmp_path / "index.sqlite")
+    assert index.add_spec_files([spec, tmp_path / "missing.yaml"]) == 1
+    # unchanged files are not indexed again
+    assert index.add_spec_files([spec]) == 0
+    index.add_authors([{"name": "jane doe", "email": "jane@embl.de"}])
+    index.add_authors([{"name": "Janet Heidel", "affiliation": "Uni Heidelberg"}])
+
+    assert index.complete("name", "ja") == ["Jane Doe", "Janet Heidel"]
+    assert index.complete("name", "SMI") == ["John  Smith"]
+    # substring matches, the most used first
+    assert index.complete("affiliation", "heidel") == [
+        "EMBL Heidelberg",
+        "Uni Heidelberg",
+    ]
+    index.add_authors([{"name": "Ann Lee", "affiliation": "Heidelberg University"}])
+    # prefix matches come first
+    assert index.complete("affiliation", "heidel")[0] == "Heidelberg University"
+    assert index.complete("affiliation", "") == []
+    assert index.get_author("Jane Doe") == {
+        "name": "Jane Doe",
+        "affiliation": "EMBL Heidelberg",
+        "email": "jane@embl.de",
+    }
+    index.close()
+
+    # persisted across instances
+    index = AuthorIndex(tmp_path / "index.sqlite")
+    assert len(index) == 4
+    assert index.get_author("john smith")["github_user"] == "jsmith"
+    index.add_authors({"name": f"Author {i}"} for i in range(5000))
+    assert len(index.complete("name", "author 12")) == 10
+    assert index.complete("name", "hor 4999") == ["Author 4999"]
+    index.close()
+
+
+def test_spec_files_count_once(tmp_path):
+    def write_spec(path, names):
+        path.write_text(yaml.safe_dump({"authors": [{"name": n} for n in names]}))
+
+    specs = [tmp_path / f"rdf_{i}.yaml" for i in range(3)]
+    write_spec(specs[0], ["Ann Lee", "Bob Ray"])
+    write_spec(specs[1], ["Bo Lin"])
+    write_spec(specs[2], ["Bob Ray"])
+    index = AuthorIndex(tmp_path / "index.sqlite")
+    assert index.add_spec_files(specs) == 3
+    assert index.complete("name", "bo") == ["Bob Ray", "Bo Lin"]
+
+    # saving a spec again doesn't count its authors again
+    for i in range(3):
+        write_spec(specs[1], ["Bo Lin", "Bo Lin"] + ["Cy Wu"] * i)
+        os.utime(specs[1], ns=(i, i))
+        assert index.add_spec_files([specs[1]]) == 1
+    assert index.complete("name", "bo") == ["Bob Ray", "Bo Lin"]
+    # removed authors are not counted anymore
+    write_spec(specs[0], ["Ann Lee"])
+    index.add_spec_files([specs[0]])
+    index.close()
+
+    index = AuthorIndex(tmp_path / "index.sqlite")
+    assert index._counts == {"ann lee": 1, "bob ray": 1, "bo lin": 1, "cy wu": 1}
+    assert index.add_spec_files(specs) == 0
+    index.close()
@@ -0,0 +1,33 @@
+import yaml
+
+from core_bioimage_io_widgets.utils import find_spec_files, validate_spec_files
+
+
+def test_validate_folder(builder, tmp_path):
+    specs_dir = tmp_path / "specs"
+    (specs_dir / "nested").mkdir(parents=True)
+    model_data = builder.to_dict()
+    (specs_dir / "valid.yaml").write_text(yaml.safe_dump(model_data))
+    (specs_dir / "nested" / "unnamed.yml").write_text(
+        yaml.safe_dump({**model_data, "name": ""})
+    )
+    (specs_dir / "broken.yaml").write_text("name: [")
+
+    spec_files = find_spec_files([specs_dir])
+    assert [path.name for path in spec_files] == [
+        "broken.yaml",
+        "unnamed.yml",
+        "valid.yaml",
+    ]
+    results = validate_spec_files(spec_files, max_workers=2)
+    assert [result.ok for result in results] == [False, False, True]
+    assert "file" in results[0].errors
+    assert results[1].errors == {"name": ["Model's name is required."]}
+    assert results[1].error_count == 1
+    assert not any(result.cached for result in results)
+
+    # unchanged contents are not validated again
+    (specs_dir / "valid.yaml").write_text(yaml.safe_dump({**model_data, "name": ""}))
+    results = validate_spec_files(spec_files)
+    assert [result.cached for result in results] == [True, True, True]
+    assert results[2].errors == results[1].errors
@@ -0,0 +1,111 @@
+import json
+import threading
+import time
+import urllib.error
+import urllib.request
+
+import pytest
+
+from core_bioimage_io_widgets.utils.build_service import (
+    DONE,
+    FAILED,
+    BuildServer,
+    BuildService,
+)
+
+
+def request(server, path, data=None, headers=None):
+    url = f"http://127.0.0.1:{server.server_port}{path}"
+    body = json.dumps(data).encode() if data is not None else None
+    headers = {"Content-Type": "application/json", **(headers or {})}
+    try:
+        with urllib.request.urlopen(
+            urllib.request.Request(url, data=body, headers=headers), timeout=5
+        ) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as err:
+        return err.code, json.loads(err.read())
+
+
+def wait_for(server, job_id):
+    for _ in range(100):
+        _, job = request(server, f"/jobs/{job_id}")
+        if job["status"] in (DONE, FAILED):
+            return job
+        time.sleep(0.05)
+    raise TimeoutError(job_id)
+
+
+@pytest.fixture
+def serve():
+    servers = []
+
+    def _serve(service):
+        server = BuildServer(port=0, service=service)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return server
+
+    yield _serve
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def test_build_job(serve, builder, tmp_path):
+    built = []
+    server = serve(BuildService(build_fn=lambda *args, **kw: built.append(args)))
+
+    output = str(tmp_path / "model.zip")
+    status, job = request(
+        server, "/jobs", {"spec": builder.to_dict(), "output": output}
+    )
+    assert status == 202
+    job = wait_for(server, job["id"])
+    assert job["status"] == DONE
+    assert job["progress"] == 1.0
+    assert built[0][1] == output
+
+    builder.name = ""
+    _, job = request(server, "/jobs", {"spec": builder.to_dict(), "output": output})
+    job = wait_for(server, job["id"])
+    assert job["status"] == FAILED
+    assert "name" in job["errors"]
+
+
+def test_bad_requests(serve):
+    server = serve(BuildService())
+    assert request(server, "/jobs", {"output": "model.zip"})[0] == 400
+    assert request(server, "/jobs/unknown")[0] == 404
+    status, health = request(server, "/health")
+    assert status == 200
+    assert health["pending"] == 0
+    # simple cross-site requests and other hosts are refused
+    form = {"Content-Type": "text/plain"}
+    assert request(server, "/jobs", {"output": "model.zip"}, form)[0] == 415
+    assert request(server, "/health", headers={"Host": "evil.com:80"})[0] == 403
+    assert request(server, "/health", headers={"Host": "localhost:80"})[0] == 200
+
+
+def test_finished_jobs_evicted(serve):
+    server = serve(BuildService(build_fn=lambda *args, **kw: None, max_history=2))
+    for i in range(4):
+        job = request(server, "/jobs", {"spec": {}, "output": f"{i}.zip"})[1]
+        wait_for(server, job["id"])
+    # only the most recently finished jobs are kept
+    for _ in range(100):
+        if len(server.service.jobs()) == 2:
+            break
+        time.sleep(0.05)
+    assert [job.output_path for job in server.service.jobs()] == ["2.zip", "3.zip"]
+
+
+def test_queue_full(serve):
+    release = threading.Event()
+    service = BuildService(max_workers=1, max_queue=1)
+    # keep the only worker busy
+    service._executor.submit(release.wait)
+    server = serve(service)
+    assert request(server, "/jobs", {"spec": {}, "output": "a.zip"})[0] == 202
+    assert request(server, "/jobs", {"spec": {}, "output": "b.zip"})[0] == 503
+    release.set()
@@ -0,0 +1,41 @@
+import imageio.v3 as iio
+import numpy as np
+
+from core_bioimage_io_widgets.utils import (
+    ThumbnailCache,
+    generate_cover,
+    normalize_percentile,
+    project_to_image,
+)
+
+
+def test_thumbnail_cache(tmp_path):
+    iio.imwrite(tmp_path / "cover.png", np.zeros((200, 100), dtype="uint8"))
+    cache = ThumbnailCache(max_items=1, size=50)
+
+    thumbnail = cache.request(tmp_path / "cover.png").result()
+    assert (thumbnail.width, thumbnail.height) == (100, 200)
+    assert thumbnail.image.shape == (50, 25, 3)
+    assert cache.get(tmp_path / "cover.png") is thumbnail
+
+    iio.imwrite(tmp_path / "other.png", np.zeros((10, 10, 3), dtype="uint8"))
+    cache.request(tmp_path / "other.png").result()
+    # the least recently used thumbnail is dropped
+    assert cache.get(tmp_path / "cover.png") is None
+
+
+def test_generate_cover(tmp_path):
+    arr_in = np.random.rand(1, 2, 5, 32, 48).astype("float32")
+    np.save(tmp_path / "in.npy", arr_in)
+    np.save(tmp_path / "out.npy", np.ones((1, 3, 64, 96), dtype="uint8"))
+
+    image = project_to_image(arr_in, "bczyx")
+    np.testing.assert_array_equal(image, arr_in[0, 0].max(axis=0))
+    normalized = normalize_percentile(image, 0, 100)
+    assert normalized.min() == 0 and normalized.max() == 1
+
+    cover = generate_cover(
+        tmp_path / "in.npy", "bczyx", tmp_path / "out.npy", "bcyx", tmp_path / "c.png"
+    )
+    # side by side, 256 pixels high, with a gap between them
+    assert iio.imread(cover).shape == (256, 384 + 8 + 384, 3)
@@ -0,0 +1,117 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import ClassVar, List
+
+import pytest
+
+from core_bioimage_io_widgets.utils import (
+    DoiResolver,
+    RemoteFetcher,
+    format_citation,
+    normalize_doi,
+    resolve_dois,
+)
+
+CSL = {
+    "author": [
+        {"family": "Weigert", "given": "Martin"},
+        {"family": "Schmidt", "given": "Uwe"},
+        {"family": "Boothe", "given": "Tobias"},
+        {"family": "Müller", "given": "Andreas"},
+    ],
+    "title": "Content-aware image restoration",
+    "container-title": "Nature Methods",
+    "issued": {"date-parts": [[2018, 11]]},
+    "URL": "https://doi.org/10.1038/s41592-018-0216-7",
+}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    requests: ClassVar[List[str]] = []
+
+    def do_GET(self):
+        self.requests.append(self.path)
+        if self.path != "/10.1038/s41592-018-0216-7":
+            self.send_error(404)
+            return
+        body = json.dumps(CSL).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", self.headers["Accept"])
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    _Handler.requests.clear()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_normalize_doi():
+    assert normalize_doi("https://doi.org/10.1038/S41592") == "10.1038/s41592"
+    assert normalize_doi(" doi:10.5281/zenodo.5764892 ") == "10.5281/zenodo.5764892"
+    assert normalize_doi("10.12/abc") is None
+    assert normalize_doi("a paper") is None
+
+
+def test_format_citation():
+    assert format_citation(CSL) == (
+        "Weigert M, Schmidt U, Boothe T, et al. Content-aware image restoration."
+        " Nature Methods (2018)."
+    )
+    assert format_citation({"title": ["A title."]}) == "A title."
+
+
+def test_resolve_dois(server, tmp_path):
+    fetcher = RemoteFetcher(tmp_path, max_connections=2)
+    resolver = DoiResolver(server, fetcher)
+    doi = "10.1038/s41592-018-0216-7"
+    results = resolve_dois(
+        [f"https://doi.org/{doi}", doi, "10.1234/missing", "no doi"], resolver
+    )
+    assert results[doi]["text"].startswith("Weigert M, Schmidt U")
+    assert results[doi]["url"] == CSL["URL"]
+    assert isinstance(results["10.1234/missing"], OSError)
+    assert isinstance(results["no doi"], ValueError)
+    # each DOI is requested once, and the resolved ones are cached
+    assert sorted(_Handler.requests) == [f"/{doi}", "/10.1234/missing"]
+    assert resolver.cached(doi) == results[doi]
+    assert resolver.resolve(doi.upper()) == results[doi]
+    assert len(_Handler.requests) == 2
+    with pytest.raises(OSError):
+        resolver.resolve("10.1234/missing")
+    fetcher.close()
+
+
+def test_typed_doi_is_resolved_once(qapp, server, tmp_path):
+    from core_bioimage_io_widgets.widgets import CiteWidget
+
+    fetcher = RemoteFetcher(tmp_path, max_connections=2)
+    widget = CiteWidget()
+    widget.doi_resolver = DoiResolver(server, fetcher, use_cache=False)
+    widget.doi_timer.setInterval(50)
+    doi = "10.1038/s41592-018-0216-7"
+    for end in range(len("10.1038/s"), len(doi) + 1):
+        widget.doi_textbox.setText(doi[:end])
+        widget.doi_edited(doi[:end])
+    end = time.monotonic() + 5
+    while time.monotonic() < end and (
+        widget.doi_timer.isActive() or widget.doi_runner.is_running()
+    ):
+        qapp.processEvents()
+
+    assert _Handler.requests == [f"/{doi}"]
+    assert widget.cite_textbox.text().startswith("Weigert M, Schmidt U")
+    fetcher.close()
@@ -0,0 +1,81 @@
+import hashlib
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import ClassVar, List, Tuple
+
+import pytest
+
+from core_bioimage_io_widgets.utils import RemoteFetcher, fetch_urls
+
+CONTENT = bytes(range(256)) * 1000
+ETAG = f'"{hashlib.sha256(CONTENT).hexdigest()[:8]}"'
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    requests: ClassVar[List[Tuple[str, dict]]] = []
+
+    def do_GET(self):
+        self.requests.append((self.path, dict(self.headers)))
+        if self.path == "/moved":
+            self.send_response(302)
+            self.send_header("Location", "/weights.bin")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        if self.path != "/weights.bin":
+            self.send_error(404)
+            return
+        if self.headers.get("If-None-Match") == ETAG:
+            self.send_response(304)
+            self.end_headers()
+            return
+        body, status = CONTENT, 200
+        range_header = self.headers.get("Range")
+        if range_header and self.headers.get("If-Range") == ETAG:
+            start = int(range_header[len("bytes=") :].rstrip("-"))
+            body, status = CONTENT[start:], 206
+        self.send_response(status)
+        self.send_header("ETag", ETAG)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    _Handler.requests = []
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_fetch_cache_and_resume(server, tmp_path):
+    fetcher = RemoteFetcher(tmp_path, max_connections=2)
+    url = f"{server}/weights.bin"
+    results = fetch_urls([url, f"{server}/moved", f"{server}/missing"], fetcher)
+    assert results[url].read_bytes() == CONTENT
+    assert results[f"{server}/moved"].read_bytes() == CONTENT
+    assert isinstance(results[f"{server}/missing"], OSError)
+
+    # revalidated by the ETag, not downloaded again
+    _Handler.requests.clear()
+    assert fetch_urls([url], fetcher)[url].read_bytes() == CONTENT
+    assert _Handler.requests[0][1]["If-None-Match"] == ETAG
+
+    # an interrupted download is resumed
+    path = fetcher.cache_path(url)
+    path.unlink()
+    path.with_name(path.name + ".part").write_bytes(CONTENT[:1000])
+    _Handler.requests.clear()
+    assert fetch_urls([url], fetcher)[url].read_bytes() == CONTENT
+    assert _Handler.requests[0][1]["Range"] == "bytes=1000-"
+    assert json.loads(path.with_name(path.name + ".json").read_text())["etag"] == ETAG
+    fetcher.close()
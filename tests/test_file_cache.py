@@ -0,0 +1,48 @@
+import imageio.v3 as iio
+import numpy as np
+
+from core_bioimage_io_widgets.utils import (
+    FileCache,
+    file_sha256,
+    image_size,
+    read_npy_header,
+)
+
+
+def test_cache_until_file_changes(tmp_path):
+    cache = FileCache(tmp_path / "cache.sqlite")
+    path = tmp_path / "data.txt"
+    path.write_text("one")
+    calls = []
+
+    def compute(p):
+        calls.append(p)
+        return p.read_text()
+
+    assert cache.get(path, "text", compute) == "one"
+    assert cache.get(path, "text", compute) == "one"
+    assert len(calls) == 1
+    # persisted across instances
+    cache.close()
+    cache = FileCache(tmp_path / "cache.sqlite")
+    assert cache.get(path, "text", compute) == "one"
+    assert len(calls) == 1
+
+    path.write_text("two!")
+    assert cache.get(path, "text", compute) == "two!"
+    assert len(calls) == 2
+
+
+def test_cached_readers(tmp_path):
+    np.save(tmp_path / "x.npy", np.zeros((2, 3), dtype=">u2"))
+    assert read_npy_header(tmp_path / "x.npy") == ((2, 3), np.dtype(">u2"))
+    # a cache hit returns the same header
+    assert read_npy_header(str(tmp_path / "x.npy")) == ((2, 3), np.dtype(">u2"))
+
+    (tmp_path / "w.bin").write_bytes(b"abc")
+    assert file_sha256(tmp_path / "w.bin") == (
+        "ba7816bf8f01cfea414140de5dae2223b00361a396177a9cb410ff61f20015ad"
+    )
+
+    iio.imwrite(tmp_path / "cover.png", np.zeros((20, 30), dtype="uint8"))
+    assert image_size(tmp_path / "cover.png") == (30, 20)
@@ -0,0 +1,70 @@
+import time
+
+import numpy as np
+import pytest
+
+pytest.importorskip("qtpy.QtWidgets")
+
+from core_bioimage_io_widgets.utils import get_array
+from core_bioimage_io_widgets.widgets import (
+    BioImageModelWidget,
+    FileWatcher,
+)
+
+
+def wait_for(qapp, condition, timeout=5.0):
+    end = time.monotonic() + timeout
+    while not condition() and time.monotonic() < end:
+        qapp.processEvents()
+        time.sleep(0.01)
+
+
+def test_changes_are_coalesced(qapp, tmp_path):
+    path = tmp_path / "weights.onnx"
+    path.write_bytes(b"0")
+    watcher = FileWatcher(debounce_msecs=100)
+    events = []
+    watcher.files_changed.connect(events.append)
+    watcher.set_files({str(path): [("weights", "onnx")]})
+
+    for i in range(5):
+        path.write_bytes(b"x" * i)
+    wait_for(qapp, lambda: len(events) > 0)
+    qapp.processEvents()
+
+    assert events == [{str(path): [("weights", "onnx")]}]
+
+
+def test_changed_test_input_is_revalidated(qapp, builder, tmp_path):
+    widget = BioImageModelWidget()
+    widget.file_watcher.timer.setInterval(50)
+    widget.load_specs(builder.to_dict(), validate=False)
+    assert str(tmp_path / "test_input.npy") in widget.file_watcher.files()
+
+    np.save(tmp_path / "test_input.npy", np.zeros((1, 1, 32, 32), dtype="float32"))
+    wait_for(qapp, lambda: widget.input_tensors[0]["shape"] == [1, 1, 32, 32])
+
+    assert widget.input_tensors[0]["shape"] == [1, 1, 32, 32]
+    assert widget.validation_win is None
+
+
+def test_changed_weights_are_revalidated(qapp, builder):
+    widget = BioImageModelWidget()
+    widget.load_specs(builder.to_dict(), validate=False)
+    (weights_format,) = widget.get_weights()
+
+    widget.revalidate_entries({("weights", weights_format): "0" * 64})
+    assert widget.validation_win is None
+    # not a sha256
+    widget.revalidate_entries({("weights", weights_format): "0"})
+    assert widget.validation_win is not None
+
+
+def test_replaced_arrays_are_released(qapp, builder):
+    widget = BioImageModelWidget()
+    uri = widget.add_input_array(np.zeros((1, 1, 8, 8), dtype="float32"), "bcyx")
+    assert get_array(uri) is not None
+
+    widget.load_specs(builder.to_dict(), validate=False)
+    with pytest.raises(KeyError):
+        get_array(uri)
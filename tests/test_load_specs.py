@@ -0,0 +1,109 @@
+import time
+
+import imageio.v3 as iio
+import numpy as np
+import pytest
+
+pytest.importorskip("qtpy.QtWidgets")
+
+from core_bioimage_io_widgets.widgets import BioImageModelWidget
+
+
+def large_model_data(n: int = 200) -> dict:
+    return {
+        "name": "large model",
+        "description": "a model with many entries",
+        "license": "MIT",
+        "documentation": "README.md",
+        "weights": {"onnx": {"source": "weights.onnx"}},
+        "authors": [{"name": f"author {i}"} for i in range(n)],
+        "cite": [{"text": f"cite {i}", "doi": f"10.1/{i}"} for i in range(n)],
+        "inputs": [{"name": f"input_{i}", "axes": "byx"} for i in range(n)],
+        "test_inputs": [f"input_{i}.npy" for i in range(n)],
+        "outputs": [{"name": f"output_{i}", "axes": "byx"} for i in range(n)],
+        "test_outputs": [f"output_{i}.npy" for i in range(n)],
+        "covers": [f"cover_{i}.png" for i in range(n)],
+        "tags": [f"tag-{i}" for i in range(20)],
+    }
+
+
+def test_load_specs_bulk(qapp):
+    widget = BioImageModelWidget()
+    model_data = large_model_data()
+
+    widget.load_specs(model_data, validate=False)
+
+    # secondary pages are built on their first show from the plain data
+    assert widget.outputs_listview is None
+    assert widget.tags_widget is None
+    widget.tabs.build_all()
+    widget.required_tabs.build_all()
+    assert widget.authors_listview.count() == 200
+    assert widget.cites_listview.count() == 200
+    assert widget.inputs_listview.count() == 200
+    assert widget.outputs_listview.count() == 200
+    assert widget.covers_listview.count() == 200
+    assert widget.tags_widget.tags == model_data["tags"]
+    assert widget.weights_combo.currentText() == "onnx"
+    # blocked signals must not skip the weight format dependant inputs
+    assert not widget.model_source_textbox.isEnabled()
+    assert not widget.signalsBlocked()
+    assert widget.updatesEnabled()
+    # loading again must replace the covers, not append to them
+    widget.load_specs(model_data, validate=False)
+    assert widget.covers_listview.count() == 200
+
+
+def test_load_specs_benchmark(qapp):
+    widget = BioImageModelWidget()
+    model_data = large_model_data()
+    widget.load_specs(model_data, validate=False)
+    widget.tabs.build_all()
+    widget.required_tabs.build_all()
+
+    # reloading the large spec into the built pages, best of a few runs
+    timings = []
+    for _ in range(3):
+        start = time.perf_counter()
+        widget.load_specs(model_data, validate=False)
+        timings.append(time.perf_counter() - start)
+
+    assert widget.outputs_listview.count() == 200
+    # a few tens of milliseconds here; generous for slow machines
+    assert min(timings) < 1.0
+
+
+def test_cover_thumbnails_on_reload(qapp, tmp_path):
+    cover = tmp_path / "cover.png"
+    iio.imwrite(cover, np.zeros((20, 30), dtype="uint8"))
+    model_data = dict(large_model_data(1), covers=[str(cover)])
+    widget = BioImageModelWidget()
+    widget.tabs.build_all()
+    widget.required_tabs.build_all()
+
+    # the second time, the thumbnail is cached and delivered during the load
+    for _ in range(2):
+        widget.load_specs(model_data, validate=False)
+        item = widget.covers_listview.item(0)
+        deadline = time.monotonic() + 5
+        while item.icon().isNull() and time.monotonic() < deadline:
+            qapp.processEvents()
+            time.sleep(0.01)
+        assert item.text() == f"{cover}  (30 x 20)"
+        assert not item.icon().isNull()
+
+
+def test_lazy_pages(qapp):
+    widget = BioImageModelWidget()
+    assert widget.tabs.is_built(0)
+    assert not widget.tabs.is_built(1)
+    assert widget.authors_listview is not None
+    assert widget.weights_combo is None
+    assert widget.get_weights() == {}
+
+    widget.required_tabs.setCurrentIndex(2)
+    assert widget.weights_combo is not None
+    widget.tabs.setCurrentIndex(1)
+    widget.tags_widget.input_textbox.setText("unet")
+    widget.tags_widget.add_tag()
+    assert widget.tags == ["unet"]
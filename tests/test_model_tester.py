@@ -0,0 +1,30 @@
+import zipfile
+
+import yaml
+
+from core_bioimage_io_widgets.utils import get_weight_formats, run_model_tests
+from core_bioimage_io_widgets.utils.model_tester import FAILED, TIMEOUT
+
+
+def test_failures_are_isolated(tmp_path):
+    zip_path = tmp_path / "model.zip"
+    with zipfile.ZipFile(zip_path, "w") as zip_file:
+        rdf = {"weights": {"onnx": {"source": "a.onnx"}, "torchscript": {}}}
+        zip_file.writestr("rdf.yaml", yaml.safe_dump(rdf))
+    assert get_weight_formats(zip_path) == ["onnx", "torchscript"]
+
+    messages = []
+    results = run_model_tests(
+        [(zip_path, "onnx"), (zip_path, "torchscript")],
+        max_workers=2,
+        progress_fn=lambda *args: messages.append(args),
+    )
+    # the model can't be loaded, but the test reports it
+    assert [result.status for result in results] == [FAILED, FAILED]
+    assert results[1].weight_format == "torchscript"
+    assert all(result.error for result in results)
+    assert (str(zip_path), "onnx", "loading the model") in messages
+
+    # the process can't even start in time
+    (result,) = run_model_tests([(zip_path, "onnx")], timeout=0.05)
+    assert result.status == TIMEOUT
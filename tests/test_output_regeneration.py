@@ -0,0 +1,17 @@
+import os
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+from core_bioimage_io_widgets.utils import get_prediction_pool, run_in_prediction_pool
+
+
+def test_broken_pool_is_replaced():
+    with pytest.raises(BrokenProcessPool):
+        # a crashing worker
+        run_in_prediction_pool(os._exit, 1)
+
+    assert run_in_prediction_pool(abs, -1) == 1
+    pool = get_prediction_pool()
+    assert run_in_prediction_pool(abs, -2) == 2
+    assert get_prediction_pool() is pool
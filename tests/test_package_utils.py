@@ -0,0 +1,239 @@
+import zipfile
+
+import numpy as np
+import pytest
+import yaml
+
+from core_bioimage_io_widgets.utils import (
+    analyze_package,
+    build_model_zip,
+    get_crop_shape,
+    is_metadata_only_change,
+    load_package_specs,
+    read_npy_header,
+    read_package_rdf,
+    split_package_uri,
+    update_package_metadata,
+    validate_model_data,
+    verify_package,
+)
+from core_bioimage_io_widgets.utils.package_utils import replace_package_members
+from core_bioimage_io_widgets.utils.package_verifier import get_referenced_members
+
+# building a package tries to check the tags online
+pytestmark = pytest.mark.filterwarnings(
+    "ignore::bioimageio.spec.shared.common.ValidationWarning"
+)
+
+
+@pytest.fixture
+def package(builder, tmp_path):
+    builder.tags = ["unet"]
+    zip_path = tmp_path / "model.zip"
+    builder.build(zip_path)
+    return zip_path
+
+
+def raw_members(zip_path):
+    with zipfile.ZipFile(zip_path) as zip_file:
+        return {
+            info.filename: (info.CRC, info.compress_size)
+            for info in zip_file.infolist()
+        }
+
+
+def test_update_metadata_only(builder, package):
+    before = raw_members(package)
+    builder.description = "fixed a typo"
+    builder.add_author("John Doe")
+
+    assert update_package_metadata(builder.to_dict(), package)
+
+    rdf = read_package_rdf(package)
+    assert rdf["description"] == "fixed a typo"
+    assert [author["name"] for author in rdf["authors"]] == ["Jane Doe", "John Doe"]
+    # weights and tensors are copied as-is
+    after = raw_members(package)
+    assert after.keys() == before.keys()
+    for name in before:
+        if name != "rdf.yaml":
+            assert after[name] == before[name]
+    with zipfile.ZipFile(package) as zip_file:
+        assert zip_file.testzip() is None
+
+
+def test_changed_files_need_rebuild(builder, package, tmp_path):
+    np.save(tmp_path / "test_input.npy", np.zeros((1, 1, 32, 32), dtype="float32"))
+    builder.inputs.clear()
+    builder.add_input(tmp_path / "test_input.npy", "bcyx")
+    assert not update_package_metadata(builder.to_dict(), package)
+
+
+def test_incremental_build(builder, package, tmp_path):
+    builder.name = "renamed"
+    build_model_zip(builder.to_dict(), str(package), incremental=True)
+    assert read_package_rdf(package)["name"] == "renamed"
+
+    # retrained weights and new test outputs of the same sizes
+    (tmp_path / "weights.onnx").write_bytes(b"retrain")
+    np.save(tmp_path / "test_output.npy", np.ones((1, 1, 64, 64), dtype="uint8"))
+    assert not is_metadata_only_change(builder.to_dict(), package)
+    build_model_zip(builder.to_dict(), str(package), incremental=True)
+    with zipfile.ZipFile(package) as zip_file:
+        assert zip_file.read("weights.onnx") == b"retrain"
+        with zip_file.open("test_output.npy") as f:
+            assert np.load(f).all()
+
+
+def test_incremental_build_over_other_files(builder, tmp_path):
+    not_a_zip = tmp_path / "notes.zip"
+    not_a_zip.write_text("not a zip")
+    other_zip = tmp_path / "other.zip"
+    with zipfile.ZipFile(other_zip, mode="w") as zip_file:
+        zip_file.writestr("readme.txt", "not a model")
+
+    for path in (not_a_zip, other_zip):
+        assert not is_metadata_only_change(builder.to_dict(), path)
+        build_model_zip(builder.to_dict(), str(path), incremental=True)
+        assert read_package_rdf(path)["name"] == "model"
+
+
+def test_metadata_updates_do_not_grow_package(builder, package):
+    builder.description = "a much longer description " * 100
+    assert update_package_metadata(builder.to_dict(), package)
+    size = package.stat().st_size
+
+    builder.description = "short"
+    assert update_package_metadata(builder.to_dict(), package)
+    assert package.stat().st_size < size
+    with zipfile.ZipFile(package) as zip_file:
+        assert [info.filename for info in zip_file.infolist()].count("rdf.yaml") == 1
+        assert b"much longer" not in package.read_bytes()
+        assert zip_file.testzip() is None
+
+
+def test_load_package_lazily(package, tmp_path):
+    model_data = load_package_specs(package)
+    assert split_package_uri(model_data["test_inputs"][0]) == (
+        str(package.absolute()),
+        "test_input.npy",
+    )
+    assert read_npy_header(model_data["test_inputs"][0]) == (
+        (1, 1, 64, 64),
+        np.dtype("float32"),
+    )
+    assert validate_model_data(model_data) == {}
+
+    # an unchanged package is copied without extracting its members
+    model_data["name"] = "copied"
+    copy_path = tmp_path / "copy.zip"
+    build_model_zip(model_data, str(copy_path), incremental=True)
+    assert read_package_rdf(copy_path)["name"] == "copied"
+    assert raw_members(copy_path).keys() == raw_members(package).keys()
+
+
+def test_verify_package(package, tmp_path):
+    report = verify_package(package)
+    assert report.ok
+    assert {check.member for check in report.checks} == {
+        "weights.onnx",
+        "test_input.npy",
+        "test_output.npy",
+        "README.md",
+        "cover.png",
+    }
+
+    # record a wrong checksum for the weights
+    rdf = read_package_rdf(package)
+    rdf["weights"]["onnx"]["sha256"] = "0" * 64
+    replace_package_members(package, {"rdf.yaml": yaml.safe_dump(rdf).encode()})
+    report = verify_package(package)
+    assert not report.ok
+    assert list(report.to_errors()) == ["weights.onnx"]
+
+
+def test_analyze_package(builder, tmp_path):
+    np.save(tmp_path / "large.npy", np.zeros((1, 1, 1024, 512), dtype="float64"))
+    builder.inputs.clear()
+    builder.add_input(tmp_path / "large.npy", "bcyx")
+    package = tmp_path / "large.zip"
+    builder.build(package)
+
+    analysis = analyze_package(package)
+    sizes = {member.name: member for member in analysis.members}
+    assert sizes["large.npy"].size > 1024 * 512 * 8
+    assert sizes["large.npy"].ratio > 1
+    # the explicit input shape is set to the cropped one
+    (suggestion,) = [s for s in analysis.suggestions if s.member == "large.npy"]
+    assert "(1, 1, 256, 256)" in suggestion.reason
+    assert suggestion.shape == (1, 1, 256, 256)
+    assert suggestion.savings <= sizes["large.npy"].compressed_size
+
+    rdf = read_package_rdf(package)
+    rdf["inputs"][0]["shape"] = {"min": [1, 1, 64, 64], "step": [0, 0, 16, 16]}
+    replace_package_members(package, {"rdf.yaml": yaml.safe_dump(rdf).encode()})
+    (suggestion,) = [
+        s for s in analyze_package(package).suggestions if s.member == "large.npy"
+    ]
+    assert "float32" in suggestion.reason
+    assert "(1, 1, 256, 256)" in suggestion.reason
+    assert suggestion.shape is None
+    # the savings of both fixes are combined, not added up
+    assert suggestion.savings < sizes["large.npy"].compressed_size
+
+
+def test_crop_shape():
+    assert get_crop_shape((1, 1, 1000, 100), "bcyx") == (1, 1, 256, 100)
+    assert get_crop_shape((1, 1000), "bx", min_shape=(1, 64), step=(0, 16)) == (
+        1,
+        256,
+    )
+    assert get_crop_shape((1, 1000), "bx", min_shape=(1, 100), step=(0, 32)) == (
+        1,
+        260,
+    )
+    # fixed size axes are not cropped
+    assert get_crop_shape((1, 1000), "bx", min_shape=(1, 1000), step=(0, 0)) == (
+        1,
+        1000,
+    )
+
+
+def test_build_with_in_memory_tensors(builder, tmp_path):
+    test_input = np.random.rand(1, 1, 64, 64).astype("float32")
+    builder.inputs.clear()
+    builder.outputs.clear()
+    builder.add_input(test_input, "bcyx", name="raw")
+    builder.add_output(np.ones((1, 1, 64, 64), dtype="uint8"), "bcyx", name="mask")
+    assert builder.inputs[0].shape == (1, 1, 64, 64)
+    assert validate_model_data(builder.to_dict()) == {}
+
+    package = tmp_path / "memory.zip"
+    builder.build(package)
+    with zipfile.ZipFile(package) as zip_file:
+        with zip_file.open("raw.npy") as f:
+            assert np.array_equal(np.load(f), test_input)
+
+    # with covers, the arrays are streamed into the package
+    (tmp_path / "cover.png").write_bytes(b"cover")
+    builder.covers = [str(tmp_path / "cover.png")]
+    package = tmp_path / "memory_covers.zip"
+    builder.build(package)
+    with zipfile.ZipFile(package) as zip_file:
+        assert zip_file.testzip() is None
+        assert zip_file.namelist().count("raw.npy") == 1
+        with zip_file.open("raw.npy") as f:
+            assert np.array_equal(np.load(f), test_input)
+
+
+def test_referenced_architecture_members():
+    weights = {
+        "pytorch_state_dict": {
+            "source": "weights.pt",
+            "architecture": "unet.py:UNet",
+            "architecture_sha256": "abc",
+        },
+        "torchscript": {"source": "model.pt", "architecture": "pkg.models:UNet"},
+    }
+    members = get_referenced_members({"weights": weights})
+    assert members == {"weights.pt": None, "unet.py": "abc", "model.pt": None}
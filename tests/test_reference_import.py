@@ -0,0 +1,95 @@
+from core_bioimage_io_widgets.utils import (
+    import_authors,
+    import_cites,
+    iter_bibtex_entries,
+)
+
+BIBTEX = r"""
+% exported references
+@string{nm = "Nature Methods"}
+
+@article{weigert2018,
+  author = {Weigert, Martin and Schmidt, Uwe and {\"U}ber, Tobias and Florian Jug},
+  title = {Content-aware image restoration: {P}ushing the limits},
+  journal = nm,
+  year = 2018,
+  doi = {https://doi.org/10.1038/S41592-018-0216-7},
+}
+@misc{notitle, url = "https://example.com/data"}
+"""
+
+CFF = """
+cff-version: 1.2.0
+title: A model
+authors:
+  - family-names: Doe
+    given-names: Jane
+    affiliation: Lab
+    orcid: https://orcid.org/0000-0002-1825-0097
+  - name: The Consortium
+preferred-citation:
+  type: article
+  title: The model paper
+  authors:
+    - family-names: Doe
+      given-names: Jane
+  journal: Bioinformatics
+  year: 2021
+  doi: 10.1093/bioinformatics/btab001
+"""
+
+
+def test_bibtex_entries(tmp_path):
+    path = tmp_path / "refs.bib"
+    path.write_text(BIBTEX)
+    entries = list(iter_bibtex_entries(path))
+    assert [entry["ID"] for entry in entries] == ["weigert2018", "notitle"]
+    assert entries[0]["title"] == "Content-aware image restoration: Pushing the limits"
+    assert entries[0]["year"] == "2018"
+    assert entries[0]["journal"] == "Nature Methods"
+
+    result = import_cites(path, resolve=False)
+    assert result.entries[0] == {
+        "text": "Weigert M, Schmidt U, Über T, et al. Content-aware image"
+        " restoration: Pushing the limits. Nature Methods (2018).",
+        "doi": "10.1038/s41592-018-0216-7",
+    }
+    # a citation needs a text
+    assert list(result.errors) == ["refs.bib #2"]
+
+
+def test_csv_and_cff(tmp_path):
+    csv_path = tmp_path / "authors.csv"
+    csv_path.write_text(
+        "Name,Affiliation,GitHub User,ORCID\n"
+        "Jane Doe,Lab,jdoe,0000-0002-1825-0097\n"
+        "\n"
+        ",Lab,,\n"
+        "John Doe,,,1234\n"
+    )
+    result = import_authors(csv_path)
+    assert result.entries == [
+        {
+            "name": "Jane Doe",
+            "affiliation": "Lab",
+            "github_user": "jdoe",
+            "orcid": "0000-0002-1825-0097",
+        }
+    ]
+    assert sorted(result.errors) == ["authors.csv #2", "authors.csv #3"]
+
+    cff_path = tmp_path / "CITATION.cff"
+    cff_path.write_text(CFF)
+    authors = import_authors(cff_path)
+    assert [author["name"] for author in authors.entries] == [
+        "Jane Doe",
+        "The Consortium",
+    ]
+    assert authors.entries[0]["orcid"] == "0000-0002-1825-0097"
+    cites = import_cites(cff_path)
+    assert cites.entries == [
+        {
+            "text": "Doe J. The model paper. Bioinformatics (2021).",
+            "doi": "10.1093/bioinformatics/btab001",
+        }
+    ]
@@ -0,0 +1,102 @@
+import os
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+
+from core_bioimage_io_widgets.utils import (
+    ModelSpecBuilder,
+    WeightsSpec,
+    deep_validate_model_data,
+    get_spec_hash,
+    spec_builder,
+    validate_model_data,
+)
+
+
+def test_builder_is_qt_free():
+    code = (
+        "import sys; import core_bioimage_io_widgets.utils.spec_builder;"
+        "assert 'qtpy' not in sys.modules"
+    )
+    subprocess.run([sys.executable, "-W", "ignore", "-c", code], check=True)
+
+
+def test_tensors_from_npy_headers(builder):
+    assert builder.inputs[0].shape == (1, 1, 64, 64)
+    assert builder.inputs[0].name == "input_1"
+    assert builder.outputs[0].data_type == "uint8"
+    assert builder.outputs[0].to_dict("postprocessing")["halo"] == [0, 0, 8, 8]
+
+
+def test_to_dict_round_trip(builder):
+    model_data = builder.to_dict()
+    assert model_data["authors"] == [{"name": "Jane Doe", "affiliation": "Lab"}]
+    restored = ModelSpecBuilder.from_dict(model_data)
+    assert restored.inputs == builder.inputs
+    assert restored.outputs == builder.outputs
+    assert restored.to_dict()["weights"] == model_data["weights"]
+
+
+def test_round_trip_shapes(builder):
+    model_data = builder.to_dict()
+    model_data["inputs"][0]["shape"] = {"min": [1, 1, 32, 32], "step": [0, 0, 16, 16]}
+    model_data["outputs"][0]["shape"] = {
+        "reference_tensor": "input_1",
+        "scale": [1, 1, 1, 1],
+        "offset": [0, 0, 0, 0],
+    }
+    model_data["authors"][0]["maintainer"] = True
+
+    restored = ModelSpecBuilder.from_dict(model_data).to_dict()
+    assert restored["inputs"] == model_data["inputs"]
+    assert restored["outputs"] == model_data["outputs"]
+    assert restored["authors"] == model_data["authors"]
+
+
+@pytest.mark.filterwarnings("ignore::bioimageio.spec.shared.common.ValidationWarning")
+def test_deep_validate_memory_tensors(builder):
+    builder.inputs.clear()
+    builder.add_input(np.zeros((1, 1, 64, 64), dtype="float32"), "bcyx")
+    assert builder.inputs[0].test_tensor.startswith("memory://")
+
+    errors = deep_validate_model_data(builder.to_dict())
+    # the resource is loaded; only running the model may fail here
+    assert "load resource description" not in errors
+    assert "memory" not in str(errors)
+
+
+def test_validate(builder):
+    assert builder.validate() == {}
+    builder.name = ""
+    assert "name" in builder.validate()
+
+
+def test_validation_cache(builder, tmp_path, monkeypatch):
+    model_data = builder.to_dict()
+    spec_hash = get_spec_hash(model_data)
+    # the timestamp and the keys' order are ignored
+    reordered = dict(reversed(list(model_data.items())))
+    assert get_spec_hash({**reordered, "timestamp": "2000-01-01"}) == spec_hash
+    # a changed referenced file changes the hash
+    stat = os.stat(tmp_path / "README.md")
+    os.utime(tmp_path / "README.md", ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert get_spec_hash(model_data) != spec_hash
+
+    calls = []
+    schema = spec_builder.get_model_schema()
+    monkeypatch.setattr(
+        schema, "validate", lambda data: calls.append(data) or {"x": ["error"]}
+    )
+    errors = validate_model_data({**model_data, "description": "new"})
+    errors["y"] = ["mutated"]
+    assert validate_model_data({**model_data, "description": "new"}) == {"x": ["error"]}
+    assert len(calls) == 1
+
+
+def test_pytorch_state_dict_weights():
+    weights = WeightsSpec("pytorch_state_dict", "weights.pt", architecture="m.py:Net")
+    assert weights.to_dict() == {
+        "pytorch_state_dict": {"source": "weights.pt", "architecture": "m.py:Net"}
+    }
@@ -0,0 +1,32 @@
+import threading
+
+import pytest
+
+pytest.importorskip("qtpy.QtWidgets")
+
+from core_bioimage_io_widgets.widgets import TaskRunner
+
+
+def test_every_result_is_delivered(qapp):
+    runner = TaskRunner(max_threads=2)
+    results, errors = [], []
+    release = threading.Event()
+
+    def slow(value):
+        release.wait(5)
+        return value
+
+    def failing():
+        raise ValueError("bad data")
+
+    runner.run(slow, 1, on_success=results.append)
+    runner.run(slow, 2, on_success=results.append)
+    runner.run(failing, on_success=results.append, on_error=errors.append)
+    assert runner.is_running()
+    release.set()
+    runner.wait()
+    qapp.processEvents()
+
+    assert sorted(results) == [1, 2]
+    assert [str(err) for err in errors] == ["bad data"]
+    assert not runner.is_running()
@@ -0,0 +1,102 @@
+import zipfile
+
+import numpy as np
+import pytest
+
+from core_bioimage_io_widgets.utils import (
+    convert_to_npy,
+    list_tensor_keys,
+    package_member_uri,
+    read_tensor_header,
+)
+
+
+def test_convert_npz(tmp_path):
+    arr = np.arange(24, dtype="int16").reshape(2, 3, 4)
+    np.savez_compressed(tmp_path / "tensors.npz", a=arr, b=arr[0])
+
+    assert read_tensor_header(f"{tmp_path / 'tensors.npz'}#a") == (
+        (2, 3, 4),
+        np.dtype("int16"),
+    )
+    with pytest.raises(ValueError):
+        read_tensor_header(tmp_path / "tensors.npz")
+    assert list_tensor_keys(tmp_path / "tensors.npz") == ["a", "b"]
+    assert list_tensor_keys(f"{tmp_path / 'tensors.npz'}#a") == []
+
+    npy_file = convert_to_npy(f"{tmp_path / 'tensors.npz'}#b")
+    assert npy_file.name == "tensors_b.npy"
+    np.testing.assert_array_equal(np.load(npy_file), arr[0])
+
+
+def test_npz_package_member(tmp_path):
+    arr = np.arange(6, dtype="float32").reshape(2, 3)
+    np.savez(tmp_path / "tensors.npz", a=arr, b=arr[0])
+    with zipfile.ZipFile(tmp_path / "model.zip", mode="w") as zip_file:
+        zip_file.write(tmp_path / "tensors.npz", "tensors.npz")
+    uri = package_member_uri(tmp_path / "model.zip", "tensors.npz")
+
+    assert list_tensor_keys(uri) == ["a", "b"]
+    assert read_tensor_header(f"{uri}#a") == ((2, 3), np.dtype("float32"))
+    npy_file = convert_to_npy(f"{uri}#a")
+    assert npy_file == tmp_path / "tensors_a.npy"
+    np.testing.assert_array_equal(np.load(npy_file), arr)
+
+
+def test_convert_tiff_in_chunks(tmp_path):
+    tifffile = pytest.importorskip("tifffile")
+    arr = np.arange(5 * 2 * 8 * 6, dtype="uint16").reshape(5, 2, 8, 6)
+    tifffile.imwrite(tmp_path / "stack.tif", arr)
+
+    assert read_tensor_header(tmp_path / "stack.tif") == (
+        (5, 2, 8, 6),
+        np.dtype("uint16"),
+    )
+    # two rows of the first axis per chunk
+    npy_file = convert_to_npy(
+        tmp_path / "stack.tif", max_workers=2, chunk_size=2 * 2 * 8 * 6 * 2
+    )
+    np.testing.assert_array_equal(np.load(npy_file), arr)
+
+
+def test_convert_rgb_tiff(tmp_path):
+    tifffile = pytest.importorskip("tifffile")
+    # a single page of samples
+    rgb = np.arange(8 * 6 * 3, dtype="uint8").reshape(8, 6, 3)
+    tifffile.imwrite(tmp_path / "rgb.tif", rgb, photometric="rgb")
+    np.testing.assert_array_equal(
+        np.load(convert_to_npy(tmp_path / "rgb.tif", chunk_size=6 * 3)), rgb
+    )
+    # a stack of them
+    stack = np.stack([rgb, rgb + 1, rgb + 2])
+    tifffile.imwrite(tmp_path / "stack.tif", stack, photometric="rgb")
+    np.testing.assert_array_equal(
+        np.load(convert_to_npy(tmp_path / "stack.tif", chunk_size=8 * 6 * 3)), stack
+    )
+
+
+def test_convert_zarr(tmp_path):
+    zarr = pytest.importorskip("zarr")
+    arr = np.random.rand(7, 4).astype("float32")
+    zarr.save_array(str(tmp_path / "tensor.zarr"), arr, chunks=(2, 4))
+
+    assert read_tensor_header(tmp_path / "tensor.zarr" / ".zarray")[0] == (7, 4)
+    npy_file = convert_to_npy(tmp_path / "tensor.zarr", chunk_size=32)
+    np.testing.assert_array_equal(np.load(npy_file), arr)
+
+
+def test_failed_conversion_restores_the_test_input(qapp, tmp_path):
+    from core_bioimage_io_widgets.widgets import InputTensorWidget
+
+    np.save(tmp_path / "input.npy", np.zeros((1, 8, 8), dtype="float32"))
+    widget = InputTensorWidget()
+    widget.test_input_selected(str(tmp_path / "input.npy"))
+
+    missing = str(tmp_path / "missing.tif")
+    widget.test_input = missing
+    widget.convert_test_input(missing, previous=str(tmp_path / "input.npy"))
+    widget.convert_runner.wait()
+    qapp.processEvents()
+
+    assert widget.test_input_textbox.text() == str(tmp_path / "input.npy")
+    assert widget.submit_button.isEnabled()
@@ -0,0 +1,146 @@
+import numpy as np
+
+from core_bioimage_io_widgets.utils import (
+    TensorStats,
+    compare_tensors,
+    convert_test_tensor,
+    crop_test_tensors,
+    narrowest_dtype,
+    read_npy_header,
+    scan_tensor,
+)
+
+
+def test_crop_pair_with_scale_and_halo(tmp_path):
+    arr_in = np.arange(1000 * 600, dtype="float32").reshape(1, 1000, 600)
+    np.save(tmp_path / "in.npy", arr_in)
+    # the output is upsampled by 2 along y and x
+    np.save(tmp_path / "out.npy", np.zeros((1, 2000, 1200), dtype="uint8"))
+
+    cropped_in, cropped_out = crop_test_tensors(
+        tmp_path / "in.npy",
+        "byx",
+        tmp_path / "out.npy",
+        "byx",
+        halo=[0, 300, 16],
+    )
+    assert cropped_in.name == "in_crop.npy"
+    # 2 * 300 output halo is 300 input pixels, so y keeps more than that
+    assert read_npy_header(cropped_in)[0] == (1, 301, 256)
+    assert read_npy_header(cropped_out)[0] == (1, 602, 512)
+    # centered crop of the input values
+    assert np.load(cropped_in)[0, 0, 0] == arr_in[0, 349, 172]
+
+
+def test_crop_pair_with_offset_and_step(tmp_path):
+    np.save(tmp_path / "in.npy", np.zeros((1, 1000), dtype="float32"))
+    # a valid convolution: the output is 8 pixels smaller on each side
+    np.save(tmp_path / "out.npy", np.zeros((1, 984), dtype="float32"))
+
+    cropped_in, cropped_out = crop_test_tensors(
+        tmp_path / "in.npy",
+        "bx",
+        tmp_path / "out.npy",
+        "bx",
+        halo=[0, 200],
+        min_shape=[1, 64],
+        step=[0, 32],
+        scale=[1, 1],
+        offset=[0, -8],
+    )
+    # twice the halo is rounded up to 64 + k * 32
+    assert read_npy_header(cropped_in)[0] == (1, 416)
+    assert read_npy_header(cropped_out)[0] == (1, 400)
+
+
+def test_builder_crop_test_tensors(builder, tmp_path):
+    np.save(tmp_path / "large_in.npy", np.ones((1, 1, 512, 512), dtype="float32"))
+    np.save(tmp_path / "large_out.npy", np.ones((1, 1, 512, 512), dtype="float32"))
+    builder.inputs.clear()
+    builder.outputs.clear()
+    builder.add_input(tmp_path / "large_in.npy", "bcyx")
+    builder.add_output(tmp_path / "large_out.npy", "bcyx", halo=[0, 0, 8, 8])
+
+    builder.crop_test_tensors(tmp_path / "cropped")
+    assert builder.inputs[0].shape == (1, 1, 256, 256)
+    assert builder.outputs[0].shape == (1, 1, 256, 256)
+    assert builder.outputs[0].test_tensor.endswith("large_out_crop.npy")
+
+
+def test_narrow_output_dtype(tmp_path):
+    labels = np.zeros((1, 64, 64), dtype="float64")
+    labels[0, 10:20, 10:20] = 300
+    np.save(tmp_path / "labels.npy", labels)
+
+    stats = scan_tensor(tmp_path / "labels.npy", chunk_size=1000)
+    assert stats == TensorStats("float64", 0.0, 300.0, True, False)
+    assert narrowest_dtype(stats) == "uint16"
+    assert narrowest_dtype(stats._replace(min=-1.0)) == "int16"
+    assert narrowest_dtype(stats._replace(is_integral=False)) == "float32"
+    assert narrowest_dtype(TensorStats("uint8", 0, 1, True, False)) == "uint8"
+
+    # float32 only if the round trip is within the tolerance
+    np.save(tmp_path / "values.npy", np.array([0.1, 1e5 + 0.1]))
+    stats = scan_tensor(tmp_path / "values.npy")
+    assert 1e-4 < stats.float32_error < 1e-2
+    assert narrowest_dtype(stats) == "float64"
+    assert narrowest_dtype(stats, tolerance=1e-2) == "float32"
+
+    narrowed = convert_test_tensor(tmp_path / "labels.npy", "uint16", chunk_size=1000)
+    assert narrowed.name == "labels_uint16.npy"
+    assert np.array_equal(np.load(narrowed), labels.astype("uint16"))
+
+
+def test_compare_in_chunks(tmp_path):
+    reference = np.zeros((3, 50, 40), dtype="float32")
+    reference[0, 0, 0] = np.nan
+    np.save(tmp_path / "ref.npy", reference)
+    predicted = reference.copy()
+    predicted[1, 20, 5] = 0.5
+    predicted[2, 0, 0] = -0.25
+
+    comparison = compare_tensors(
+        predicted, tmp_path / "ref.npy", chunk_size=128, max_workers=3
+    )
+    assert not comparison.ok
+    assert comparison.mismatches == 2
+    assert comparison.first_mismatch == (1, 20, 5)
+    assert comparison.max_abs_error == 0.5
+    assert comparison.max_rel_error == np.inf
+
+    assert compare_tensors(reference, tmp_path / "ref.npy").ok
+    predicted[1, 20, 5] = 1e-5
+    predicted[2, 0, 0] = 0
+    assert compare_tensors(predicted, reference, chunk_size=7).ok
+
+
+def test_narrow_test_output_in_background(qapp, tmp_path):
+    from core_bioimage_io_widgets.widgets import OutputTensorWidget
+
+    labels = np.zeros((1, 64, 64), dtype="float64")
+    labels[0, 10:20, 10:20] = 3
+    np.save(tmp_path / "labels.npy", labels)
+    widget = OutputTensorWidget()
+    widget.test_output_selected(str(tmp_path / "labels.npy"))
+    widget.scan_runner.wait()
+    qapp.processEvents()
+    assert widget.narrow_button.isEnabled()
+
+    widget.axes_textbox.setText("cyx")
+    widget.narrow_test_output()
+    assert not widget.submit_button.isEnabled()
+    widget.convert_runner.wait()
+    qapp.processEvents()
+    assert widget.test_output.endswith("labels_uint8.npy")
+    assert widget.data_type_textbox.text() == "uint8"
+    assert widget.axes_textbox.text() == "cyx"
+
+    # a failed scan is reported, not dropped
+    errors = []
+    widget.validation_widget.update_content = errors.append
+    widget.test_output_selected(str(tmp_path / "labels.npy"))
+    (tmp_path / "labels.npy").unlink()
+    widget.scan_test_output(widget.test_output)
+    widget.scan_runner.wait()
+    qapp.processEvents()
+    assert errors
@@ -0,0 +1,57 @@
+import threading
+
+import pytest
+
+pytest.importorskip("qtpy.QtWidgets")
+
+from core_bioimage_io_widgets.widgets import BioImageModelWidget, ValidationWorker
+
+
+def test_only_newest_result_is_delivered(qapp):
+    worker = ValidationWorker()
+    results = []
+    worker.finished.connect(results.append)
+    release = threading.Event()
+
+    def slow_validation(errors):
+        release.wait(5)
+        return errors
+
+    worker.validate(slow_validation, {"first": ["stale"]})
+    worker.validate(slow_validation, {"second": ["stale"]})
+    generation = worker.validate(lambda errors: errors, {})
+    release.set()
+    worker.wait()
+    qapp.processEvents()
+
+    assert generation == 3
+    assert results == [{}]
+
+
+def test_exceptions_are_reported_as_errors(qapp):
+    worker = ValidationWorker()
+    results = []
+
+    def failing_validation():
+        raise ValueError("bad data")
+
+    worker.validate(failing_validation, callback=results.append)
+    worker.wait()
+    qapp.processEvents()
+
+    assert results == [{"validation": ["bad data"]}]
+
+
+def test_actions_do_not_supersede_each_other(qapp, builder):
+    widget = BioImageModelWidget()
+    model_data = builder.to_dict()
+    saved, built = [], []
+
+    widget.validate_specs(model_data, on_valid=saved.append, action="save")
+    widget.validate_specs(model_data, on_valid=built.append, action="build")
+    for worker in widget.validation_workers.values():
+        worker.wait()
+    qapp.processEvents()
+
+    assert saved == [model_data]
+    assert built == [model_data]